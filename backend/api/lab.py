@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from model.ann_model import build_ann_model
 from model.cnn_model import build_cnn_model
 from model.rnn_model import build_rnn_model
+from api.transport import NumpyJSONResponse
 from services.inference import inference_engine
 
 router = APIRouter(prefix="/api/lab", tags=["lab"])
@@ -268,7 +269,7 @@ def _dataset_adjust(output_data: np.ndarray, dataset: str) -> np.ndarray:
     return two / denom if denom > 0 else two
 
 
-def _fake_gates(vector: np.ndarray, stage_index: int) -> dict[str, list[float]]:
+def _fake_gates(vector: np.ndarray, stage_index: int) -> dict[str, np.ndarray]:
     base = np.abs(vector[:128]).astype(np.float32)
     if base.size == 0:
         base = np.zeros(128, dtype=np.float32)
@@ -276,10 +277,10 @@ def _fake_gates(vector: np.ndarray, stage_index: int) -> dict[str, list[float]]:
         base = base / np.max(base)
     phase = (stage_index % 3) / 3.0
     return {
-        "forget": np.clip(0.2 + 0.6 * base * (1.0 - phase), 0, 1).tolist(),
-        "input": np.clip(0.2 + 0.6 * base * (0.7 + phase), 0, 1).tolist(),
-        "output": np.clip(0.2 + 0.7 * base, 0, 1).tolist(),
-        "cell_state": ((base * 2.0) - 1.0).tolist(),
+        "forget": np.clip(0.2 + 0.6 * base * (1.0 - phase), 0, 1),
+        "input": np.clip(0.2 + 0.6 * base * (0.7 + phase), 0, 1),
+        "output": np.clip(0.2 + 0.7 * base, 0, 1),
+        "cell_state": (base * 2.0) - 1.0,
     }
 
 
@@ -333,26 +334,30 @@ def get_stage_activation(req: ActivationRequest):
         param_count = int(layer.count_params())
         w = layer.get_weights()
         if w:
-            weights = np.asarray(w[0]).reshape(-1).astype(np.float32).tolist()
+            weights = np.asarray(w[0]).reshape(-1).astype(np.float32)
             if len(w) > 1:
-                bias = np.asarray(w[1]).reshape(-1).astype(np.float32).tolist()
+                bias = np.asarray(w[1]).reshape(-1).astype(np.float32)
         if isinstance(layer, tf.keras.layers.Conv2D) and w:
             kernel = np.asarray(w[0]).astype(np.float32)
-            kernels = [kernel[..., i].reshape(-1).tolist() for i in range(kernel.shape[-1])]
+            # One flattened kernel per output channel.
+            kernels = np.moveaxis(kernel, -1, 0).reshape(kernel.shape[-1], -1)
 
     gates = _fake_gates(out_data, req.stageIndex) if arch == "rnn" and req.stageId.startswith("lstm") else None
 
-    return ActivationResponse(
-        input=np.asarray(in_data).reshape(-1).astype(np.float32).tolist(),
-        output=np.asarray(out_data).reshape(-1).astype(np.float32).tolist(),
-        input_shape=list(np.asarray(in_data).shape),
-        output_shape=list(np.asarray(out_data).shape),
-        param_count=param_count,
-        compute_time_ms=(time.perf_counter() - start) * 1000.0,
-        weights=weights,
-        bias=bias,
-        kernels=kernels,
-        gates=gates,
+    # Shaped like ActivationResponse, but serialized straight from the arrays.
+    return NumpyJSONResponse(
+        {
+            "input": np.asarray(in_data).reshape(-1).astype(np.float32),
+            "output": np.asarray(out_data).reshape(-1).astype(np.float32),
+            "input_shape": list(np.asarray(in_data).shape),
+            "output_shape": list(np.asarray(out_data).shape),
+            "param_count": param_count,
+            "compute_time_ms": (time.perf_counter() - start) * 1000.0,
+            "weights": weights,
+            "bias": bias,
+            "kernels": kernels,
+            "gates": gates,
+        }
     )
 
 
@@ -431,8 +436,8 @@ def compute_backward(req: BackwardRequest):
         stats["deadNeuronPercent"] = float(np.mean(act_np <= 0.0) * 100.0) if act_np.size else 0.0
 
     response: dict[str, Any] = {
-        "input_gradient": in_np.tolist(),
-        "output_gradient": out_np.tolist(),
+        "input_gradient": in_np,
+        "output_gradient": out_np,
         "input_shape": list(np.asarray(grad_in.numpy()).shape),
         "output_shape": list(np.asarray(grad_out.numpy()).shape),
         "compute_time_ms": (time.perf_counter() - start) * 1000.0,
@@ -444,24 +449,24 @@ def compute_backward(req: BackwardRequest):
         grads = tape.gradient(loss, trainable)
         if grads and grads[0] is not None:
             wg = np.asarray(grads[0].numpy()).reshape(-1).astype(np.float32)
-            response["weight_gradient"] = wg.tolist()
-            response["proposed_weight_delta"] = (-float(req.learningRate) * wg).tolist()
+            response["weight_gradient"] = wg
+            response["proposed_weight_delta"] = -float(req.learningRate) * wg
             stats["weightGradMean"] = float(np.mean(wg)) if wg.size else 0.0
             stats["weightGradStd"] = float(np.std(wg)) if wg.size else 0.0
             stats["weightGradMax"] = float(np.max(np.abs(wg))) if wg.size else 0.0
             if isinstance(layer, tf.keras.layers.Conv2D):
                 k = np.asarray(grads[0].numpy()).astype(np.float32)
-                response["kernel_gradients"] = [k[..., i].reshape(-1).tolist() for i in range(k.shape[-1])]
+                response["kernel_gradients"] = np.moveaxis(k, -1, 0).reshape(k.shape[-1], -1)
         if len(grads) > 1 and grads[1] is not None:
             bg = np.asarray(grads[1].numpy()).reshape(-1).astype(np.float32)
-            response["bias_gradient"] = bg.tolist()
-            response["proposed_bias_delta"] = (-float(req.learningRate) * bg).tolist()
+            response["bias_gradient"] = bg
+            response["proposed_bias_delta"] = -float(req.learningRate) * bg
 
     if arch == "rnn" and req.stageId.startswith("lstm"):
         response["gate_gradients"] = _fake_gates(in_np, req.stageIndex)
 
     del tape
-    return response
+    return NumpyJSONResponse(response)
 
 
 @router.post("/saliency")
@@ -507,12 +512,14 @@ def compute_saliency(req: SaliencyRequest):
         )
 
     shape = [1, 28, 28] if arch != "rnn" else [28, 28]
-    return {
-        "inputGradient": flat.astype(np.float32).tolist(),
-        "inputShape": shape,
-        "absoluteMax": float(np.max(flat)) if flat.size else 0.0,
-        "topPixels": top_pixels,
-    }
+    return NumpyJSONResponse(
+        {
+            "inputGradient": flat.astype(np.float32),
+            "inputShape": shape,
+            "absoluteMax": float(np.max(flat)) if flat.size else 0.0,
+            "topPixels": top_pixels,
+        }
+    )
 
 
 @router.post("/weights")
@@ -535,8 +542,8 @@ def inspect_weights(req: WeightInspectionRequest):
 
     response: dict[str, Any] = {
         "stageId": req.stageId,
-        "weights": flat.tolist(),
-        "bias": bias.reshape(-1).tolist() if bias is not None else None,
+        "weights": flat,
+        "bias": bias.reshape(-1) if bias is not None else None,
         "shape": list(kernel.shape),
         "statistics": {
             "mean": float(np.mean(flat)) if flat.size else 0.0,
@@ -557,7 +564,7 @@ def inspect_weights(req: WeightInspectionRequest):
         if uw:
             uflat = np.asarray(uw[0]).astype(np.float32).reshape(-1)
             ucounts, ubins = np.histogram(uflat, bins=50)
-            response["untrainedWeights"] = uflat.tolist()
+            response["untrainedWeights"] = uflat
             response["untrainedStatistics"] = {
                 "mean": float(np.mean(uflat)) if uflat.size else 0.0,
                 "std": float(np.std(uflat)) if uflat.size else 0.0,
@@ -570,7 +577,7 @@ def inspect_weights(req: WeightInspectionRequest):
                 },
             }
 
-    return response
+    return NumpyJSONResponse(response)
 
 
 @router.post("/neuron-biography")
@@ -706,20 +713,22 @@ def sensitivity_map(req: SensitivityRequest):
     top_idx = np.argpartition(-flat, top_k - 1)[:top_k] if top_k > 0 else np.array([], dtype=np.int32)
     top_idx = top_idx[np.argsort(-flat[top_idx])] if top_idx.size else top_idx
 
-    return {
-        "perPixelSensitivity": flat.tolist(),
-        "topSensitivePixels": [
-            {
-                "index": int(i),
-                "row": int((int(i) % (h * w)) // w),
-                "col": int(int(i) % w),
-                "sensitivity": float(flat[int(i)]),
-                "direction": "increase" if float(flat_signed[int(i)]) > 0 else "decrease",
-            }
-            for i in top_idx
-        ],
-        "overallSensitivity": float(np.mean(flat)) if flat.size else 0.0,
-    }
+    return NumpyJSONResponse(
+        {
+            "perPixelSensitivity": flat,
+            "topSensitivePixels": [
+                {
+                    "index": int(i),
+                    "row": int((int(i) % (h * w)) // w),
+                    "col": int(int(i) % w),
+                    "sensitivity": float(flat[int(i)]),
+                    "direction": "increase" if float(flat_signed[int(i)]) > 0 else "decrease",
+                }
+                for i in top_idx
+            ],
+            "overallSensitivity": float(np.mean(flat)) if flat.size else 0.0,
+        }
+    )
 
 
 @router.post("/counterfactual")
@@ -792,18 +801,20 @@ def minimal_flip(req: MinimalFlipRequest):
     original = x.numpy().reshape(-1)
     modified = adv_np.reshape(-1)
     diff = np.abs(modified - original)
-    return {
-        "found": True,
-        "epsilon": float(best_eps),
-        "modifiedPixels": modified.astype(np.float32).tolist(),
-        "perturbationMap": diff.astype(np.float32).tolist(),
-        "newPrediction": {
-            "label": _label_for_dataset(req.dataset, adv_label),
-            "confidence": float(np.max(adv_probs) * 100.0),
-            "probs": adv_probs.tolist(),
-        },
-        "affectedPixelCount": int(np.sum(diff > 0.01)),
-    }
+    return NumpyJSONResponse(
+        {
+            "found": True,
+            "epsilon": float(best_eps),
+            "modifiedPixels": modified.astype(np.float32),
+            "perturbationMap": diff.astype(np.float32),
+            "newPrediction": {
+                "label": _label_for_dataset(req.dataset, adv_label),
+                "confidence": float(np.max(adv_probs) * 100.0),
+                "probs": adv_probs.tolist(),
+            },
+            "affectedPixelCount": int(np.sum(diff > 0.01)),
+        }
+    )
 
 
 @router.post("/comparison/run-all")
@@ -842,8 +853,8 @@ def comparison_run_all(req: ComparisonRequest):
             layer = layers.get(lname) if lname else None
             param_count = int(layer.count_params()) if layer is not None else 0
             act = {
-                "input": np.asarray(in_data, dtype=np.float32).reshape(-1).tolist(),
-                "output": _dataset_adjust(np.asarray(out_data, dtype=np.float32).reshape(-1), req.dataset).tolist(),
+                "input": np.asarray(in_data, dtype=np.float32).reshape(-1),
+                "output": _dataset_adjust(np.asarray(out_data, dtype=np.float32).reshape(-1), req.dataset),
                 "input_shape": list(np.asarray(in_data).shape),
                 "output_shape": list(np.asarray(out_data).shape),
                 "param_count": param_count,
@@ -852,9 +863,9 @@ def comparison_run_all(req: ComparisonRequest):
             if layer is not None:
                 w = layer.get_weights()
                 if w:
-                    act["weights"] = np.asarray(w[0]).reshape(-1).astype(np.float32).tolist()
+                    act["weights"] = np.asarray(w[0]).reshape(-1).astype(np.float32)
                     if len(w) > 1:
-                        act["bias"] = np.asarray(w[1]).reshape(-1).astype(np.float32).tolist()
+                        act["bias"] = np.asarray(w[1]).reshape(-1).astype(np.float32)
             if arch == "rnn" and sid.startswith("lstm"):
                 act["gates"] = _fake_gates(np.asarray(out_data).reshape(-1), idx)
             activations[sid] = act
@@ -869,4 +880,4 @@ def comparison_run_all(req: ComparisonRequest):
             },
             "totalTimeMs": elapsed_ms,
         }
-    return results
+    return NumpyJSONResponse(results)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from api.transport import NumpyJSONResponse
 from services.inference import inference_engine
 from services.explanation import explainer
 
@@ -17,4 +18,4 @@ def predict(req: PredictRequest):
     result = inference_engine.predict(req.pixels, req.model_type)
     weights = inference_engine.get_weights(result["model_type"])
     result["explanation"] = explainer.build(result, weights, result["model_type"])
-    return result
+    return NumpyJSONResponse(result)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from simulator.augmentation import preview_augmentations
@@ -19,4 +19,7 @@ class PreviewRequest(BaseModel):
 
 @router.post("/preview")
 def augment_preview(req: PreviewRequest) -> Dict:
-    return {"samples": preview_augmentations(req.input, req.input_shape, req.n_samples, req.pipeline)}
+    try:
+        return {"samples": preview_augmentations(req.input, req.input_shape, req.n_samples, req.pipeline)}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
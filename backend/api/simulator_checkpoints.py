@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from fastapi import APIRouter, HTTPException
+
+from simulator.checkpoint import checkpoint_store, restore
+from simulator.import_export.architecture_serializer import parse_architecture
+from simulator.session_manager import session_manager
+from simulator.training_engine import TrainingConfig, training_sessions
+
+router = APIRouter(prefix="/api/simulator/checkpoints", tags=["simulator-checkpoints"])
+
+
+@router.get("")
+def list_checkpoints() -> Dict:
+    return {"checkpoints": checkpoint_store.list()}
+
+
+@router.post("/{graph_id}/restore")
+def restore_checkpoint(graph_id: str) -> Dict:
+    """Rebuild the graph and training session from disk; continue with a `from_checkpoint` train start."""
+    try:
+        checkpoint = checkpoint_store.load(graph_id)
+        graph = session_manager.ensure_graph(graph_id, parse_architecture(checkpoint.architecture))
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    session = training_sessions.reset(graph_id, graph, TrainingConfig(**checkpoint.config))
+    restore(session, checkpoint)
+    return {
+        "graph_id": graph_id,
+        "dataset_id": checkpoint.dataset_id,
+        "epoch": checkpoint.epoch,
+        "epochs": checkpoint.config.get("epochs"),
+        "history_length": len(session.history),
+    }
+
+
+@router.delete("/{graph_id}")
+def delete_checkpoint(graph_id: str) -> Dict:
+    try:
+        checkpoint_store.delete(graph_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"deleted": graph_id}
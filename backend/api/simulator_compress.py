@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -25,6 +25,7 @@ class QuantizeRequest(BaseModel):
 class SweepRequest(BaseModel):
     graph_id: str
     sparsity_range: List[float]
+    dataset_id: Optional[str] = None
 
 
 @router.post("/prune")
@@ -51,4 +52,7 @@ def compress_sweep(req: SweepRequest) -> Dict:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return pruning_sweep(graph, req.sparsity_range)
+    try:
+        return pruning_sweep(graph, req.sparsity_range, req.dataset_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import base64
 import json
 
 import numpy as np
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from pydantic import BaseModel, Field
 
 from simulator.dataset_engine import custom_dataset, generate_dataset
@@ -23,13 +23,15 @@ from simulator.equation_engine import layer_equations
 from simulator.forward_engine import run_forward_full, run_forward_step
 from simulator.inspector import activation_inspection, weight_inspection
 from simulator.backward_engine import backward_full, backward_step
-from simulator.sequence_engine import sequence_step, sequence_full
+from simulator.sequence_engine import sequence_full, sequence_sessions, sequence_step
 from simulator.debugger import diagnose
 from simulator.performance_estimator import estimate_performance
 from simulator.snapshot_manager import snapshot_manager
 from simulator.training_engine import TrainingConfig, training_sessions
 from simulator.layers import LayerConfig, validate_layers
 from simulator.session_manager import session_manager
+from simulator.wire import to_builtin
+from simulator.admission import memory_admission
 from simulator.comparison.comparison_engine import setup_comparison
 from simulator.comparison.comparison_metrics import compute_comparison_results
 from simulator.profiler.flops_counter import compute_flops
@@ -41,8 +43,9 @@ from simulator.import_export.architecture_serializer import parse_architecture,
 from simulator.import_export.code_generator import generate_pytorch, generate_keras
 from simulator.import_export.image_exporter import export_svg
 from simulator.templates.architecture_templates import list_templates
+from api.transport import TensorRoute, tensor_response
 
-router = APIRouter(prefix="/api/simulator", tags=["simulator"])
+router = APIRouter(prefix="/api/simulator", tags=["simulator"], route_class=TensorRoute)
 
 
 class LayerIn(BaseModel):
@@ -67,6 +70,7 @@ class LayerIn(BaseModel):
 
 class ArchitectureRequest(BaseModel):
     layers: List[LayerIn]
+    seed: Optional[int] = None
 
 
 class ForwardRequest(BaseModel):
@@ -101,11 +105,13 @@ class SequenceDatasetRequest(BaseModel):
     n_classes: int = Field(3, ge=2, le=50)
     noise: float = Field(0.1, ge=0.0, le=1.0)
     train_split: float = Field(0.8, ge=0.5, le=0.95)
+    seed: Optional[int] = None
 
 
 class CustomDatasetRequest(BaseModel):
     points: List[dict]
     train_split: float = Field(0.8, ge=0.5, le=0.95)
+    seed: Optional[int] = None
 
 
 class StandardDatasetRequest(BaseModel):
@@ -213,6 +219,18 @@ class SequenceFullRequest(BaseModel):
     sequence: List[List[float]]
 
 
+class SequenceSessionRequest(BaseModel):
+    graph_id: str
+
+
+class SequenceSessionStepRequest(BaseModel):
+    input: Union[List[float], float]
+
+
+class SequenceEvictRequest(BaseModel):
+    keep_last: Optional[int] = Field(None, ge=0)
+
+
 class CompareSetupRequest(BaseModel):
     models: List[dict]
     dataset_id: str
@@ -271,8 +289,13 @@ def _parse_layers(req_layers: List[LayerIn]) -> List[LayerConfig]:
 def architecture_validate(req: ArchitectureRequest):
     layers = _parse_layers(req.layers)
     result = validate_layers(layers)
+    admission = memory_admission.evaluate(layers) if result.valid else None
+    if admission is not None and not admission.admitted:
+        result.errors.extend(admission.reasons)
+    elif admission is not None and admission.degraded:
+        result.warnings.extend(admission.reasons)
     return {
-        "valid": result.valid,
+        "valid": result.valid and (admission is None or admission.admitted),
         "architecture": result.architecture,
         "activations": result.activations,
         "total_params": result.total_params,
@@ -280,16 +303,20 @@ def architecture_validate(req: ArchitectureRequest):
         "layer_params": result.layer_params,
         "errors": result.errors,
         "warnings": result.warnings,
+        "admission": admission.to_dict() if admission else None,
     }
 
 
 @router.post("/architecture/build")
-def architecture_build(req: ArchitectureRequest):
+def architecture_build(req: ArchitectureRequest, request: Request):
     layers = _parse_layers(req.layers)
     result = validate_layers(layers)
     if not result.valid:
         raise HTTPException(status_code=400, detail=result.errors)
-    graph_id = session_manager.create_graph(layers)
+    try:
+        graph_id = session_manager.create_graph(layers, seed=req.seed)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=[str(exc)]) from exc
     graph = session_manager.get_graph(graph_id)
     weight_stats = []
     for idx, w in enumerate(graph.weights):
@@ -302,37 +329,55 @@ def architecture_build(req: ArchitectureRequest):
                 "max": float(w.max()),
             }
         )
-    return {
-        "graph_id": graph_id,
-        "weights": [w.tolist() for w in graph.weights],
-        "biases": [b.tolist() for b in graph.biases],
-        "weight_stats": weight_stats,
-    }
+    return tensor_response(
+        request,
+        {
+            "graph_id": graph_id,
+            "weights": list(graph.weights),
+            "biases": list(graph.biases),
+            "weight_stats": weight_stats,
+            "admission": memory_admission.decision(graph_id).to_dict(),
+        },
+    )
+
+
+@router.delete("/architecture/{graph_id}")
+def architecture_delete(graph_id: str):
+    if training_sessions.is_running(graph_id):
+        raise HTTPException(status_code=400, detail="Graph is training; stop the run first")
+    try:
+        session_manager.delete_graph(graph_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"deleted": graph_id}
 
 
 @router.post("/forward/full")
-def forward_full(req: ForwardRequest):
+def forward_full(req: ForwardRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     steps, final_output, layer_outputs = run_forward_full(graph, req.input)
-    return {
-        "steps": steps,
-        "final_output": final_output,
-        "total_steps": len(steps),
-        "layer_outputs": {str(k): v for k, v in layer_outputs.items()},
-    }
+    return tensor_response(
+        request,
+        {
+            "steps": steps,
+            "final_output": final_output,
+            "total_steps": len(steps),
+            "layer_outputs": {str(k): v for k, v in layer_outputs.items()},
+        },
+    )
 
 
 @router.post("/forward/step")
-def forward_step(req: ForwardStepRequest):
+def forward_step(req: ForwardStepRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     try:
-        return run_forward_step(graph, req.input, req.step_index)
+        return tensor_response(request, run_forward_step(graph, req.input, req.step_index))
     except IndexError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -377,7 +422,7 @@ def dataset_load_standard(req: StandardDatasetRequest):
 @router.post("/dataset/custom")
 def dataset_custom(req: CustomDatasetRequest):
     try:
-        data = custom_dataset(req.points, req.train_split)
+        data = custom_dataset(req.points, req.train_split, req.seed)
         dataset_manager.add(data["dataset_id"], data)
         return data
     except ValueError as exc:
@@ -388,7 +433,9 @@ def dataset_custom(req: CustomDatasetRequest):
 def dataset_generate_sequence(req: SequenceDatasetRequest):
     dtype = (req.type or "sine_wave").lower()
     if dtype == "text_tokens":
-        data = generate_text_tokens(req.n_samples, req.seq_length, req.vocab_size, req.n_classes, req.train_split)
+        data = generate_text_tokens(
+            req.n_samples, req.seq_length, req.vocab_size, req.n_classes, req.train_split, req.seed
+        )
     else:
         data = generate_sequence_dataset(
             dtype,
@@ -398,6 +445,7 @@ def dataset_generate_sequence(req: SequenceDatasetRequest):
             req.n_classes,
             req.noise,
             req.train_split,
+            req.seed,
         )
     dataset_manager.add(data["dataset_id"], data)
     return data
@@ -410,31 +458,31 @@ async def dataset_upload_image(file: UploadFile = File(...), target_size: int =
 
 
 @router.post("/inspect/weights")
-def inspect_weights(req: InspectWeightsRequest):
+def inspect_weights(req: InspectWeightsRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     try:
-        return weight_inspection(graph, req.layer_index)
+        return tensor_response(request, weight_inspection(graph, req.layer_index))
     except IndexError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/inspect/activations")
-def inspect_activations(req: InspectActivationsRequest):
+def inspect_activations(req: InspectActivationsRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     try:
-        return activation_inspection(graph, req.layer_index, req.input)
+        return tensor_response(request, activation_inspection(graph, req.layer_index, req.input))
     except IndexError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/backward/full")
-def backward_full_route(req: BackwardRequest):
+def backward_full_route(req: BackwardRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
@@ -445,11 +493,11 @@ def backward_full_route(req: BackwardRequest):
         "dW": [np.asarray(g) for g in result["gradients_W"]],
         "db": [np.asarray(g) for g in result["gradients_b"]],
     }
-    return result
+    return tensor_response(request, result)
 
 
 @router.post("/backward/step")
-def backward_step_route(req: BackwardStepRequest):
+def backward_step_route(req: BackwardStepRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
@@ -468,13 +516,13 @@ def backward_step_route(req: BackwardStepRequest):
                         db.append(np.asarray(entry["db"]))
                 if dW:
                     session.last_gradients = {"dW": dW, "db": db}
-        return result
+        return tensor_response(request, result)
     except IndexError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/inspect/gradients")
-def inspect_gradients(req: GradientsRequest):
+def inspect_gradients(req: GradientsRequest, request: Request):
     try:
         session = training_sessions.get(req.graph_id)
     except KeyError as exc:
@@ -485,20 +533,23 @@ def inspect_gradients(req: GradientsRequest):
     db = session.last_gradients["db"][req.layer_index]
     vals = dW.flatten()
     counts, edges = np.histogram(vals, bins=12)
-    return {
-        "layer_index": req.layer_index,
-        "dW_matrix": dW.tolist(),
-        "db_vector": db.tolist(),
-        "dW_shape": [int(dW.shape[0]), int(dW.shape[1])],
-        "stats": {
-            "mean": float(np.mean(vals)),
-            "std": float(np.std(vals)),
-            "min": float(np.min(vals)),
-            "max": float(np.max(vals)),
-            "l2_norm": float(np.linalg.norm(vals)),
+    return tensor_response(
+        request,
+        {
+            "layer_index": req.layer_index,
+            "dW_matrix": dW,
+            "db_vector": db,
+            "dW_shape": [int(dW.shape[0]), int(dW.shape[1])],
+            "stats": {
+                "mean": float(np.mean(vals)),
+                "std": float(np.std(vals)),
+                "min": float(np.min(vals)),
+                "max": float(np.max(vals)),
+                "l2_norm": float(np.linalg.norm(vals)),
+            },
+            "histogram": {"bins": [float(e) for e in edges.tolist()], "counts": [int(c) for c in counts.tolist()]},
         },
-        "histogram": {"bins": [float(e) for e in edges.tolist()], "counts": [int(c) for c in counts.tolist()]},
-    }
+    )
 
 
 @router.post("/inspect/gradient_flow")
@@ -521,26 +572,40 @@ def inspect_gradient_flow(req: GradientFlowRequest):
 
 
 @router.get("/inspect/weight_history/{graph_id}")
-def inspect_weight_history(graph_id: str):
+def inspect_weight_history(
+    graph_id: str, start: float | None = None, end: float | None = None, resolution: int = 500
+):
+    try:
+        session = training_sessions.get(graph_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return session.weight_telemetry(start, end, max(1, resolution))
+
+
+@router.get("/inspect/metric_history/{graph_id}")
+def inspect_metric_history(
+    graph_id: str, start: float | None = None, end: float | None = None, resolution: int = 500
+):
     try:
         session = training_sessions.get(graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    epochs = [h["epoch"] for h in session.weight_history]
-    per_layer = []
-    if session.weight_history:
-        layers = len(session.weight_history[0]["weight_norms"])
-        for li in range(layers):
-            per_layer.append(
-                {
-                    "layer": li,
-                    "norms": [h["weight_norms"][li] for h in session.weight_history],
-                    "means": [],
-                    "stds": [],
-                    "deltas": [h["weight_deltas"][li] for h in session.weight_history],
-                }
-            )
-    return {"epochs": epochs, "per_layer": per_layer}
+    result = {}
+    for name, fields in (
+        ("epochs", ("train_loss", "train_accuracy", "learning_rate")),
+        ("evaluation", ("test_loss", "test_accuracy")),
+    ):
+        if session.telemetry.series(name) is None:
+            result[name] = {"epochs": [], **{f: [] for f in fields}}
+            continue
+        window = session.telemetry.query(name, start, end, max(1, resolution))
+        entry = {"epochs": window["t_start"].astype(int).tolist(), "counts": window["count"].tolist()}
+        for ci, field_name in enumerate(fields):
+            entry[field_name] = window["mean"][:, ci].tolist()
+            entry[f"{field_name}_min"] = window["min"][:, ci].tolist()
+            entry[f"{field_name}_max"] = window["max"][:, ci].tolist()
+        result[name] = entry
+    return result
 
 
 @router.post("/debug/diagnose")
@@ -594,7 +659,7 @@ def replay_snapshots(graph_id: str):
                 "test_loss": snap.metrics.get("test_loss"),
                 "train_accuracy": snap.metrics.get("train_accuracy"),
                 "test_accuracy": snap.metrics.get("test_accuracy"),
-                "thumbnail_boundary": snap.boundary,
+                "thumbnail_boundary": snap.boundary.thumbnail() if snap.boundary is not None else None,
             }
         )
     return {"total_snapshots": len(snaps), "epochs": [s.epoch for s in snaps], "summaries": summaries}
@@ -607,16 +672,15 @@ def replay_load(req: ReplayLoadRequest):
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     try:
-        snap = snapshot_manager.get_snapshot(req.graph_id, req.snapshot_index)
+        snap = snapshot_manager.restore(req.graph_id, graph, req.snapshot_index)
     except IndexError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    snapshot_manager.apply_snapshot(graph, snap)
     return {
         "epoch": snap.epoch,
         "weights": [w.tolist() for w in snap.weights],
         "biases": [b.tolist() for b in snap.biases],
         "metrics": snap.metrics,
-        "boundary_grid": None,
+        "boundary_grid": snap.boundary.to_dict() if snap.boundary is not None else None,
         "layer_activations_sample": None,
     }
 
@@ -631,18 +695,18 @@ def performance_estimate(req: PerformanceRequest):
 
 
 @router.post("/activations/feature_maps")
-def activations_feature_maps(req: FeatureMapRequest):
+def activations_feature_maps(req: FeatureMapRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     from simulator.visualization.feature_maps import compute_feature_maps
 
-    return compute_feature_maps(graph, req.input_image, req.input_shape)
+    return tensor_response(request, compute_feature_maps(graph, req.input_image, req.input_shape))
 
 
 @router.post("/activations/saliency")
-def activations_saliency(req: SaliencyRequest):
+def activations_saliency(req: SaliencyRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
@@ -651,21 +715,23 @@ def activations_saliency(req: SaliencyRequest):
     if method == "grad_cam":
         from simulator.visualization.grad_cam import compute_grad_cam
 
-        return compute_grad_cam(graph, req.input, req.input_shape, req.target_class)
+        return tensor_response(request, compute_grad_cam(graph, req.input, req.input_shape, req.target_class))
     from simulator.visualization.saliency import compute_saliency
 
-    return compute_saliency(graph, req.input, req.input_shape, req.target_class)
+    return tensor_response(request, compute_saliency(graph, req.input, req.input_shape, req.target_class))
 
 
 @router.post("/activations/filter_response")
-def activations_filter_response(req: FilterResponseRequest):
+def activations_filter_response(req: FilterResponseRequest, request: Request):
     try:
         graph = session_manager.get_graph(req.graph_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     from simulator.visualization.filter_response import compute_filter_response
 
-    return compute_filter_response(graph, req.dataset_id, req.layer_index, req.filter_index, req.n_samples)
+    return tensor_response(
+        request, compute_filter_response(graph, req.dataset_id, req.layer_index, req.filter_index, req.n_samples)
+    )
 
 
 @router.post("/activations/neuron_atlas")
@@ -703,9 +769,61 @@ def sequence_full_route(req: SequenceFullRequest):
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@router.post("/sequence/session")
+def sequence_session_create(req: SequenceSessionRequest):
+    """Open a stepping session that keeps recurrent state and attention key/value caches between calls.
+
+    Attention is stepped causally, so with attention before another sequence layer the
+    outputs differ from /sequence/full (see `SequenceStepper`).
+    """
+    try:
+        graph = session_manager.get_graph(req.graph_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    try:
+        session_id, stepper = sequence_sessions.create(graph)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"session_id": session_id, "tokens": stepper.tokens, "input_width": stepper.input_width}
+
+
+@router.post("/sequence/session/{session_id}/step")
+def sequence_session_step(session_id: str, req: SequenceSessionStepRequest):
+    try:
+        stepper = sequence_sessions.get(session_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    try:
+        return to_builtin(stepper.step(req.input))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/sequence/session/{session_id}/evict")
+def sequence_session_evict(session_id: str, req: SequenceEvictRequest):
+    """Trim attention caches to the newest `keep_last` positions (all of them when omitted)."""
+    try:
+        stepper = sequence_sessions.get(session_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"cache_lengths": stepper.evict(req.keep_last)}
+
+
+@router.delete("/sequence/session/{session_id}")
+def sequence_session_delete(session_id: str):
+    try:
+        sequence_sessions.delete(session_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"deleted": session_id}
+
+
 @router.post("/compare/setup")
 def compare_setup(req: CompareSetupRequest):
-    return setup_comparison(req.models, req.dataset_id, req.epochs)
+    try:
+        return setup_comparison(req.models, req.dataset_id, req.epochs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get("/compare/results/{comparison_id}")
@@ -775,7 +893,10 @@ def import_build(req: ImportBuildRequest):
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     layers = parse_architecture(artifact.architecture)
-    graph_id = session_manager.create_graph(layers)
+    try:
+        graph_id = session_manager.create_graph(layers)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"graph_id": graph_id, "ready": True}
 
 
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from simulator.sequence_engine import SequenceStepper
+from simulator.session_manager import session_manager
+from simulator.wire import FrameEncoder
+
+router = APIRouter()
+
+
+@router.websocket("/ws/simulator/sequence")
+async def simulator_sequence_ws(ws: WebSocket):
+    """Stateful stepping through a recurrent model (`?graph_id=`), one timestep per message.
+
+    Actions: `step` (`input`: one timestep or token id), `feed` (`sequence`: several timesteps,
+    replies with the last), `save` / `restore` (`state_id`) to branch from a saved point,
+    `generate` (`steps`, `temperature`, `seed`) to continue autoregressively, `evict`
+    (`keep_last`) to trim attention key/value caches, and `reset`.
+    """
+    await ws.accept()
+    encoder = FrameEncoder.from_params(ws.query_params)
+    send = encoder.sender(ws)
+    try:
+        stepper = SequenceStepper(session_manager.get_graph(ws.query_params.get("graph_id", "")))
+    except (KeyError, ValueError) as exc:
+        await send({"type": "error", "message": str(exc)})
+        await ws.close()
+        return
+    await send({"type": "ready", "timestep": 0, "tokens": stepper.tokens, "input_width": stepper.input_width})
+
+    try:
+        while True:
+            data = json.loads(await ws.receive_text())
+            action = data.get("action")
+            try:
+                if action == "step":
+                    await send(stepper.step(data.get("input")))
+                elif action == "feed":
+                    sequence = data.get("sequence") or []
+                    if not sequence:
+                        raise ValueError("Empty sequence")
+                    for x_t in sequence[:-1]:
+                        stepper.step(x_t)
+                    await send(stepper.step(sequence[-1]))
+                elif action == "save":
+                    await send({"type": "saved", "state_id": stepper.save(), "timestep": stepper.t})
+                elif action == "restore":
+                    stepper.restore(data.get("state_id"))
+                    await send({"type": "restored", "state_id": data.get("state_id"), "timestep": stepper.t})
+                elif action == "generate":
+                    rng = np.random.default_rng(data.get("seed"))
+                    generated = []
+                    for result in stepper.generate(data.get("steps", 1), float(data.get("temperature", 1.0)), rng):
+                        generated.append(result.get("token", result["input_t"]))
+                        await send({**result, "type": "generated"})
+                        await asyncio.sleep(0)
+                    await send({"type": "generation_complete", "generated": generated, "timestep": stepper.t})
+                elif action == "evict":
+                    lengths = stepper.evict(data.get("keep_last"))
+                    await send({"type": "evicted", "cache_lengths": lengths, "timestep": stepper.t})
+                elif action == "reset":
+                    stepper.reset()
+                    await send({"type": "ready", "timestep": 0, "tokens": stepper.tokens, "input_width": stepper.input_width})
+                else:
+                    await send({"type": "error", "message": f"Unknown action: {action}"})
+            except (KeyError, TypeError, ValueError) as exc:
+                await send({"type": "error", "message": str(exc)})
+    except WebSocketDisconnect:
+        return
@@ -2,128 +2,233 @@ from __future__ import annotations
 
 import asyncio
 import json
-import numpy as np
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from simulator.boundary import boundary_worker
+from simulator.broadcast import Subscription, Topic, broadcast_hub, training_topic
+from simulator.checkpoint import checkpoint_store, restore
 from simulator.dataset_manager import dataset_manager
+from simulator.import_export.architecture_serializer import parse_architecture
 from simulator.session_manager import session_manager
-from simulator.training_engine import TrainingConfig, training_sessions
+from simulator.telemetry_channel import TelemetryChannel
+from simulator.training_engine import TrainingConfig, TrainingMetrics, training_sessions
+from simulator.evaluation import EvaluationResult
+from simulator.training_worker import TrainingWorker
+from simulator.wire import FrameEncoder
 from simulator.debugger import diagnose
 
 router = APIRouter()
 
+BATCH_FIELDS = ("loss", "accuracy", "gradient_norm")
+# Large per-epoch payloads that subscribers receive only if they opt in (?weights=1).
+WEIGHT_FIELDS = ("weights", "biases")
+
+
+def _metrics_message(epoch: int, metrics: TrainingMetrics) -> dict:
+    return {
+        "type": "epoch",
+        "epoch": epoch,
+        "metrics": {
+            "train_loss": metrics.train_loss,
+            "test_loss": metrics.test_loss,
+            "train_accuracy": metrics.train_accuracy,
+            "test_accuracy": metrics.test_accuracy,
+            "learning_rate": metrics.learning_rate,
+            "gradient_norms": metrics.gradient_norms,
+            "weight_norms": metrics.weight_norms,
+            "weight_deltas": metrics.weight_deltas,
+            "dead_neurons": metrics.dead_neurons,
+            "epoch_duration_ms": metrics.epoch_duration_ms,
+            "activation_stats": metrics.activation_stats,
+            "test_epoch": metrics.test_epoch,
+        },
+    }
+
+
+def _topic(graph_id: str) -> Topic:
+    return broadcast_hub.topic(training_topic(graph_id))
+
+
+def _release_topic(graph_id: str | None) -> None:
+    # Kept while a run publishes to it; otherwise dropped once its last viewer leaves.
+    if graph_id is not None and not training_sessions.is_running(graph_id):
+        broadcast_hub.discard(training_topic(graph_id))
+
+
+def _omit(push_weights: bool) -> tuple:
+    return () if push_weights else WEIGHT_FIELDS
+
 
 @router.websocket("/ws/simulator/train")
 async def simulator_train_ws(ws: WebSocket):
+    """Drives one training session and publishes its telemetry to the session's broadcast topic.
+
+    This connection receives the telemetry through its own subscription, like any viewer on
+    `/ws/simulator/train/watch`; replies to its own actions (negotiation, errors) go to it alone.
+    """
     await ws.accept()
-    training_task: asyncio.Task | None = None
-    stop_flag = False
+    channel = TelemetryChannel(max_rate=ws.query_params.get("max_rate"))
+    encoder = FrameEncoder.from_params(ws.query_params)
+    # Weight pushes are opt-in (?weights=1 or a negotiate action); they are cheap in binary mode.
+    push_weights = ws.query_params.get("weights") == "1"
+    pump_task = asyncio.create_task(channel.pump(encoder.sender(ws)))
+    worker: TrainingWorker | None = None
+    relay_task: asyncio.Task | None = None
+    subscription: Subscription | None = None
+    subscription_task: asyncio.Task | None = None
     current_graph_id: str | None = None
 
-    async def run_training(graph_id: str, dataset_id: str, config: TrainingConfig):
-        nonlocal stop_flag
+    def watch(topic: Topic) -> None:
+        nonlocal subscription, subscription_task
+        if subscription_task:
+            subscription_task.cancel()
+        subscription = topic.subscribe(encoder, omit=_omit(push_weights))
+        subscription_task = asyncio.create_task(subscription.pump(ws))
+
+    async def relay(worker: TrainingWorker, graph_id: str, config: TrainingConfig, topic: Topic):
         graph = session_manager.get_graph(graph_id)
-        session = training_sessions.reset(graph_id, graph, config)
-        data = dataset_manager.get(dataset_id)
-        train = [(np.array(p["x"], dtype=np.float32), np.array(p["y"], dtype=np.float32)) for p in data["train"]]
-        test = [(np.array(p["x"], dtype=np.float32), np.array(p["y"], dtype=np.float32)) for p in data["test"]]
-
-        await ws.send_json({"type": "status", "status": "training", "message": "Training started"})
-
-        for epoch in range(config.epochs):
-            if stop_flag:
-                break
-            while session.is_paused:
-                await asyncio.sleep(0.2)
-            session.epoch = epoch
-
-            def batch_cb(batch_index, total_batches, loss, acc, grad_norm):
-                asyncio.create_task(
-                    ws.send_json(
+        session = training_sessions.get(graph_id)
+        session.is_running = True
+        # Coalescing and rate limiting happen once here, for the whole audience.
+        telemetry = TelemetryChannel(max_rate=ws.query_params.get("max_rate"))
+        publisher = asyncio.create_task(telemetry.pump(topic.apublish))
+
+        try:
+            async for kind, payload in worker.events():
+                if kind == "batch":
+                    telemetry.publish_sample({"type": "batch", **payload}, BATCH_FIELDS)
+                elif kind == "status":
+                    session.is_paused = payload["status"] == "paused"
+                    telemetry.publish({"type": "status", **payload})
+                elif kind == "epoch":
+                    metrics = TrainingMetrics(**payload["metrics"])
+                    session.absorb_epoch(
+                        graph_id,
+                        metrics,
+                        payload["weights"],
+                        payload["biases"],
+                        payload["weight_points"],
+                        payload["last_gradients"],
+                    )
+                    message = _metrics_message(metrics.epoch, metrics)
+                    if topic.wants("weights"):
+                        message["weights"] = payload["weights"]
+                        message["biases"] = payload["biases"]
+                    telemetry.publish(message)
+
+                    diag = diagnose(metrics.gradient_norms, [m.train_loss for m in session.history], metrics.train_loss, metrics.test_loss, metrics.dead_neurons, [l.neurons for l in graph.layers[1:]])
+                    for issue in diag["issues"]:
+                        telemetry.publish(
+                            {
+                                "type": "warning",
+                                "severity": issue.get("severity", "warning"),
+                                "code": issue.get("code"),
+                                "message": issue.get("message"),
+                                "layer_index": issue.get("layer_index"),
+                                "epoch": metrics.epoch,
+                                "suggestion": issue.get("suggestion"),
+                            }
+                        )
+                elif kind == "evaluation":
+                    result = EvaluationResult(**payload)
+                    session.absorb_evaluation(result)
+                    telemetry.publish(
                         {
-                            "type": "batch",
-                            "epoch": epoch,
-                            "batch": batch_index + 1,
-                            "total_batches": total_batches,
-                            "loss": loss,
-                            "accuracy": acc,
-                            "gradient_norm": grad_norm,
+                            "type": "evaluation",
+                            "epoch": result.epoch,
+                            "test_loss": result.test_loss,
+                            "test_accuracy": result.test_accuracy,
+                            "samples": result.samples,
+                            "full": result.full,
+                            "loss_ci": list(result.loss_ci),
+                            "accuracy_ci": list(result.accuracy_ci),
+                            "duration_ms": result.duration_ms,
                         }
                     )
-                )
-
-            metrics = session.train_epoch(train, test, graph_id, batch_callback=batch_cb)
-
-            await ws.send_json(
-                {
-                    "type": "epoch",
-                    "epoch": epoch,
-                    "metrics": {
-                        "train_loss": metrics.train_loss,
-                        "test_loss": metrics.test_loss,
-                        "train_accuracy": metrics.train_accuracy,
-                        "test_accuracy": metrics.test_accuracy,
-                        "learning_rate": metrics.learning_rate,
-                        "gradient_norms": metrics.gradient_norms,
-                        "weight_norms": metrics.weight_norms,
-                        "weight_deltas": metrics.weight_deltas,
-                        "dead_neurons": metrics.dead_neurons,
-                        "epoch_duration_ms": metrics.epoch_duration_ms,
-                    },
-                }
-            )
-
-            diag = diagnose(metrics.gradient_norms, [m.train_loss for m in session.history], metrics.train_loss, metrics.test_loss, metrics.dead_neurons, [l.neurons for l in graph.layers[1:]])
-            for issue in diag["issues"]:
-                await ws.send_json(
-                    {
-                        "type": "warning",
-                        "severity": issue.get("severity", "warning"),
-                        "code": issue.get("code"),
-                        "message": issue.get("message"),
-                        "layer_index": issue.get("layer_index"),
-                        "epoch": epoch,
-                        "suggestion": issue.get("suggestion"),
-                    }
-                )
-
-        await ws.send_json(
-            {
-                "type": "complete",
-                "total_epochs": config.epochs,
-                "final_train_loss": session.history[-1].train_loss if session.history else 0,
-                "final_test_loss": session.history[-1].test_loss if session.history else 0,
-                "final_train_accuracy": session.history[-1].train_accuracy if session.history else 0,
-                "final_test_accuracy": session.history[-1].test_accuracy if session.history else 0,
-                "total_snapshots": len(session.history),
-            }
-        )
+                elif kind == "complete":
+                    graph.set_params(payload["weights"], payload["biases"])
+                    if payload.get("stopped"):
+                        telemetry.publish({"type": "status", "status": "stopped"})
+                    telemetry.publish(
+                        {
+                            "type": "complete",
+                            "total_epochs": config.epochs,
+                            "final_train_loss": session.history[-1].train_loss if session.history else 0,
+                            "final_test_loss": session.history[-1].test_loss if session.history else 0,
+                            "final_train_accuracy": session.history[-1].train_accuracy if session.history else 0,
+                            "final_test_accuracy": session.history[-1].test_accuracy if session.history else 0,
+                            "total_snapshots": len(session.history),
+                            "stop_reason": payload.get("stop_reason"),
+                        }
+                    )
+                elif kind == "error":
+                    telemetry.publish({"type": "error", "message": payload.get("message")})
+        finally:
+            session.is_running = False
+            session.is_paused = False
+            telemetry.close()
+            await publisher
+            broadcast_hub.discard(topic.key)
+
+    async def stop_worker():
+        nonlocal worker, relay_task
+        if worker:
+            await worker.shutdown()
+        if relay_task:
+            await relay_task
+        worker = None
+        relay_task = None
 
     try:
         while True:
             data = json.loads(await ws.receive_text())
             action = data.get("action")
-            if action == "start":
+            if action == "negotiate":
+                try:
+                    reply = encoder.configure(data.get("encoding"), data.get("dtype"))
+                except ValueError as exc:
+                    channel.publish({"type": "error", "message": str(exc)})
+                    continue
+                push_weights = bool(data.get("weights", push_weights))
+                if subscription is not None:
+                    subscription.omit = frozenset(_omit(push_weights))
+                channel.publish({**reply, "weights": push_weights})
+            elif action == "start":
+                await stop_worker()
                 graph_id = data.get("graph_id")
-                dataset_id = data.get("dataset_id")
+                checkpoint = None
+                try:
+                    if data.get("from_checkpoint"):
+                        checkpoint = checkpoint_store.load(graph_id)
+                        graph = session_manager.ensure_graph(graph_id, parse_architecture(checkpoint.architecture))
+                    else:
+                        graph = session_manager.get_graph(graph_id)
+                    dataset_id = data.get("dataset_id") or (checkpoint.dataset_id if checkpoint else None)
+                    train = dataset_manager.tensors(dataset_id, "train")
+                    test = dataset_manager.tensors(dataset_id, "test")
+                except (KeyError, ValueError) as exc:
+                    channel.publish({"type": "error", "message": str(exc)})
+                    continue
                 current_graph_id = graph_id
-                cfg = data.get("config", {})
-                config = TrainingConfig(**cfg)
-                stop_flag = False
-                training_task = asyncio.create_task(run_training(graph_id, dataset_id, config))
-            elif action == "pause":
-                if training_task and current_graph_id:
-                    session = training_sessions.get(current_graph_id)
-                    session.is_paused = True
-                    await ws.send_json({"type": "status", "status": "paused"})
-            elif action == "resume":
-                if training_task and current_graph_id:
-                    session = training_sessions.get(current_graph_id)
-                    session.is_paused = False
-                    await ws.send_json({"type": "status", "status": "training"})
+                raw = {"seed": session_manager.seed(graph_id), **(checkpoint.config if checkpoint else {})}
+                config = TrainingConfig(**{**raw, **data.get("config", {})})
+                session = training_sessions.reset(graph_id, graph, config)
+                boundary_worker.watch(graph_id, train.X)
+                if checkpoint is not None:
+                    restore(session, checkpoint)
+                worker = TrainingWorker(graph, session.config, train, test, graph_id, dataset_id, checkpoint)
+                worker.start()
+                topic = _topic(graph_id)
+                # Viewers joining later start here, at the beginning of this run.
+                topic.publish({"type": "status", "status": "training", "message": "Training started"}, sync=True)
+                watch(topic)
+                relay_task = asyncio.create_task(relay(worker, graph_id, session.config, topic))
+            elif action in {"pause", "resume", "step"}:
+                if worker and worker.alive:
+                    worker.send(action)
             elif action == "stop":
-                stop_flag = True
-                await ws.send_json({"type": "status", "status": "stopped"})
+                if worker and worker.alive:
+                    worker.send("stop")
             elif action == "update_config":
                 graph_id = data.get("graph_id") or current_graph_id
                 updates = data.get("updates", {})
@@ -133,9 +238,57 @@ async def simulator_train_ws(ws: WebSocket):
                         setattr(session.config, k, v)
                 if "optimizer" in updates:
                     session.optimizer_state = None
+                if worker and graph_id == current_graph_id:
+                    worker.send("update_config", updates)
             else:
-                await ws.send_json({"type": "error", "message": f"Unknown action: {action}"})
+                channel.publish({"type": "error", "message": f"Unknown action: {action}"})
+    except WebSocketDisconnect:
+        if worker:
+            await worker.shutdown()
+        if relay_task:
+            relay_task.cancel()
+        return
+    finally:
+        channel.close()
+        pump_task.cancel()
+        if subscription_task:
+            subscription_task.cancel()
+        if subscription is not None:
+            subscription.close()
+        _release_topic(current_graph_id)
+
+
+@router.websocket("/ws/simulator/train/watch")
+async def simulator_train_watch_ws(ws: WebSocket):
+    """Read-only view of `?graph_id=`'s training telemetry, for any number of viewers.
+
+    Frames come from the session's shared buffer, serialized once per wire format. Late
+    joiners start at the beginning of the current run (as far as the buffer reaches);
+    reconnecting clients pass the last message's `cursor` as `?resume=`.
+    """
+    await ws.accept()
+    encoder = FrameEncoder.from_params(ws.query_params)
+    graph_id = ws.query_params.get("graph_id")
+    if not graph_id or not session_manager.has_graph(graph_id):
+        await encoder.sender(ws)({"type": "error", "message": "Graph not found"})
+        await ws.close()
+        return
+    push_weights = ws.query_params.get("weights") == "1"
+    subscription = _topic(graph_id).subscribe(encoder, ws.query_params.get("resume"), _omit(push_weights))
+    forwarder = asyncio.create_task(subscription.pump(ws))
+    try:
+        while True:
+            data = json.loads(await ws.receive_text())
+            if data.get("action") == "negotiate":
+                try:
+                    encoder.configure(data.get("encoding"), data.get("dtype"))
+                except ValueError:
+                    continue
+                push_weights = bool(data.get("weights", push_weights))
+                subscription.omit = frozenset(_omit(push_weights))
     except WebSocketDisconnect:
-        if training_task:
-            training_task.cancel()
         return
+    finally:
+        forwarder.cancel()
+        subscription.close()
+        _release_topic(graph_id)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from api.transport import NumpyJSONResponse
 from services.inference import inference_engine
 
 router = APIRouter()
@@ -13,4 +14,4 @@ class StateRequest(BaseModel):
 
 @router.post("/state")
 def state(req: StateRequest):
-    return inference_engine.get_state(req.pixels, req.model_type)
+    return NumpyJSONResponse(inference_engine.get_state(req.pixels, req.model_type))
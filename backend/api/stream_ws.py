@@ -4,6 +4,9 @@ from typing import Dict, List, Tuple
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from simulator.topology_stream import topology_streams
+from simulator.wire import FrameEncoder
+
 router = APIRouter()
 
 
@@ -176,14 +179,47 @@ def _build_snapshot(epoch: int) -> dict:
     }
 
 
+async def _demo(send) -> None:
+    epoch = 0
+    while True:
+        await send(_build_snapshot(epoch))
+        epoch += 1
+        await asyncio.sleep(0.5)
+
+
+async def _watch(ws: WebSocket, encoder: FrameEncoder, graph_id: str, dataset_id: str | None, resume: str | None) -> None:
+    try:
+        stream = topology_streams.get(graph_id, dataset_id)
+    except KeyError as exc:
+        await encoder.sender(ws)({"type": "error", "message": str(exc)})
+        await ws.close()
+        return
+
+    subscription = stream.subscribe(encoder, resume)
+    # The stream can stay silent while the model is idle, so watch the receive side for the
+    # disconnect instead of waiting for a send to fail.
+    forwarder = asyncio.create_task(subscription.pump(ws))
+    try:
+        while True:
+            await ws.receive_text()
+    finally:
+        forwarder.cancel()
+        subscription.close()
+
+
 @router.websocket("/stream")
 async def stream(ws: WebSocket):
+    """Live topology of `?graph_id=` (keyframe, then sparse deltas); the synthetic demo without one.
+
+    Reconnecting clients pass the last message's `cursor` as `?resume=` to continue where they left off.
+    """
     await ws.accept()
-    epoch = 0
+    encoder = FrameEncoder.from_params(ws.query_params)
+    graph_id = ws.query_params.get("graph_id")
     try:
-        while True:
-            await ws.send_json(_build_snapshot(epoch))
-            epoch += 1
-            await asyncio.sleep(0.5)
+        if graph_id:
+            await _watch(ws, encoder, graph_id, ws.query_params.get("dataset_id"), ws.query_params.get("resume"))
+        else:
+            await _demo(encoder.sender(ws))
     except WebSocketDisconnect:
         return
@@ -3,17 +3,24 @@ import json
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from simulator.telemetry_channel import TelemetryChannel
+from simulator.wire import FrameEncoder
 from training.manager import training_manager
 
 router = APIRouter()
 
+BATCH_FIELDS = ("loss", "accuracy", "learning_rate", "gradient_norm")
+
 
 @router.websocket("/train")
 async def train_ws(ws: WebSocket):
     await ws.accept()
-    loop = asyncio.get_running_loop()
+    # Training callbacks run on the trainer's thread; the channel hands messages to one sender task.
+    channel = TelemetryChannel(max_rate=ws.query_params.get("max_rate"))
+    encoder = FrameEncoder.from_params(ws.query_params)
+    pump_task = asyncio.create_task(channel.pump(encoder.sender(ws)))
 
-    async def _send_status():
+    def _send_status():
         current = training_manager.get_status()
         status_map = {
             "running": "training",
@@ -23,7 +30,7 @@ async def train_ws(ws: WebSocket):
             "error": "idle",
             "idle": "idle",
         }
-        await ws.send_json(
+        channel.publish(
             {
                 "type": "status",
                 "status": status_map.get(current.get("status", "idle"), "idle"),
@@ -32,13 +39,6 @@ async def train_ws(ws: WebSocket):
             }
         )
 
-    def _send_threadsafe(message: dict):
-        try:
-            asyncio.run_coroutine_threadsafe(ws.send_json(message), loop)
-        except RuntimeError:
-            # Event loop is not available (shutdown/disconnect in progress).
-            return
-
     def emit(payload):
         ptype = payload.get("type")
 
@@ -56,7 +56,7 @@ async def train_ws(ws: WebSocket):
                 "gradient_norm": payload.get("gradient_norm", 0.0),
                 "timestamp": payload.get("timestamp"),
             }
-            _send_threadsafe(msg)
+            channel.publish_sample(msg, BATCH_FIELDS)
             return
 
         if ptype == "epoch_update":
@@ -73,7 +73,7 @@ async def train_ws(ws: WebSocket):
                 "f1_per_class": payload.get("f1_per_class", []),
                 "confusion_matrix": payload.get("confusion_matrix", []),
             }
-            _send_threadsafe(msg)
+            channel.publish(msg)
             return
 
         if ptype == "training_complete":
@@ -83,50 +83,58 @@ async def train_ws(ws: WebSocket):
                 "type": "complete",
                 "test_accuracy": float(last.get("val_accuracy", 0.0)),
             }
-            _send_threadsafe(msg)
+            channel.publish(msg)
             return
 
         if ptype == "training_error":
             msg = {"type": "error", "message": payload.get("error", "Training error")}
-            _send_threadsafe(msg)
+            channel.publish(msg)
             return
 
         if ptype == "training_stopped":
-            _send_threadsafe({"type": "status", "status": "stopped"})
+            channel.publish({"type": "status", "status": "stopped"})
             return
 
-        _send_threadsafe(payload)
+        channel.publish(payload)
 
     try:
         while True:
             data = json.loads(await ws.receive_text())
             cmd = data.get("command") or data.get("action")
-            if cmd == "configure":
+            if cmd == "negotiate":
+                try:
+                    channel.publish(encoder.configure(data.get("encoding"), data.get("dtype")))
+                except ValueError as exc:
+                    channel.publish({"type": "error", "message": str(exc)})
+            elif cmd == "configure":
                 training_manager.configure(data.get("config", {}))
-                await _send_status()
+                _send_status()
             elif cmd == "start":
                 cfg = data.get("config")
                 if isinstance(cfg, dict):
                     training_manager.configure(cfg)
                 training_manager.start(emit)
-                await ws.send_json({"type": "status", "status": "training_started"})
-                await _send_status()
+                channel.publish({"type": "status", "status": "training_started"})
+                _send_status()
             elif cmd == "pause":
                 training_manager.pause()
-                await _send_status()
+                _send_status()
             elif cmd == "resume":
                 training_manager.resume()
-                await _send_status()
+                _send_status()
             elif cmd == "stop":
                 training_manager.stop()
-                await _send_status()
+                _send_status()
             elif cmd == "step_batch":
-                await ws.send_json(training_manager.step_batch())
+                channel.publish(training_manager.step_batch())
             elif cmd == "step_epoch":
-                await ws.send_json(training_manager.step_epoch())
+                channel.publish(training_manager.step_epoch())
             elif cmd in {"get_status", "status"}:
-                await _send_status()
+                _send_status()
             else:
-                await ws.send_json({"type": "error", "message": f"Unknown command: {cmd}"})
+                channel.publish({"type": "error", "message": f"Unknown command: {cmd}"})
     except WebSocketDisconnect:
         return
+    finally:
+        channel.close()
+        pump_task.cancel()
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from email.message import Message
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+import json
+import math
+import struct
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+import config
+from simulator.wire import FLOAT_DTYPES, decode_binary, encode_binary, to_builtin
+
+# Binary tensor transport for REST: the same `[u32 header length][JSON header][buffers]`
+# layout as the binary WebSocket frames (see `simulator.wire.encode_binary`).
+TENSOR_MEDIA_TYPE = "application/x-tensor"
+
+
+def _media(value: str | None) -> Message:
+    message = Message()
+    message["content-type"] = value or ""
+    return message
+
+
+def negotiated_dtype(request: Request) -> str | None:
+    """The float dtype of an `Accept: application/x-tensor[; dtype=float16]` request, else None."""
+    for part in request.headers.get("accept", "").split(","):
+        media = _media(part.strip())
+        if media.get_content_type() == TENSOR_MEDIA_TYPE:
+            dtype = media.get_param("dtype") or "float32"
+            return dtype if dtype in FLOAT_DTYPES else "float32"
+    return None
+
+
+def tensor_response(request: Request, payload: Dict) -> Response:
+    """Respond with `payload` as a binary tensor frame if the client accepts one, else as JSON.
+
+    Payloads keep their ndarrays unconverted either way (see `NumpyJSONResponse`).
+    Payloads without arrays are always JSON, so clients must check the response content type.
+    """
+    dtype = negotiated_dtype(request)
+    headers = {"Vary": "Accept"}
+    if dtype is not None:
+        frame = encode_binary(payload, dtype)
+        if frame is not None:
+            return Response(frame, media_type=TENSOR_MEDIA_TYPE, headers=headers)
+    return NumpyJSONResponse(payload, headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _fallback(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return jsonable_encoder(value)
+
+
+def round_significant(array: np.ndarray, digits: int) -> np.ndarray:
+    """Float `array` rounded to `digits` significant digits (other arrays unchanged)."""
+    if not digits or array.dtype.kind != "f" or not array.size:
+        return array
+    values = array.astype(np.float64)
+    with np.errstate(all="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values), out=np.zeros_like(values), where=values != 0))
+        scale = 10.0 ** (digits - 1 - magnitude)
+        rounded = np.round(values * scale) / scale
+    return np.where(np.isfinite(rounded), rounded, values).astype(array.dtype)
+
+
+def _round_float(value: float, digits: int) -> float:
+    return float(f"{value:.{digits}g}") if digits and math.isfinite(value) else value
+
+
+def _float_json(value: float, digits: int) -> str:
+    if not math.isfinite(value):
+        return "null"
+    return f"{value:.{digits}g}" if digits else repr(value)
+
+
+def _template(shape: tuple, item: str) -> str:
+    text = item
+    for n in reversed(shape):
+        text = "[" + ",".join([text] * n) + "]"
+    return text
+
+
+def _array_json(array: np.ndarray, digits: int) -> str:
+    """JSON for a numeric array: one %-format over a nested template, no per-row lists."""
+    if array.ndim == 0:
+        return _scalar_json(array.item(), digits)
+    if not array.size or array.dtype.kind not in "iuf":
+        return json.dumps(array.tolist(), default=_fallback)
+    if array.dtype.kind == "f":
+        if not np.isfinite(array).all():
+            finite = np.isfinite(array)
+            return json.dumps(np.where(finite, round_significant(array, digits), None).tolist())
+        flat = np.ascontiguousarray(array, dtype=np.float64).reshape(-1)
+        # %.9g round-trips float32; repr is the shortest exact float64.
+        item = f"%.{digits}g" if digits else ("%.9g" if array.dtype.itemsize <= 4 else "%r")
+    else:
+        # Native byte order keeps the array's own integer type (uint64 stays unsigned).
+        flat = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("=")).reshape(-1)
+        item = "%d"
+    return _template(array.shape, item) % tuple(memoryview(flat))
+
+
+def _scalar_json(value: Any, digits: int) -> str:
+    if isinstance(value, float):
+        return _float_json(value, digits)
+    if value is None or isinstance(value, (str, int)):
+        return json.dumps(value)
+    return json.dumps(value, default=_fallback)
+
+
+def _write(value: Any, digits: int, out: List[str]) -> None:
+    if isinstance(value, np.ndarray):
+        out.append(_array_json(value, digits))
+    elif isinstance(value, dict):
+        out.append("{")
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                out.append(",")
+            out.append(json.dumps(key if isinstance(key, str) else str(key)))
+            out.append(":")
+            _write(item, digits, out)
+        out.append("}")
+    elif isinstance(value, (list, tuple)) and value and all(type(item) is float for item in value):
+        out.append(_array_json(np.array(value, dtype=np.float64), digits))
+    elif isinstance(value, (list, tuple)):
+        out.append("[")
+        for i, item in enumerate(value):
+            if i:
+                out.append(",")
+            _write(item, digits, out)
+        out.append("]")
+    elif isinstance(value, np.generic):
+        out.append(_scalar_json(value.item(), digits))
+    else:
+        out.append(_scalar_json(value, digits))
+
+
+def _rounded(value: Any, digits: int) -> Any:
+    """Copy of the containers in `value` with arrays and floats rounded, for orjson."""
+    if isinstance(value, np.ndarray):
+        return round_significant(value, digits)
+    if isinstance(value, dict):
+        return {k: _rounded(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rounded(v, digits) for v in value]
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return _round_float(value, digits) if math.isfinite(value) else None
+    return value
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray) and not value.flags.c_contiguous:
+        return np.ascontiguousarray(value)
+    # Includes arrays of dtypes orjson does not serialize natively.
+    return _fallback(value)
+
+
+def render_json(content: Any, precision: int | None = None) -> bytes:
+    """Serialize `content` with ndarrays written directly and floats cut to `precision` significant digits.
+
+    Uses orjson (OPT_SERIALIZE_NUMPY) when it is installed, otherwise a built-in encoder that
+    formats each array in one pass. Non-finite floats become null in both.
+    """
+    digits = config.JSON_FLOAT_PRECISION if precision is None else precision
+    orjson = _orjson()
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(_rounded(content, digits), default=_orjson_default, option=option)
+    out: List[str] = []
+    _write(content, digits, out)
+    return "".join(out).encode("utf-8")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response for payloads holding ndarrays; avoids `.tolist()` and FastAPI's encoder walk.
+
+    Routes return it directly (a returned dict would go through `jsonable_encoder` first).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+class TensorRequest(Request):
+    """A request whose `application/x-tensor` body is read as the JSON it encodes.
+
+    Arrays in the body become lists, so the route's pydantic models validate it unchanged.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = to_builtin(decode_binary(await self.body()))
+        return self._json
+
+
+class TensorRoute(APIRoute):
+    """Route class accepting binary tensor request bodies alongside JSON ones."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if _media(request.headers.get("content-type")).get_content_type() == TENSOR_MEDIA_TYPE:
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (k, b"application/json") if k == b"content-type" else (k, v) for k, v in request.scope["headers"]
+                ]
+                tensor_request = TensorRequest(scope, request.receive)
+                try:
+                    await tensor_request.json()
+                except (ValueError, KeyError, IndexError, struct.error) as exc:
+                    return JSONResponse({"detail": f"Invalid tensor body: {exc}"}, status_code=400)
+                request = tensor_request
+            return await handler(request)
+
+        return route_handler
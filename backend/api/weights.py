@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from api.transport import NumpyJSONResponse
 from services.inference import inference_engine
 
 router = APIRouter()
@@ -7,4 +8,4 @@ router = APIRouter()
 
 @router.get("/weights")
 def get_weights(model_type: str | None = None):
-    return inference_engine.get_weights(model_type)
+    return NumpyJSONResponse(inference_engine.get_weights(model_type))
@@ -18,6 +18,8 @@ from api.simulator_generative import router as simulator_generative_router
 from api.simulator_augmentation import router as simulator_augmentation_router
 from api.simulator_experiments import router as simulator_experiments_router
 from api.simulator_assistant import router as simulator_assistant_router
+from api.simulator_checkpoints import router as simulator_checkpoints_router
+from api.simulator_sequence_ws import router as simulator_sequence_ws_router
 from api.simulator_train_ws import router as simulator_train_ws_router
 from api.state import router as state_router
 from api.stream_ws import router as stream_ws_router
@@ -56,7 +58,9 @@ app.include_router(simulator_generative_router)
 app.include_router(simulator_augmentation_router)
 app.include_router(simulator_experiments_router)
 app.include_router(simulator_assistant_router)
+app.include_router(simulator_checkpoints_router)
 app.include_router(simulator_train_ws_router)
+app.include_router(simulator_sequence_ws_router)
 app.include_router(train_ws_router)
 app.include_router(stream_ws_router)
 
@@ -34,3 +34,48 @@ MODEL_INPUT_SHAPES = {
     "cnn": (28, 28, 1),
     "rnn": (28, 28),
 }
+
+# JSON responses carrying arrays: significant digits kept per float (0 keeps full precision).
+# Serialized with orjson when it is installed, otherwise with a built-in NumPy encoder.
+JSON_FLOAT_PRECISION = int(os.getenv("JSON_FLOAT_PRECISION", "6"))
+
+# Simulator memory admission. Budgets are bytes; override via environment for larger hosts.
+SIMULATOR_SESSION_MEMORY_BUDGET = int(os.getenv("SIMULATOR_SESSION_MEMORY_BUDGET", str(256 * 1024 * 1024)))
+SIMULATOR_GLOBAL_MEMORY_BUDGET = int(os.getenv("SIMULATOR_GLOBAL_MEMORY_BUDGET", str(2 * 1024 * 1024 * 1024)))
+SIMULATOR_SNAPSHOT_RESERVE = int(os.getenv("SIMULATOR_SNAPSHOT_RESERVE", "20"))
+
+# Replay snapshots: resident bytes before older blobs spill to disk, delta precision
+# ("fp32" or "fp16"), optional "zstd" compression (needs the zstandard package).
+SIMULATOR_SNAPSHOT_MEMORY_BUDGET = int(os.getenv("SIMULATOR_SNAPSHOT_MEMORY_BUDGET", str(64 * 1024 * 1024)))
+SIMULATOR_SNAPSHOT_PRECISION = os.getenv("SIMULATOR_SNAPSHOT_PRECISION", "fp32")
+SIMULATOR_SNAPSHOT_COMPRESSION = os.getenv("SIMULATOR_SNAPSHOT_COMPRESSION", "")
+SIMULATOR_SNAPSHOT_DIR = os.getenv("SIMULATOR_SNAPSHOT_DIR") or None
+
+# Decision-boundary rasters stored with replay snapshots of 2-D datasets: mesh points per
+# side, and whether to evaluate a coarse mesh first and refine only cells the contour crosses.
+SIMULATOR_BOUNDARY_RESOLUTION = int(os.getenv("SIMULATOR_BOUNDARY_RESOLUTION", "128"))
+SIMULATOR_BOUNDARY_REFINE = os.getenv("SIMULATOR_BOUNDARY_REFINE", "1") == "1"
+
+# Training checkpoints survive restarts so runs can resume where they left off.
+SIMULATOR_CHECKPOINT_DIR = os.getenv("SIMULATOR_CHECKPOINT_DIR", os.path.join(MODELS_DIR, "simulator_checkpoints"))
+
+# WebSocket telemetry: maximum messages per second per client (clients may ask for less
+# via ?max_rate=) and queued messages per client before the oldest are dropped.
+SIMULATOR_WS_MAX_RATE = float(os.getenv("SIMULATOR_WS_MAX_RATE", "30"))
+SIMULATOR_WS_QUEUE_SIZE = int(os.getenv("SIMULATOR_WS_QUEUE_SIZE", "256"))
+
+# Live topology stream (/stream?graph_id=...): sampling period in seconds, the smallest
+# weight/activation change worth sending, and how many messages pass between keyframes.
+SIMULATOR_STREAM_INTERVAL = float(os.getenv("SIMULATOR_STREAM_INTERVAL", "0.5"))
+SIMULATOR_STREAM_THRESHOLD = float(os.getenv("SIMULATOR_STREAM_THRESHOLD", "1e-3"))
+SIMULATOR_STREAM_KEYFRAME_INTERVAL = int(os.getenv("SIMULATOR_STREAM_KEYFRAME_INTERVAL", "20"))
+
+# Broadcast hub: messages retained per session for late joiners and resume tokens. Keep it
+# above SIMULATOR_STREAM_KEYFRAME_INTERVAL so a keyframe is always retained.
+SIMULATOR_BROADCAST_BUFFER = int(os.getenv("SIMULATOR_BROADCAST_BUFFER", "256"))
+
+# Stateful sequence stepping: REST stepping sessions kept (least recently used dropped
+# first) and the attention key/value cache length beyond which the oldest positions are
+# evicted (0 keeps every position).
+SIMULATOR_SEQUENCE_SESSIONS = int(os.getenv("SIMULATOR_SEQUENCE_SESSIONS", "32"))
+SIMULATOR_ATTENTION_CACHE_LIMIT = int(os.getenv("SIMULATOR_ATTENTION_CACHE_LIMIT", "0"))
@@ -29,9 +29,9 @@ class ExplanationBuilder:
     def build_cnn(self, result):
         active = []
         for layer in result.get("feature_maps", [])[:2]:
-            if layer["activation_ranking"]:
-                idx = layer["activation_ranking"][0]
-                active.append({"layer": layer["layer_name"], "filter": idx, "mean": layer["mean_activations"][idx]})
+            if len(layer["activation_ranking"]):
+                idx = int(layer["activation_ranking"][0])
+                active.append({"layer": layer["layer_name"], "filter": idx, "mean": float(layer["mean_activations"][idx])})
         return {
             "model_type": "cnn",
             "active_filters": active,
@@ -72,7 +72,7 @@ class InferenceEngine:
         for layer in model.layers:
             w = layer.get_weights()
             if w:
-                summary[layer.name] = [arr.tolist() for arr in w]
+                summary[layer.name] = list(w)
         self.weights_cache[model_type] = summary
 
     def predict(self, pixels, model_type=None):
@@ -99,11 +99,11 @@ class InferenceEngine:
             "model_type": "ann",
             "prediction": int(np.argmax(probs)),
             "confidence": float(np.max(probs)),
-            "probabilities": probs.tolist(),
+            "probabilities": probs,
             "layers": {
-                "hidden1": outputs[0][0].tolist() if len(outputs) > 1 else [],
-                "hidden2": outputs[1][0].tolist() if len(outputs) > 2 else [],
-                "hidden3": outputs[2][0].tolist() if len(outputs) > 3 else [],
+                "hidden1": outputs[0][0] if len(outputs) > 1 else [],
+                "hidden2": outputs[1][0] if len(outputs) > 2 else [],
+                "hidden3": outputs[2][0] if len(outputs) > 3 else [],
             },
         }
 
@@ -129,22 +129,22 @@ class InferenceEngine:
                     "layer_type": layer.__class__.__name__,
                     "shape": list(fmap.shape),
                     "top_k": 16,
-                    "activation_ranking": ranking.tolist(),
-                    "feature_maps": fmap[:, :, ranking].transpose(2, 0, 1).tolist(),
-                    "mean_activations": means.tolist(),
+                    "activation_ranking": ranking,
+                    "feature_maps": fmap[:, :, ranking].transpose(2, 0, 1),
+                    "mean_activations": means,
                 })
             elif len(act.shape) == 2 and layer.name != "output":
-                dense_layers[layer.name] = act[0].tolist()
+                dense_layers[layer.name] = act[0]
         kernels = []
         for layer in model.layers:
             if isinstance(layer, tf.keras.layers.Conv2D):
                 k = layer.get_weights()[0]
-                kernels.append({"layer_name": layer.name, "kernel_shape": list(k.shape), "kernels": k.tolist()})
+                kernels.append({"layer_name": layer.name, "kernel_shape": list(k.shape), "kernels": k})
         return {
             "model_type": "cnn",
             "prediction": int(np.argmax(probs)),
             "confidence": float(np.max(probs)),
-            "probabilities": probs.tolist(),
+            "probabilities": probs,
             "feature_maps": feature_maps,
             "kernels": kernels,
             "dense_layers": dense_layers,
@@ -154,7 +154,7 @@ class InferenceEngine:
         x = np.array(pixels, dtype=np.float32).reshape(1, 28, 28)
         outputs = self.activation_models["rnn"].predict(x, verbose=0)
         probs = outputs[-1][0]
-        timestep_activations = np.mean(x[0], axis=1).tolist()
+        timestep_activations = np.mean(x[0], axis=1)
         dense_layers = {}
         model = self.models["rnn"]
         out_idx = 0
@@ -165,15 +165,15 @@ class InferenceEngine:
             act = outputs[out_idx]
             out_idx += 1
             if "lstm" in layer.name:
-                lstm_output = act[0].tolist()
+                lstm_output = act[0]
             elif len(act.shape) == 2 and layer.name != "output":
-                dense_layers[layer.name] = act[0].tolist()
+                dense_layers[layer.name] = act[0]
         arr = np.array(lstm_output, dtype=np.float32)
         return {
             "model_type": "rnn",
             "prediction": int(np.argmax(probs)),
             "confidence": float(np.max(probs)),
-            "probabilities": probs.tolist(),
+            "probabilities": probs,
             "timestep_activations": timestep_activations,
             "lstm_output": lstm_output,
             "cell_state_summary": {
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+import threading
+
+import config
+
+from .layers import LayerConfig
+from .profiler.memory_estimator import project_memory
+
+
+@dataclass
+class AdmissionDecision:
+    status: str
+    core_bytes: int
+    history_bytes: int
+    session_budget_bytes: int
+    global_available_bytes: int
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def admitted(self) -> bool:
+        return self.status != "reject"
+
+    @property
+    def degraded(self) -> bool:
+        return self.status == "degraded"
+
+    @property
+    def reserved_bytes(self) -> int:
+        if self.status == "accept":
+            return self.core_bytes + self.history_bytes
+        if self.status == "degraded":
+            return self.core_bytes
+        return 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "core_bytes": int(self.core_bytes),
+            "history_bytes": int(self.history_bytes),
+            "reserved_bytes": int(self.reserved_bytes),
+            "session_budget_bytes": int(self.session_budget_bytes),
+            "global_available_bytes": int(self.global_available_bytes),
+            "reasons": list(self.reasons),
+        }
+
+
+class MemoryAdmission:
+    """Admits graphs against per-session and global byte budgets.
+
+    Core memory (params, gradients, optimizer state, activations) must fit;
+    weight history and snapshots are dropped first when it is tight.
+    """
+
+    def __init__(self, session_budget: int, global_budget: int, snapshot_reserve: int) -> None:
+        self.session_budget = session_budget
+        self.global_budget = global_budget
+        self.snapshot_reserve = snapshot_reserve
+        self._reserved: Dict[str, AdmissionDecision] = {}
+        self._lock = threading.Lock()
+
+    def reserved_total(self) -> int:
+        with self._lock:
+            return sum(d.reserved_bytes for d in self._reserved.values())
+
+    def evaluate(self, layers: List[LayerConfig]) -> AdmissionDecision:
+        report = project_memory(layers)
+        core = (
+            report["params_bytes"]
+            + report["gradients_bytes"]
+            + report["optimizer_bytes"]
+            + report["activations_bytes"]
+        )
+        history = report["params_bytes"] * self.snapshot_reserve
+        available = max(0, self.global_budget - self.reserved_total())
+        limit = min(self.session_budget, available)
+
+        reasons: List[str] = []
+        if core + history <= limit:
+            status = "accept"
+        elif core <= limit:
+            status = "degraded"
+            reasons.append("Weight history and snapshots disabled to fit the memory budget.")
+        else:
+            status = "reject"
+            if core > self.session_budget:
+                reasons.append(
+                    f"Projected memory {core} bytes exceeds the per-session budget of {self.session_budget} bytes."
+                )
+            else:
+                reasons.append(
+                    f"Projected memory {core} bytes exceeds the {available} bytes left in the global budget."
+                )
+        return AdmissionDecision(status, core, history, self.session_budget, available, reasons)
+
+    def reserve(self, graph_id: str, decision: AdmissionDecision) -> None:
+        if not decision.admitted:
+            raise ValueError("; ".join(decision.reasons))
+        with self._lock:
+            in_use = sum(d.reserved_bytes for gid, d in self._reserved.items() if gid != graph_id)
+            if in_use + decision.reserved_bytes > self.global_budget:
+                raise ValueError("Global simulator memory budget exhausted.")
+            self._reserved[graph_id] = decision
+
+    def release(self, graph_id: str) -> None:
+        with self._lock:
+            self._reserved.pop(graph_id, None)
+
+    def decision(self, graph_id: str) -> AdmissionDecision | None:
+        with self._lock:
+            return self._reserved.get(graph_id)
+
+    def is_degraded(self, graph_id: str) -> bool:
+        decision = self.decision(graph_id)
+        return bool(decision and decision.degraded)
+
+
+memory_admission = MemoryAdmission(
+    config.SIMULATOR_SESSION_MEMORY_BUDGET,
+    config.SIMULATOR_GLOBAL_MEMORY_BUDGET,
+    config.SIMULATOR_SNAPSHOT_RESERVE,
+)
@@ -1 +1,2 @@
+from .batched import BatchAugmenter
 from .preview import preview_augmentations
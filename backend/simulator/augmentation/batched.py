@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+import math
+
+import numpy as np
+
+GEOMETRIC = {"flip_h", "flip_v", "rotate90", "rotate", "shift", "scale", "crop"}
+PHOTOMETRIC = {"noise", "brightness"}
+
+
+def _rotation(theta: np.ndarray) -> np.ndarray:
+    """(N, 3, 3) sampling maps that turn an image counter-clockwise by `theta` radians, as `np.rot90` does."""
+    c, s = np.cos(theta), np.sin(theta)
+    m = np.zeros((len(theta), 3, 3), dtype=np.float64)
+    m[:, 0, 0], m[:, 0, 1] = c, s
+    m[:, 1, 0], m[:, 1, 1] = -s, c
+    m[:, 2, 2] = 1.0
+    return m
+
+
+def _diag(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    m = np.zeros((len(rows), 3, 3), dtype=np.float64)
+    m[:, 0, 0], m[:, 1, 1], m[:, 2, 2] = rows, cols, 1.0
+    return m
+
+
+class BatchAugmenter:
+    """Applies an augmentation pipeline to a whole batch with per-sample random parameters.
+
+    Geometric steps are composed into one inverse affine map per sample and resolved
+    with a single bilinear resample of the `(N, C, H, W)` batch; noise and brightness
+    are broadcast afterwards. Every step accepts `p`, the per-sample probability of
+    applying it (default 1). Step parameters:
+
+    - `flip_h`, `flip_v`
+    - `rotate90`: `k` quarter turns, or `"random"` for a uniformly drawn k
+    - `rotate`: `degrees`, maximum absolute angle
+    - `shift`: `fraction` of the height/width, maximum absolute offset
+    - `scale`: `range` `[min, max]` zoom factor
+    - `crop`: `ratio` of a centred crop resized back to the full image
+    - `noise`: `sigma` of additive Gaussian noise
+    - `brightness`: `delta`, maximum absolute additive offset
+    """
+
+    def __init__(self, pipeline: List[Dict], input_shape: Sequence[int] | None = None) -> None:
+        self.pipeline = [dict(step) for step in pipeline or []]
+        for step in self.pipeline:
+            kind = step.get("type")
+            if kind not in GEOMETRIC and kind not in PHOTOMETRIC:
+                raise ValueError(f"Unknown augmentation: {kind}")
+        self.geometric = [s for s in self.pipeline if s["type"] in GEOMETRIC]
+        self.photometric = [s for s in self.pipeline if s["type"] in PHOTOMETRIC]
+        shape = tuple(int(v) for v in input_shape) if input_shape else None
+        self.image_shape: Tuple[int, int, int] | None = shape if shape and len(shape) == 3 else None
+        if self.geometric and self.image_shape is None:
+            raise ValueError("Geometric augmentation needs a (C, H, W) input shape")
+        self._grid: np.ndarray | None = None
+        if self.image_shape is not None:
+            _, h, w = self.image_shape
+            rows, cols = np.mgrid[0:h, 0:w]
+            self._centre = np.array([(h - 1) / 2.0, (w - 1) / 2.0])
+            self._grid = np.stack(
+                [rows.ravel() - self._centre[0], cols.ravel() - self._centre[1], np.ones(h * w)]
+            )
+
+    @property
+    def active(self) -> bool:
+        return bool(self.pipeline)
+
+    def __call__(self, x: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Return an augmented float32 copy of batch `x` (any layout holding N samples of `input_shape`)."""
+        if not self.pipeline or not len(x):
+            return x
+        shape = x.shape
+        out = np.asarray(x, dtype=np.float32)
+        if self.geometric:
+            out = self._resample(out.reshape((len(x),) + self.image_shape), rng)
+        out = self._photometric(out, rng)
+        return out.reshape(shape)
+
+    # -- geometric -------------------------------------------------------------
+
+    def _sampling_matrices(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Per-sample maps from output to source coordinates (the inverse of the composed transform)."""
+        _, h, w = self.image_shape
+        inverse = np.broadcast_to(np.eye(3), (n, 3, 3)).copy()
+        for step in self.geometric:
+            apply = rng.random(n) < float(step.get("p", 1.0))
+            kind = step["type"]
+            if kind == "flip_h":
+                step_inv = _diag(np.ones(n), np.where(apply, -1.0, 1.0))
+            elif kind == "flip_v":
+                step_inv = _diag(np.where(apply, -1.0, 1.0), np.ones(n))
+            elif kind == "rotate90":
+                k = step.get("k", 1)
+                quarters = rng.integers(0, 4, n) if k == "random" else np.full(n, int(k) % 4)
+                step_inv = _rotation(np.where(apply, quarters, 0) * (math.pi / 2))
+            elif kind == "rotate":
+                limit = math.radians(float(step.get("degrees", 15.0)))
+                step_inv = _rotation(np.where(apply, rng.uniform(-limit, limit, n), 0.0))
+            elif kind == "shift":
+                fraction = float(step.get("fraction", 0.1))
+                step_inv = np.broadcast_to(np.eye(3), (n, 3, 3)).copy()
+                offsets = rng.uniform(-fraction, fraction, (n, 2)) * np.array([h, w])
+                step_inv[:, :2, 2] = -np.where(apply[:, None], offsets, 0.0)
+            elif kind == "scale":
+                lo, hi = step.get("range", (0.9, 1.1))
+                factor = np.where(apply, rng.uniform(float(lo), float(hi), n), 1.0)
+                step_inv = _diag(1.0 / factor, 1.0 / factor)
+            else:  # crop
+                ratio = np.where(apply, float(step.get("ratio", 0.8)), 1.0)
+                step_inv = _diag(ratio, ratio)
+            inverse = inverse @ step_inv
+        return inverse
+
+    def _resample(self, x: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        n, c, h, w = x.shape
+        inverse = self._sampling_matrices(n, rng)
+        source = (inverse[:, :2, :] @ self._grid).astype(np.float32)
+        sy = source[:, 0] + np.float32(self._centre[0])
+        sx = source[:, 1] + np.float32(self._centre[1])
+        y0 = np.floor(sy)
+        x0 = np.floor(sx)
+        wy = sy - y0
+        wx = sx - x0
+        y0 = y0.astype(np.intp)
+        x0 = x0.astype(np.intp)
+        flat = x.reshape(n, c, h * w)
+        out = np.zeros((n, c, h * w), dtype=np.float32)
+        for dy, weight_y in ((0, 1.0 - wy), (1, wy)):
+            rows = y0 + dy
+            for dx, weight_x in ((0, 1.0 - wx), (1, wx)):
+                cols = x0 + dx
+                # Pixels sampled from outside the image contribute zero (constant padding).
+                valid = (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+                weight = weight_y * weight_x * valid
+                index = np.clip(rows, 0, h - 1) * w + np.clip(cols, 0, w - 1)
+                out += np.take_along_axis(flat, index[:, None, :], axis=2) * weight[:, None, :]
+        return out.reshape(n, c, h, w)
+
+    # -- photometric -----------------------------------------------------------
+
+    def _photometric(self, x: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        n = len(x)
+        per_sample = (n,) + (1,) * (x.ndim - 1)
+        # The resample already produced a fresh array; otherwise copy before the first in-place step.
+        copied = bool(self.geometric)
+        for step in self.photometric:
+            apply = (rng.random(n) < float(step.get("p", 1.0))).reshape(per_sample)
+            if not copied:
+                x = x.copy()
+                copied = True
+            if step["type"] == "noise":
+                sigma = np.float32(step.get("sigma", 0.1))
+                x += rng.standard_normal(x.shape, dtype=np.float32) * sigma * apply
+            else:
+                delta = float(step.get("delta", 0.1))
+                x += rng.uniform(-delta, delta, n).astype(np.float32).reshape(per_sample) * apply
+        return x
@@ -4,7 +4,7 @@ from typing import List, Dict
 import numpy as np
 
 from ..visualization.rendering import render_gray
-from .transforms import apply_pipeline
+from .batched import BatchAugmenter
 
 
 def preview_augmentations(input_vec: List[float], input_shape: List[int] | None, n_samples: int, pipeline: List[Dict] | None = None) -> List[str]:
@@ -18,11 +18,8 @@ def preview_augmentations(input_vec: List[float], input_shape: List[int] | None,
     else:
         base = x.reshape(1, -1)
 
-    pipeline = pipeline or []
-    samples = []
-    for _ in range(n_samples):
-        img = base.copy()
-        if img.ndim == 2:
-            img = apply_pipeline(img, pipeline)
-        samples.append(render_gray(img))
-    return samples
+    batch = np.broadcast_to(base, (n_samples,) + base.shape)
+    if pipeline and base.shape[0] > 1:
+        augmenter = BatchAugmenter(pipeline, (1,) + base.shape)
+        batch = augmenter(np.ascontiguousarray(batch), np.random.default_rng())
+    return [render_gray(img) for img in batch]
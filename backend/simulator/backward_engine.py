@@ -23,8 +23,9 @@ def backward_full(
     x = np.asarray(input_vec, dtype=np.float32)
     y = np.asarray(target, dtype=np.float32).reshape(-1)
 
-    graph.forward(x)
-    y_hat = graph.activations[-1].reshape(-1)
+    ctx = graph.new_context()
+    graph.forward(x, ctx)
+    y_hat = ctx.activations[-1].reshape(-1)
     loss_value, loss_eq = compute_loss(y, y_hat, loss_fn)
 
     dense_only = all(layer.layer_type in {"input", "dense", "output"} for layer in graph.layers)
@@ -38,8 +39,8 @@ def backward_full(
         step_index = 0
 
         for layer_idx in reversed(range(num_layers)):
-            z = graph.pre_activations[layer_idx]
-            a_prev = graph.activations[layer_idx]
+            z = ctx.pre_activations[layer_idx]
+            a_prev = ctx.activations[layer_idx]
             act_name = (graph.layers[layer_idx + 1].activation or "linear").lower()
             activation = get_activation(act_name)
 
@@ -62,7 +63,7 @@ def backward_full(
                     "description": f"Layer {layer_idx + 1}: Compute delta",
                     "equation_text": "delta = (W.T�delta_next) ? f'(z)" if layer_idx < num_layers - 1 else "delta = a - y",
                     "equation_detailed": [f"delta{j+1} = {_fmt(delta[j])}" for j in range(min(4, len(delta)))],
-                    "output_values": delta.tolist(),
+                    "output_values": delta,
                 }
             )
             step_index += 1
@@ -86,7 +87,7 @@ def backward_full(
                         for r in range(min(2, dW.shape[0]))
                         for c in range(min(2, dW.shape[1]))
                     ],
-                    "gradient_values": dW.tolist(),
+                    "gradient_values": dW,
                 }
             )
             step_index += 1
@@ -99,7 +100,7 @@ def backward_full(
                     "description": f"Layer {layer_idx + 1}: Bias Gradients",
                     "equation_text": "?L/?b = delta",
                     "equation_detailed": [f"?b{j+1} = {_fmt(db[j])}" for j in range(min(4, len(db)))],
-                    "output_values": db.tolist(),
+                    "output_values": db,
                 }
             )
             step_index += 1
@@ -130,14 +131,14 @@ def backward_full(
             d_input = np.zeros_like(x)
 
         return {
-            "input_gradient": np.asarray(d_input).reshape(-1).tolist(),
+            "input_gradient": np.asarray(d_input).reshape(-1),
             "loss_value": loss_value,
             "loss_equation": loss_eq,
             "steps": steps,
             "total_steps": len(steps),
-            "gradients_W": [g.tolist() for g in grads_w],
-            "gradients_b": [g.tolist() for g in grads_b],
-            "deltas": [d.tolist() for d in deltas],
+            "gradients_W": grads_w,
+            "gradients_b": grads_b,
+            "deltas": deltas,
             "gradient_summary": {
                 "per_layer": per_layer,
                 "total_gradient_norm": float(np.linalg.norm(all_grads)),
@@ -151,10 +152,11 @@ def backward_full(
     grads_by_layer: Dict[int, Dict[str, np.ndarray]] = {}
 
     last_layer = graph.layer_instances[-1]
+    last_state = ctx.state(len(graph.layer_instances) - 1)
     if hasattr(last_layer, "activation_name"):
         act = get_activation(last_layer.activation_name)
-        if loss_fn == "mse" and hasattr(last_layer, "Z") and last_layer.Z is not None:
-            d_out = (y_hat - y) * act.derivative(last_layer.Z)
+        if loss_fn == "mse" and last_state.Z is not None:
+            d_out = (y_hat - y) * act.derivative(last_state.Z)
         else:
             d_out = y_hat - y
     else:
@@ -162,20 +164,21 @@ def backward_full(
 
     for layer_idx in reversed(range(1, len(graph.layer_instances))):
         layer = graph.layer_instances[layer_idx]
-        d_out = layer.backward(d_out)
+        state = ctx.state(layer_idx)
+        d_out = layer.backward(d_out, state)
         steps.append(
             {
                 "step_index": step_index,
                 "layer_index": layer_idx - 1,
                 "operation": "compute_delta",
                 "description": f"Layer {layer_idx}: Backward",
-                "output_values": np.asarray(d_out).reshape(-1).tolist(),
+                "output_values": np.asarray(d_out).reshape(-1),
             }
         )
         step_index += 1
 
         if getattr(layer, "has_params", False):
-            dw, db = layer.grads()
+            dw, db = layer.grads(state)
             if dw is not None and l2_lambda > 0.0:
                 dw = dw + l2_lambda * layer.params()[0]
             grads_by_layer[layer_idx] = {"dW": dw, "db": db}
@@ -185,7 +188,7 @@ def backward_full(
                     "layer_index": layer_idx - 1,
                     "operation": "compute_dW",
                     "description": f"Layer {layer_idx}: Weight Gradients",
-                    "gradient_values": np.asarray(dw).reshape(-1).tolist() if dw is not None else [],
+                    "gradient_values": np.asarray(dw).reshape(-1) if dw is not None else [],
                 }
             )
             step_index += 1
@@ -195,7 +198,7 @@ def backward_full(
                     "layer_index": layer_idx - 1,
                     "operation": "compute_db",
                     "description": f"Layer {layer_idx}: Bias Gradients",
-                    "output_values": np.asarray(db).reshape(-1).tolist() if db is not None else [],
+                    "output_values": np.asarray(db).reshape(-1) if db is not None else [],
                 }
             )
             step_index += 1
@@ -229,14 +232,14 @@ def backward_full(
     d_input = np.asarray(d_out).reshape(-1)
 
     return {
-        "input_gradient": d_input.tolist(),
+        "input_gradient": d_input,
         "loss_value": loss_value,
         "loss_equation": loss_eq,
         "steps": steps,
         "total_steps": len(steps),
-        "gradients_W": [g.tolist() for g in grads_w],
-        "gradients_b": [g.tolist() for g in grads_b],
-        "deltas": [d.tolist() for d in deltas],
+        "gradients_W": grads_w,
+        "gradients_b": grads_b,
+        "deltas": deltas,
         "gradient_summary": {
             "per_layer": per_layer,
             "total_gradient_norm": float(np.linalg.norm(all_grads)),
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import base64
+import threading
+
+import numpy as np
+
+import config
+from .evaluation import predict
+
+Bounds = Tuple[float, float, float, float]
+# Coarse mesh spacing (in full-resolution pixels) for adaptive refinement.
+_COARSE_STEP = 4
+
+
+@dataclass
+class BoundaryRaster:
+    """Decision regions of a 2-D classifier over `bounds` as a `(resolution, resolution)` uint8 image.
+
+    Rows run along y from `y_min`, columns along x from `x_min`. For single-output models a
+    pixel is P(class 1) scaled to 0..255 (the boundary is the 128 contour); for several
+    outputs it is the argmax class index.
+    """
+
+    raster: np.ndarray
+    bounds: Bounds
+    kind: str
+    evaluated: int
+
+    def to_dict(self) -> Dict:
+        return {
+            "resolution": int(self.raster.shape[0]),
+            "bounds": list(self.bounds),
+            "kind": self.kind,
+            "evaluated": self.evaluated,
+            "data": base64.b64encode(self.raster.tobytes()).decode("ascii"),
+        }
+
+    def thumbnail(self, size: int = 32) -> List[List[int]]:
+        step = max(1, self.raster.shape[0] // size)
+        return self.raster[::step, ::step].tolist()
+
+
+def domain(X: np.ndarray, margin: float = 0.05) -> Bounds | None:
+    """Mesh bounds around 2-D inputs `X`, or None if the inputs are not 2-D points."""
+    if X.ndim != 2 or X.shape[1] != 2 or not len(X):
+        return None
+    lo, hi = X.min(axis=0).astype(float), X.max(axis=0).astype(float)
+    pad = np.maximum(hi - lo, 1e-6) * margin
+    return float(lo[0] - pad[0]), float(hi[0] + pad[0]), float(lo[1] - pad[1]), float(hi[1] + pad[1])
+
+
+def _labels(outputs: np.ndarray) -> np.ndarray:
+    if outputs.shape[-1] == 1:
+        return (outputs[..., 0] > 0.5).astype(np.int64)
+    return np.argmax(outputs, axis=-1)
+
+
+def _interpolate(coarse: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Bilinear upsampling of `coarse` (rows, cols, K) at fractional row/col coordinates."""
+    r0 = np.clip(np.floor(u).astype(int), 0, coarse.shape[0] - 2)
+    c0 = np.clip(np.floor(v).astype(int), 0, coarse.shape[1] - 2)
+    wr = (u - r0)[:, None, None]
+    wc = (v - c0)[None, :, None]
+    top = coarse[r0][:, c0] * (1 - wc) + coarse[r0][:, c0 + 1] * wc
+    bottom = coarse[r0 + 1][:, c0] * (1 - wc) + coarse[r0 + 1][:, c0 + 1] * wc
+    return top * (1 - wr) + bottom * wr
+
+
+def compute_boundary(graph, bounds: Bounds, resolution: int, refine: bool = True) -> BoundaryRaster:
+    """Evaluate `graph` over a mesh of `bounds` in batched forwards.
+
+    With `refine`, the network only runs on a mesh `_COARSE_STEP` times coarser, plus every
+    pixel of the coarse cells whose corners disagree on the class; elsewhere outputs are
+    interpolated. Regions smaller than a coarse cell that touch none of its corners are missed.
+    """
+    resolution = max(2, int(resolution))
+    xs = np.linspace(bounds[0], bounds[1], resolution, dtype=np.float32)
+    ys = np.linspace(bounds[2], bounds[3], resolution, dtype=np.float32)
+
+    def run(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        points = np.stack([xs[cols], ys[rows]], axis=-1).reshape(-1, 2)
+        return np.asarray(predict(graph, points), dtype=np.float32)
+
+    full = np.arange(resolution)
+    if refine and resolution > 2 * _COARSE_STEP:
+        knots = np.unique(np.r_[np.arange(0, resolution, _COARSE_STEP), resolution - 1])
+        grid_r, grid_c = np.meshgrid(knots, knots, indexing="ij")
+        coarse = run(grid_r, grid_c).reshape(len(knots), len(knots), -1)
+        position = np.interp(full, knots, np.arange(len(knots)))
+        outputs = _interpolate(coarse, position, position)
+        labels = _labels(coarse)
+        corners = np.stack([labels[:-1, :-1], labels[1:, :-1], labels[:-1, 1:], labels[1:, 1:]])
+        mixed = (corners != corners[0]).any(axis=0)
+        cell = np.clip(np.floor(position).astype(int), 0, len(knots) - 2)
+        mask = mixed[cell][:, cell]
+        rows, cols = np.nonzero(mask)
+        if len(rows):
+            outputs[rows, cols] = run(rows, cols)
+        evaluated = len(knots) ** 2 + len(rows)
+    else:
+        grid_r, grid_c = np.meshgrid(full, full, indexing="ij")
+        outputs = run(grid_r, grid_c).reshape(resolution, resolution, -1)
+        evaluated = resolution * resolution
+    if outputs.shape[-1] == 1:
+        raster = np.rint(np.clip(outputs[..., 0], 0.0, 1.0) * 255).astype(np.uint8)
+        kind = "probability"
+    else:
+        raster = _labels(outputs).astype(np.uint8)
+        kind = "class"
+    return BoundaryRaster(raster, bounds, kind, int(evaluated))
+
+
+class BoundaryWorker:
+    """Fills `SnapshotRecord.boundary` in a background thread for graphs trained on 2-D inputs.
+
+    `watch` records the input domain when training starts; every snapshot added afterwards
+    gets a raster computed from a fork of the graph holding that snapshot's parameters, so
+    training never waits and replay scrubbing never runs the network.
+    """
+
+    def __init__(self, resolution: int | None = None, refine: bool | None = None) -> None:
+        self.resolution = resolution or config.SIMULATOR_BOUNDARY_RESOLUTION
+        self.refine = config.SIMULATOR_BOUNDARY_REFINE if refine is None else refine
+        self._domains: Dict[str, Bounds] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def watch(self, graph_id: str, X: np.ndarray) -> None:
+        bounds = domain(np.asarray(X))
+        with self._lock:
+            if bounds is None:
+                self._domains.pop(graph_id, None)
+            else:
+                self._domains[graph_id] = bounds
+
+    def _run(self, graph, record, bounds: Bounds) -> None:
+        record.boundary = compute_boundary(graph, bounds, self.resolution, self.refine)
+
+    def submit(self, graph_id: str, graph, record, weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
+        with self._lock:
+            bounds = self._domains.get(graph_id)
+            if bounds is None or record is None:
+                return
+            snapshot = graph.fork()
+            snapshot.set_params(weights, biases)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="boundary")
+            future = self._executor.submit(self._run, snapshot, record, bounds)
+            self._pending = [f for f in self._pending if not f.done()] + [future]
+
+    def wait(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+
+boundary_worker = BoundaryWorker()
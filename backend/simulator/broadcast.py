@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Iterable, Tuple, Union
+import asyncio
+import uuid
+
+import config
+from .wire import FrameEncoder, send_frame
+
+Frame = Union[str, bytes]
+
+
+class _Entry:
+    __slots__ = ("seq", "message", "sync", "frames")
+
+    def __init__(self, seq: int, message: Dict, sync: bool) -> None:
+        self.seq = seq
+        self.message = message
+        self.sync = sync
+        self.frames: Dict[Tuple[str, str, FrozenSet[str]], Frame] = {}
+
+    def frame(self, encoder: FrameEncoder, omit: FrozenSet[str]) -> Frame:
+        """Serialize once per (encoding, dtype, omitted fields); every later subscriber reuses the bytes."""
+        key = (encoder.encoding, encoder.dtype, omit.intersection(self.message))
+        frame = self.frames.get(key)
+        if frame is None:
+            message = {k: v for k, v in self.message.items() if k not in omit} if key[2] else self.message
+            frame = self.frames[key] = encoder.encode(message)
+        return frame
+
+
+class Topic:
+    """One session's broadcast: a single producer publishes, any number of subscribers read.
+
+    Messages go into a bounded ring buffer with consecutive sequence numbers and are
+    serialized lazily, once per wire format, the first time any subscriber needs them.
+    Subscribers are just cursors into the ring, so a slow client never holds up the producer
+    or other clients. Every message carries a `cursor` resume token; a reconnecting client
+    passes it back to continue right after that message, provided it is still retained.
+    Messages published with `sync=True` (e.g. keyframes, the start of a run) are where new
+    subscribers begin, and where a subscriber whose cursor fell out of the ring skips to.
+
+    Publish and subscribe from the event loop thread only.
+    """
+
+    def __init__(self, key: str, capacity: int | None = None) -> None:
+        self.key = key
+        # Distinguishes tokens from an earlier topic under the same key (e.g. before a restart).
+        self.epoch = uuid.uuid4().hex[:8]
+        self._ring: Deque[_Entry] = deque(maxlen=max(1, capacity or config.SIMULATOR_BROADCAST_BUFFER))
+        self._next = 0
+        self._changed = asyncio.Event()
+        self._subscriptions: set = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def wants(self, field: str) -> bool:
+        """Whether any current subscriber receives `field` (lets producers skip building large payloads)."""
+        return any(field not in s.omit for s in self._subscriptions)
+
+    def token(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def publish(self, message: Dict, sync: bool = False) -> str:
+        seq = self._next
+        self._next += 1
+        cursor = self.token(seq)
+        self._ring.append(_Entry(seq, {**message, "cursor": cursor}, sync))
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return cursor
+
+    async def apublish(self, message: Dict) -> None:
+        """`publish` as an async send callable, e.g. for `TelemetryChannel.pump`."""
+        self.publish(message)
+
+    def _sync_point(self) -> int:
+        for entry in reversed(self._ring):
+            if entry.sync:
+                return entry.seq
+        return self._ring[0].seq if self._ring else self._next
+
+    def _start(self, resume: str | None) -> Tuple[int, bool]:
+        if resume:
+            epoch, _, seq = resume.rpartition("-")
+            if epoch == self.epoch and seq.isdigit() and int(seq) < self._next:
+                return int(seq) + 1, True
+        return self._sync_point(), False
+
+    def subscribe(self, encoder: FrameEncoder, resume: str | None = None, omit: Iterable[str] = ()) -> "Subscription":
+        return Subscription(self, encoder, resume, omit)
+
+
+class Subscription:
+    """A subscriber's cursor into a `Topic`; `await next()` returns ready-to-send frames.
+
+    `encoder` and `omit` are read per message, so a client can renegotiate mid-stream.
+    """
+
+    def __init__(self, topic: Topic, encoder: FrameEncoder, resume: str | None, omit: Iterable[str]) -> None:
+        self.topic = topic
+        self.encoder = encoder
+        self.omit: FrozenSet[str] = frozenset(omit)
+        self.cursor, resumed = topic._start(resume)
+        self._pending: Dict | None = {"type": "subscribed", "session": topic.key, "resumed": resumed}
+        self.sent = 0
+        topic._subscriptions.add(self)
+
+    def close(self) -> None:
+        self.topic._subscriptions.discard(self)
+
+    async def next(self) -> Frame:
+        topic = self.topic
+        if self._pending is not None:
+            message, self._pending = self._pending, None
+            return self.encoder.encode(message)
+        while self.cursor >= topic._next:
+            await topic._changed.wait()
+        oldest = topic._ring[0].seq
+        if self.cursor < oldest:
+            # Fell out of the ring: skip ahead to the latest point a client can rebuild state from.
+            skip_to = topic._sync_point()
+            missed, self.cursor = skip_to - self.cursor, skip_to
+            return self.encoder.encode({"type": "gap", "session": topic.key, "missed": missed})
+        entry = topic._ring[self.cursor - oldest]
+        self.cursor += 1
+        return entry.frame(self.encoder, self.omit)
+
+    async def pump(self, ws) -> None:
+        """Send frames to `ws` until it fails or the task is cancelled."""
+        try:
+            while True:
+                await send_frame(ws, await self.next())
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The socket is gone; the endpoint's receive loop handles the disconnect.
+            return
+        finally:
+            self.close()
+
+
+def training_topic(graph_id: str) -> str:
+    """Topic key of a graph's training telemetry."""
+    return f"train/{graph_id}"
+
+
+class BroadcastHub:
+    """Topics by key. A topic lives while it has subscribers or a producer; owners `discard` it
+    when either side goes away, and it is dropped once both have.
+    """
+
+    def __init__(self) -> None:
+        self._topics: Dict[str, Topic] = {}
+
+    def topic(self, key: str) -> Topic:
+        if key not in self._topics:
+            self._topics[key] = Topic(key)
+        return self._topics[key]
+
+    def discard(self, key: str) -> None:
+        topic = self._topics.get(key)
+        if topic is not None and not topic.subscribers:
+            del self._topics[key]
+
+
+broadcast_hub = BroadcastHub()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Tuple
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+import config
+from .import_export.architecture_serializer import serialize_architecture
+from .optimizer_engine import OptimizerState
+from .training_engine import TrainingConfig, TrainingEngine, TrainingMetrics
+
+FORMAT_VERSION = 2
+_ARRAY_FIELDS = {"weights", "biases", "optimizer_arrays", "best_params"}
+
+
+@dataclass
+class TrainingCheckpoint:
+    """Everything needed to continue a training run bit-exactly from an epoch boundary.
+
+    Array fields hold references to the engine's current buffers. Training replaces
+    parameter and optimizer-moment arrays rather than mutating them, so capturing a
+    checkpoint is copy-free and the writer thread can serialize it while training continues.
+    """
+
+    graph_id: str
+    dataset_id: str | None
+    architecture: Dict
+    config: Dict
+    epoch: int
+    global_step: int
+    counters: Dict
+    rng_state: Dict
+    weights: List[np.ndarray]
+    biases: List[np.ndarray]
+    optimizer: Dict | None = None
+    optimizer_arrays: Dict[str, List[np.ndarray]] = field(default_factory=dict)
+    best_params: Tuple[List[np.ndarray], List[np.ndarray]] | None = None
+    history: List[Dict] = field(default_factory=list)
+    created_at: float = 0.0
+
+
+def capture(engine: TrainingEngine, graph_id: str, dataset_id: str | None) -> TrainingCheckpoint:
+    """Snapshot an engine between epochs (after `train_epoch` returned)."""
+    state = engine.optimizer_state
+    stopper = engine.early_stopping
+    return TrainingCheckpoint(
+        graph_id=graph_id,
+        dataset_id=dataset_id,
+        architecture=serialize_architecture(graph_id, engine.graph.layers),
+        config=asdict(engine.config),
+        epoch=engine.epoch,
+        global_step=engine.global_step,
+        counters={
+            "samples_seen": engine.samples_seen,
+            "flops_spent": engine.flops_spent,
+            "train_seconds": engine.train_seconds,
+            "wall_seconds": engine.wall_seconds(),
+            "plateau": asdict(engine.plateau),
+            "early_stopping": asdict(stopper) if stopper is not None else None,
+        },
+        rng_state=engine.rng.state(),
+        weights=list(engine.graph.weights),
+        biases=list(engine.graph.biases),
+        optimizer={"t": state.t} if state is not None else None,
+        optimizer_arrays=(
+            {"m_w": list(state.m_w), "v_w": list(state.v_w), "m_b": list(state.m_b), "v_b": list(state.v_b)}
+            if state is not None
+            else {}
+        ),
+        best_params=engine._best_params,
+        history=[dict(m.__dict__) for m in engine.history],
+        created_at=time.time(),
+    )
+
+
+def restore(engine: TrainingEngine, checkpoint: TrainingCheckpoint) -> None:
+    """Load a checkpoint into an engine built from the checkpoint's graph and config."""
+    engine.graph.set_params(checkpoint.weights, checkpoint.biases)
+    engine.epoch = checkpoint.epoch
+    engine.global_step = checkpoint.global_step
+    counters = checkpoint.counters
+    engine.samples_seen = counters["samples_seen"]
+    engine.flops_spent = counters["flops_spent"]
+    engine.train_seconds = counters["train_seconds"]
+    engine.wall_seconds_before = counters.get("wall_seconds", engine.train_seconds)
+    for key, value in counters["plateau"].items():
+        setattr(engine.plateau, key, value)
+    if engine.early_stopping is not None and counters["early_stopping"]:
+        for key, value in counters["early_stopping"].items():
+            setattr(engine.early_stopping, key, value)
+    if checkpoint.optimizer is not None:
+        arrays = checkpoint.optimizer_arrays
+        engine.optimizer_state = OptimizerState(
+            t=checkpoint.optimizer["t"], m_w=arrays["m_w"], v_w=arrays["v_w"], m_b=arrays["m_b"], v_b=arrays["v_b"]
+        )
+    engine._best_params = checkpoint.best_params
+    for metrics in checkpoint.history:
+        engine.history.append(TrainingMetrics(**metrics))
+    engine.rng.set_state(checkpoint.rng_state)
+
+
+def build_engine(checkpoint: TrainingCheckpoint, graph) -> TrainingEngine:
+    engine = TrainingEngine(graph, TrainingConfig(**checkpoint.config))
+    restore(engine, checkpoint)
+    return engine
+
+
+def _arrays(checkpoint: TrainingCheckpoint) -> Dict[str, np.ndarray]:
+    arrays: Dict[str, np.ndarray] = {}
+    groups = {"w": checkpoint.weights, "b": checkpoint.biases, **checkpoint.optimizer_arrays}
+    if checkpoint.best_params is not None:
+        groups["best_w"], groups["best_b"] = checkpoint.best_params
+    for name, values in groups.items():
+        for i, value in enumerate(values):
+            arrays[f"{name}_{i}"] = np.asarray(value)
+    return arrays
+
+
+def write_checkpoint(path: str, checkpoint: TrainingCheckpoint) -> None:
+    """Serialize to `<path>.tmp`, fsync, then atomically rename over `path`."""
+    meta = {f.name: getattr(checkpoint, f.name) for f in fields(checkpoint) if f.name not in _ARRAY_FIELDS}
+    meta["layer_counts"] = {"params": len(checkpoint.weights), "best": checkpoint.best_params is not None}
+    meta["format"] = FORMAT_VERSION
+    arrays = _arrays(checkpoint)
+    arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as handle:
+        np.savez(handle, **arrays)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+def _meta(data) -> Dict:
+    meta = json.loads(bytes(data["meta"]).decode("utf-8"))
+    if meta.pop("format", None) != FORMAT_VERSION:
+        raise ValueError("Unsupported checkpoint format")
+    return meta
+
+
+def read_summary(path: str) -> Dict:
+    # npz members load lazily, so this only reads the metadata entry.
+    with np.load(path, allow_pickle=False) as data:
+        meta = _meta(data)
+    return {
+        "graph_id": meta["graph_id"],
+        "dataset_id": meta["dataset_id"],
+        "epoch": meta["epoch"],
+        "epochs": meta["config"].get("epochs"),
+        "global_step": meta["global_step"],
+        "created_at": meta["created_at"],
+    }
+
+
+def read_checkpoint(path: str) -> TrainingCheckpoint:
+    with np.load(path, allow_pickle=False) as data:
+        meta = _meta(data)
+        counts = meta.pop("layer_counts")
+        n = counts["params"]
+
+        def group(name: str) -> List[np.ndarray]:
+            return [data[f"{name}_{i}"] for i in range(n)]
+
+        optimizer_arrays = {name: group(name) for name in ("m_w", "v_w", "m_b", "v_b")} if meta["optimizer"] else {}
+        best = (group("best_w"), group("best_b")) if counts["best"] else None
+        return TrainingCheckpoint(
+            weights=group("w"), biases=group("b"), optimizer_arrays=optimizer_arrays, best_params=best, **meta
+        )
+
+
+class CheckpointStore:
+    """Checkpoint files keyed by graph id, written by a single background thread.
+
+    Only the newest pending checkpoint per graph is kept, so a slow disk coalesces
+    writes instead of queueing them behind training.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory or config.SIMULATOR_CHECKPOINT_DIR
+        self._pending: Dict[str, TrainingCheckpoint] = {}
+        self._wake: "queue.Queue[str | None]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._writing = 0
+        self._thread: threading.Thread | None = None
+        self.last_error: str | None = None
+
+    def path_for(self, graph_id: str) -> str:
+        safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in graph_id)
+        return os.path.join(self.directory, f"{safe}.ckpt.npz")
+
+    def save_async(self, checkpoint: TrainingCheckpoint) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+                self._thread.start()
+            fresh = checkpoint.graph_id not in self._pending
+            self._pending[checkpoint.graph_id] = checkpoint
+        if fresh:
+            self._wake.put(checkpoint.graph_id)
+
+    def save(self, checkpoint: TrainingCheckpoint) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        write_checkpoint(self.path_for(checkpoint.graph_id), checkpoint)
+
+    def _run(self) -> None:
+        while True:
+            graph_id = self._wake.get()
+            if graph_id is None:
+                return
+            with self._lock:
+                checkpoint = self._pending.pop(graph_id, None)
+                self._writing += 1
+            try:
+                if checkpoint is not None:
+                    self.save(checkpoint)
+            except OSError as exc:
+                self.last_error = str(exc)
+            finally:
+                with self._lock:
+                    self._writing -= 1
+                    self._idle.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued checkpoint is on disk."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def load(self, graph_id: str) -> TrainingCheckpoint:
+        path = self.path_for(graph_id)
+        if not os.path.exists(path):
+            raise KeyError("Checkpoint not found")
+        return read_checkpoint(path)
+
+    def list(self) -> List[Dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        summaries = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".ckpt.npz"):
+                continue
+            try:
+                summaries.append(read_summary(os.path.join(self.directory, name)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return summaries
+
+    def delete(self, graph_id: str) -> None:
+        try:
+            os.remove(self.path_for(graph_id))
+        except FileNotFoundError as exc:
+            raise KeyError("Checkpoint not found") from exc
+
+
+checkpoint_store = CheckpointStore()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+Batch = Tuple[np.ndarray, np.ndarray]
+Transform = Callable[[np.ndarray], np.ndarray]
+
+# Producer fills one buffer while the queue holds a second and the consumer reads a third.
+_RING = 3
+
+
+class ColumnarDataset:
+    """Contiguous X/y arrays with shuffled, buffer-reusing batch iteration."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray) -> None:
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = np.ascontiguousarray(y, dtype=np.float32)
+        if len(self.X) != len(self.y):
+            raise ValueError("X and y must have the same number of samples")
+
+    @classmethod
+    def from_split(cls, part) -> "ColumnarDataset":
+        if isinstance(part, list):
+            return cls.from_pairs((p["x"], p["y"]) for p in part)
+        return cls(np.asarray(part.get("x", []), dtype=np.float32), np.asarray(part.get("y", []), dtype=np.float32))
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple]) -> "ColumnarDataset":
+        xs: List = []
+        ys: List = []
+        for x, y in pairs:
+            xs.append(x)
+            ys.append(y)
+        if not xs:
+            return cls(np.zeros((0, 0), dtype=np.float32), np.zeros((0, 0), dtype=np.float32))
+        return cls(np.asarray(xs, dtype=np.float32), np.asarray(ys, dtype=np.float32))
+
+    @classmethod
+    def coerce(cls, data) -> "ColumnarDataset":
+        return data if isinstance(data, cls) else cls.from_pairs(data)
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    def __iter__(self) -> Iterator[Batch]:
+        return zip(self.X, self.y)
+
+    def num_batches(self, batch_size: int) -> int:
+        size = batch_size if batch_size > 0 else max(1, len(self))
+        return (len(self) + size - 1) // size
+
+    def _buffers(self, size: int, count: int) -> List[Batch]:
+        return [
+            (np.empty((size,) + self.X.shape[1:], dtype=np.float32), np.empty((size,) + self.y.shape[1:], dtype=np.float32))
+            for _ in range(count)
+        ]
+
+    def _fill(self, buffers: Batch, idx: np.ndarray, transform: Transform | None = None) -> Batch:
+        xb, yb = buffers[0][: len(idx)], buffers[1][: len(idx)]
+        np.take(self.X, idx, axis=0, out=xb, mode="clip")
+        np.take(self.y, idx, axis=0, out=yb, mode="clip")
+        if transform is not None:
+            xb[...] = transform(xb)
+        return xb, yb
+
+    def batches(
+        self,
+        batch_size: int,
+        shuffle: bool = True,
+        prefetch: bool = True,
+        rng: np.random.Generator | None = None,
+        transform: Transform | None = None,
+    ) -> Iterator[Batch]:
+        """Yield (X, y) batches as views into reused buffers; each is valid until the next is requested.
+
+        `transform` (e.g. augmentation) maps each X batch to a new one of the same shape. It
+        runs on the prefetch thread while the consumer works on the previous batch.
+        """
+        n = len(self)
+        if n == 0:
+            return
+        size = batch_size if batch_size > 0 else n
+        order = (rng or np.random).permutation(n) if shuffle else np.arange(n)
+        slices = [order[i : i + size] for i in range(0, n, size)]
+        if not prefetch or len(slices) == 1:
+            buffers = self._buffers(size, 1)[0]
+            for idx in slices:
+                yield self._fill(buffers, idx, transform)
+            return
+
+        ring = self._buffers(size, _RING)
+        ready: queue.Queue = queue.Queue(maxsize=1)
+        cancelled = threading.Event()
+
+        def put(item: Batch | BaseException) -> bool:
+            while not cancelled.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            for i, idx in enumerate(slices):
+                try:
+                    batch = self._fill(ring[i % _RING], idx, transform)
+                except BaseException as exc:
+                    # Handed to the consumer, which re-raises it instead of waiting forever.
+                    put(exc)
+                    return
+                if not put(batch):
+                    return
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            for _ in slices:
+                item = ready.get()
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            producer.join()
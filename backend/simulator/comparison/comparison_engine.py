@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Dict, List
+import uuid
 
 import numpy as np
 
+from ..admission import memory_admission
+from ..columnar_dataset import ColumnarDataset
 from ..dataset_manager import dataset_manager
 from ..graph_engine import build_graph
 from ..layers import LayerConfig
+from ..rng import SessionRNG
 from ..training_engine import TrainingConfig, TrainingEngine
 
 
@@ -69,24 +73,39 @@ class ComparisonManager:
     def run(self, models: List[dict], dataset_id: str, epochs: int) -> Dict:
         dataset = dataset_manager.get(dataset_id)
         train_data, test_data = _extract_train_test(dataset)
+        train_data = ColumnarDataset.from_pairs(train_data)
+        test_data = ColumnarDataset.from_pairs(test_data)
         results = {"models": [], "loss_histories": {}, "dataset_id": dataset_id, "epochs": epochs}
         for model in models:
             model_id = model.get("model_id")
             layers = _parse_layers(model.get("architecture", []))
-            graph = build_graph(layers)
             config_raw = model.get("config", {})
-            cfg = TrainingConfig(
-                epochs=epochs,
-                batch_size=config_raw.get("batch_size", 16),
-                learning_rate=config_raw.get("learning_rate", 0.01),
-                optimizer=config_raw.get("optimizer", "adam"),
-                loss_function=config_raw.get("loss_function", "bce"),
-            )
-            trainer = TrainingEngine(graph, cfg)
-            history = []
-            for _ in range(epochs):
-                metrics = trainer.train_epoch(train_data, test_data, "cmp")
-                history.append(metrics.__dict__)
+            rng = SessionRNG(config_raw.get("seed"))
+            # Comparison graphs count against the same budget as session graphs while they train.
+            decision = memory_admission.evaluate(layers)
+            reservation = f"compare/{uuid.uuid4().hex}"
+            memory_admission.reserve(reservation, decision)
+            try:
+                graph = build_graph(layers, rng=rng.init)
+                cfg = TrainingConfig(
+                    epochs=epochs,
+                    batch_size=config_raw.get("batch_size", 16),
+                    learning_rate=config_raw.get("learning_rate", 0.01),
+                    optimizer=config_raw.get("optimizer", "adam"),
+                    loss_function=config_raw.get("loss_function", "bce"),
+                    eval_async=False,
+                    seed=rng.seed,
+                )
+                trainer = TrainingEngine(graph, cfg)
+                history = []
+                for _ in range(epochs):
+                    metrics = trainer.train_epoch(train_data, test_data, "cmp")
+                    history.append(metrics.__dict__)
+                    if trainer.stop_reason:
+                        break
+                trainer.finish()
+            finally:
+                memory_admission.release(reservation)
             final = history[-1] if history else {}
             train_time_ms = sum(h.get("epoch_duration_ms", 0.0) for h in history)
             test_losses = [h.get("test_loss", 0.0) for h in history]
@@ -3,17 +3,34 @@ from __future__ import annotations
 from typing import Dict, List
 import numpy as np
 
+from ..dataset_manager import dataset_manager
 from ..graph_engine import NetworkGraph
 from .magnitude_pruning import magnitude_prune
 
 
-def pruning_sweep(graph: NetworkGraph, sparsity_range: List[float]) -> Dict:
+def _pruned_accuracy(graph: NetworkGraph, masks: List[List], data: List) -> float:
+    # evaluate on a fork: only the pruned weight tensors get materialized
+    work = graph.fork()
+    work.set_params([w * np.asarray(m, dtype=np.float32) for w, m in zip(graph.weights, masks)], list(graph.biases))
+    ctx = work.new_context()
+    correct = 0
+    for x, y in data:
+        y_hat = work.forward(x, ctx).reshape(-1)
+        if y_hat.shape[0] == 1:
+            correct += int((y_hat[0] > 0.5) == (y[0] > 0.5))
+        else:
+            correct += int(np.argmax(y_hat) == np.argmax(y))
+    return correct / max(len(data), 1)
+
+
+def pruning_sweep(graph: NetworkGraph, sparsity_range: List[float], dataset_id: str | None = None) -> Dict:
+    data = dataset_manager.samples(dataset_id, "test") if dataset_id else []
     results = []
     for s in sparsity_range:
         res = magnitude_prune(graph, float(s))
         results.append({
             "sparsity": float(s),
-            "accuracy": 0.0,
+            "accuracy": _pruned_accuracy(graph, res["pruning_mask"], data) if data else 0.0,
             "params": res["remaining_params"],
             "flops": 0,
         })
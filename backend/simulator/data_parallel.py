@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+from .online_metrics import OnlineEpochMetrics
+
+_mp = mp.get_context("spawn")
+
+
+def _layout(graph) -> List[Tuple[int, ...]]:
+    return [w.shape for w in graph.weights] + [b.shape for b in graph.biases]
+
+
+def _flatten_into(out: np.ndarray, arrays: List[np.ndarray]) -> None:
+    offset = 0
+    for arr in arrays:
+        size = arr.size
+        out[offset : offset + size] = arr.reshape(-1)
+        offset += size
+
+
+def _unflatten(flat: np.ndarray, layout: List[Tuple[int, ...]]) -> List[np.ndarray]:
+    arrays = []
+    offset = 0
+    for shape in layout:
+        size = int(np.prod(shape)) if shape else 1
+        arrays.append(flat[offset : offset + size].reshape(shape))
+        offset += size
+    return arrays
+
+
+def _replica_main(rank: int, conn, graph, params_name: str, grads_name: str, workers: int) -> None:
+    from .training_engine import TrainingEngine
+
+    layout = _layout(graph)
+    n_weights = len(graph.weights)
+    size = sum(int(np.prod(s)) if s else 1 for s in layout)
+    params_shm = shared_memory.SharedMemory(name=params_name)
+    grads_shm = shared_memory.SharedMemory(name=grads_name)
+    params = np.ndarray((size,), dtype=np.float32, buffer=params_shm.buf)
+    grads = np.ndarray((workers, size), dtype=np.float32, buffer=grads_shm.buf)
+    engine = None
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg[0] == "close":
+                break
+            _, config, xs, ys = msg
+            if engine is None:
+                engine = TrainingEngine(graph, config)
+                # Each rank draws dropout from its own stream of the session seed.
+                engine.rng = engine.rng.for_replica(rank)
+            engine.config = config
+            engine._epoch_metrics = OnlineEpochMetrics()
+            arrays = _unflatten(params, layout)
+            engine.graph.set_params(arrays[:n_weights], arrays[n_weights:])
+            gw, gb, loss, acc = engine.accumulate_gradients(xs, ys)
+            _flatten_into(grads[rank], gw + gb)
+            conn.send((loss, acc, engine._epoch_metrics))
+    finally:
+        del params, grads
+        params_shm.close()
+        grads_shm.close()
+
+
+class DataParallelPool:
+    """Shards each minibatch across replica processes and sums their gradients.
+
+    Rank 0 is the calling process. Parameters are broadcast through one shared
+    buffer before every step; each replica writes its gradient sum into its
+    own row of a second shared buffer, which rank 0 reduces.
+    """
+
+    def __init__(self, graph, config, workers: int) -> None:
+        self.workers = workers
+        self.layout = _layout(graph)
+        self.n_weights = len(graph.weights)
+        size = sum(int(np.prod(s)) if s else 1 for s in self.layout)
+        nbytes = max(1, size * 4)
+        self._params_shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._grads_shm = shared_memory.SharedMemory(create=True, size=nbytes * workers)
+        self.params = np.ndarray((size,), dtype=np.float32, buffer=self._params_shm.buf)
+        self.grads = np.ndarray((workers, size), dtype=np.float32, buffer=self._grads_shm.buf)
+        self._conns = []
+        self._procs = []
+        for rank in range(1, workers):
+            parent, child = _mp.Pipe()
+            proc = _mp.Process(
+                target=_replica_main,
+                args=(rank, child, graph, self._params_shm.name, self._grads_shm.name, workers),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def accumulate_gradients(self, engine, xb: np.ndarray, yb: np.ndarray):
+        shards = [(xb[rank :: self.workers], yb[rank :: self.workers]) for rank in range(self.workers)]
+        _flatten_into(self.params, list(engine.graph.weights) + list(engine.graph.biases))
+        config = dataclasses.replace(engine.config, workers=1)
+
+        active = []
+        for rank, conn in enumerate(self._conns, start=1):
+            xs, ys = shards[rank]
+            if not len(xs):
+                continue
+            conn.send(("batch", config, xs, ys))
+            active.append((rank, conn))
+
+        grads_w, grads_b, loss, acc = engine.accumulate_gradients(*shards[0])
+        _flatten_into(self.grads[0], grads_w + grads_b)
+        for _, conn in active:
+            shard_loss, shard_acc, shard_metrics = conn.recv()
+            loss += shard_loss
+            acc += shard_acc
+            if engine._epoch_metrics is not None:
+                engine._epoch_metrics.merge(shard_metrics)
+
+        rows = [0] + [rank for rank, _ in active]
+        total = self.grads[rows].sum(axis=0)
+        reduced = [g.copy() for g in _unflatten(total, self.layout)]
+        return reduced[: self.n_weights], reduced[self.n_weights :], loss, acc
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5.0)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._procs = []
+        del self.params, self.grads
+        for shm in (self._params_shm, self._grads_shm):
+            shm.close()
+            shm.unlink()
@@ -7,9 +7,11 @@ from typing import Dict, List, Tuple
 import numpy as np
 
 
-def _shuffle_split(x: np.ndarray, y: np.ndarray, train_split: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+def _shuffle_split(
+    x: np.ndarray, y: np.ndarray, train_split: float, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     idx = np.arange(len(x))
-    np.random.shuffle(idx)
+    rng.shuffle(idx)
     x = x[idx]
     y = y[idx]
     cut = int(len(x) * train_split)
@@ -36,96 +38,95 @@ def _stats(x: np.ndarray, y: np.ndarray) -> Dict:
     }
 
 
-def _make_circle(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
-    angles = np.random.rand(n) * 2 * math.pi
-    radii = np.random.rand(n)
+def _make_circle(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    angles = rng.random(n) * 2 * math.pi
+    radii = rng.random(n)
     x = np.vstack([np.cos(angles) * radii, np.sin(angles) * radii]).T
     y = (radii > 0.5).astype(int)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
-def _make_xor(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
-    x = np.random.uniform(-1, 1, size=(n, 2))
+def _make_xor(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    x = rng.uniform(-1, 1, size=(n, 2))
     y = (x[:, 0] * x[:, 1] < 0).astype(int)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
-def _make_spiral(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+def _make_spiral(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     n_per = n // 2
-    theta = np.sqrt(np.random.rand(n_per)) * 2 * math.pi
+    theta = np.sqrt(rng.random(n_per)) * 2 * math.pi
     r = 2 * theta
     x1 = np.vstack([r * np.cos(theta), r * np.sin(theta)]).T
     x2 = np.vstack([r * np.cos(theta + math.pi), r * np.sin(theta + math.pi)]).T
     x = np.vstack([x1, x2]) / (2 * math.pi)
     y = np.array([0] * n_per + [1] * n_per)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
-def _make_moons(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+def _make_moons(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     n_per = n // 2
     theta = np.linspace(0, math.pi, n_per)
     x1 = np.vstack([np.cos(theta), np.sin(theta)]).T
     x2 = np.vstack([1 - np.cos(theta), 1 - np.sin(theta) - 0.5]).T
     x = np.vstack([x1, x2])
     y = np.array([0] * n_per + [1] * n_per)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
-def _make_blobs(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+def _make_blobs(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     n_per = n // 2
-    c1 = np.random.normal(loc=[-1, -1], scale=noise + 0.3, size=(n_per, 2))
-    c2 = np.random.normal(loc=[1, 1], scale=noise + 0.3, size=(n_per, 2))
+    c1 = rng.normal(loc=[-1, -1], scale=noise + 0.3, size=(n_per, 2))
+    c2 = rng.normal(loc=[1, 1], scale=noise + 0.3, size=(n_per, 2))
     x = np.vstack([c1, c2])
     y = np.array([0] * n_per + [1] * n_per)
     return x, y
 
 
-def _make_linear(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
-    x = np.random.uniform(-1, 1, size=(n, 2))
+def _make_linear(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    x = rng.uniform(-1, 1, size=(n, 2))
     y = (x[:, 0] + x[:, 1] > 0).astype(int)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
-def _make_rings(n: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
-    angles = np.random.rand(n) * 2 * math.pi
-    radii = np.where(np.random.rand(n) > 0.5, 1.0, 0.5)
+def _make_rings(n: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    angles = rng.random(n) * 2 * math.pi
+    radii = np.where(rng.random(n) > 0.5, 1.0, 0.5)
     x = np.vstack([np.cos(angles) * radii, np.sin(angles) * radii]).T
     y = (radii > 0.75).astype(int)
-    x += np.random.normal(0.0, noise, x.shape)
+    x += rng.normal(0.0, noise, x.shape)
     return x, y
 
 
 def generate_dataset(dataset_type: str, n_samples: int, noise: float, train_split: float, seed: int | None = None) -> Dict:
-    if seed is not None:
-        np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     n_samples = max(10, int(n_samples))
     noise = float(noise)
     train_split = float(train_split)
 
     dtype = (dataset_type or "circle").lower()
     if dtype == "circle":
-        x, y = _make_circle(n_samples, noise)
+        x, y = _make_circle(n_samples, noise, rng)
     elif dtype == "xor":
-        x, y = _make_xor(n_samples, noise)
+        x, y = _make_xor(n_samples, noise, rng)
     elif dtype == "spiral":
-        x, y = _make_spiral(n_samples, noise)
+        x, y = _make_spiral(n_samples, noise, rng)
     elif dtype == "moons":
-        x, y = _make_moons(n_samples, noise)
+        x, y = _make_moons(n_samples, noise, rng)
     elif dtype == "blobs":
-        x, y = _make_blobs(n_samples, noise)
+        x, y = _make_blobs(n_samples, noise, rng)
     elif dtype == "linear":
-        x, y = _make_linear(n_samples, noise)
+        x, y = _make_linear(n_samples, noise, rng)
     elif dtype == "rings":
-        x, y = _make_rings(n_samples, noise)
+        x, y = _make_rings(n_samples, noise, rng)
     else:
         raise ValueError("Unknown dataset type.")
 
-    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split)
+    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split, rng)
     return {
         "dataset_id": str(uuid.uuid4()),
         "train": _to_points(x_train, y_train),
@@ -137,12 +138,13 @@ def generate_dataset(dataset_type: str, n_samples: int, noise: float, train_spli
     }
 
 
-def custom_dataset(points: List[dict], train_split: float) -> Dict:
+def custom_dataset(points: List[dict], train_split: float, seed: int | None = None) -> Dict:
     if not points:
         raise ValueError("No points provided.")
     x = np.array([p["x"] for p in points], dtype=np.float32)
     y = np.array([p["y"][0] for p in points], dtype=np.int64)
-    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split)
+    rng = np.random.default_rng(seed)
+    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split, rng)
     return {
         "dataset_id": str(uuid.uuid4()),
         "train": _to_points(x_train, y_train),
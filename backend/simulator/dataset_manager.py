@@ -1,20 +1,35 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .columnar_dataset import ColumnarDataset
 
 
 class DatasetManager:
     def __init__(self) -> None:
         self._datasets: Dict[str, dict] = {}
+        self._tensors: Dict[Tuple[str, str], ColumnarDataset] = {}
 
     def add(self, dataset_id: str, data: dict) -> None:
         self._datasets[dataset_id] = data
+        for key in [k for k in self._tensors if k[0] == dataset_id]:
+            del self._tensors[key]
 
     def get(self, dataset_id: str) -> dict:
         if dataset_id not in self._datasets:
             raise KeyError("Dataset not found")
         return self._datasets[dataset_id]
 
+    def tensors(self, dataset_id: str, split: str = "train") -> ColumnarDataset:
+        key = (dataset_id, split)
+        if key not in self._tensors:
+            self._tensors[key] = ColumnarDataset.from_split(self.get(dataset_id).get(split, []))
+        return self._tensors[key]
 
-dataset_manager = DatasetManager()
+    def samples(self, dataset_id: str, split: str = "train") -> List[Tuple[np.ndarray, np.ndarray]]:
+        return list(self.tensors(dataset_id, split))
 
+
+dataset_manager = DatasetManager()
@@ -26,8 +26,7 @@ def _preview_images(x: np.ndarray, n: int = 20) -> list:
 
 
 def load_fashion_mnist(n_samples: int, train_split: float, seed: int | None = None) -> Dict:
-    if seed is not None:
-        np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     n_samples = max(50, int(n_samples))
     train_split = float(train_split)
     data_path = os.path.join("models_store", "fashion_mnist.npz")
@@ -37,7 +36,7 @@ def load_fashion_mnist(n_samples: int, train_split: float, seed: int | None = No
     x = np.concatenate([x_train, x_test], axis=0)
     y = np.concatenate([y_train, y_test], axis=0)
 
-    idx = np.random.permutation(len(x))[:n_samples]
+    idx = rng.permutation(len(x))[:n_samples]
     x = x[idx]
     y = y[idx]
     cut = int(len(x) * train_split)
@@ -6,9 +6,11 @@ from typing import Dict, Tuple
 import numpy as np
 
 
-def _shuffle_split(x: np.ndarray, y: np.ndarray, train_split: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+def _shuffle_split(
+    x: np.ndarray, y: np.ndarray, train_split: float, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     idx = np.arange(len(x))
-    np.random.shuffle(idx)
+    rng.shuffle(idx)
     x = x[idx]
     y = y[idx]
     cut = int(len(x) * train_split)
@@ -21,11 +23,11 @@ def _one_hot(y: np.ndarray, n_classes: int) -> np.ndarray:
     return out
 
 
-def _make_sine(n_samples: int, seq_len: int, n_features: int, n_classes: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+def _make_sine(n_samples: int, seq_len: int, n_features: int, n_classes: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     x = np.zeros((n_samples, seq_len, n_features), dtype=np.float32)
     y = np.zeros((n_samples,), dtype=np.int64)
     for i in range(n_samples):
-        cls = np.random.randint(0, n_classes)
+        cls = rng.integers(0, n_classes)
         freq = 1 + cls
         t = np.linspace(0, 2 * np.pi, seq_len)
         signal = np.sin(freq * t)
@@ -33,17 +35,17 @@ def _make_sine(n_samples: int, seq_len: int, n_features: int, n_classes: int, no
             signal = np.stack([signal] * n_features, axis=1)
         else:
             signal = signal[:, None]
-        signal += np.random.normal(0.0, noise, signal.shape)
+        signal += rng.normal(0.0, noise, signal.shape)
         x[i] = signal
         y[i] = cls
     return x, y
 
 
-def _make_square(n_samples: int, seq_len: int, n_features: int, n_classes: int, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+def _make_square(n_samples: int, seq_len: int, n_features: int, n_classes: int, noise: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     x = np.zeros((n_samples, seq_len, n_features), dtype=np.float32)
     y = np.zeros((n_samples,), dtype=np.int64)
     for i in range(n_samples):
-        cls = np.random.randint(0, n_classes)
+        cls = rng.integers(0, n_classes)
         freq = 1 + cls
         t = np.linspace(0, 2 * np.pi, seq_len)
         signal = np.sign(np.sin(freq * t))
@@ -51,15 +53,15 @@ def _make_square(n_samples: int, seq_len: int, n_features: int, n_classes: int,
             signal = np.stack([signal] * n_features, axis=1)
         else:
             signal = signal[:, None]
-        signal += np.random.normal(0.0, noise, signal.shape)
+        signal += rng.normal(0.0, noise, signal.shape)
         x[i] = signal
         y[i] = cls
     return x, y
 
 
-def _make_noise(n_samples: int, seq_len: int, n_features: int, n_classes: int) -> Tuple[np.ndarray, np.ndarray]:
-    x = np.random.normal(0.0, 1.0, size=(n_samples, seq_len, n_features)).astype(np.float32)
-    y = np.random.randint(0, n_classes, size=(n_samples,), dtype=np.int64)
+def _make_noise(n_samples: int, seq_len: int, n_features: int, n_classes: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    x = rng.normal(0.0, 1.0, size=(n_samples, seq_len, n_features)).astype(np.float32)
+    y = rng.integers(0, n_classes, size=(n_samples,), dtype=np.int64)
     return x, y
 
 
@@ -71,7 +73,9 @@ def generate_sequence_dataset(
     n_classes: int,
     noise: float,
     train_split: float,
+    seed: int | None = None,
 ) -> Dict:
+    rng = np.random.default_rng(seed)
     n_samples = max(10, int(n_samples))
     seq_len = max(2, int(seq_len))
     n_features = max(1, int(n_features))
@@ -81,15 +85,15 @@ def generate_sequence_dataset(
 
     dtype = (seq_type or "sine_wave").lower()
     if dtype in {"sine", "sine_wave"}:
-        x, y = _make_sine(n_samples, seq_len, n_features, n_classes, noise)
+        x, y = _make_sine(n_samples, seq_len, n_features, n_classes, noise, rng)
     elif dtype in {"square", "square_wave"}:
-        x, y = _make_square(n_samples, seq_len, n_features, n_classes, noise)
+        x, y = _make_square(n_samples, seq_len, n_features, n_classes, noise, rng)
     elif dtype == "noise":
-        x, y = _make_noise(n_samples, seq_len, n_features, n_classes)
+        x, y = _make_noise(n_samples, seq_len, n_features, n_classes, rng)
     else:
         raise ValueError("Unknown sequence type.")
 
-    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split)
+    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split, rng)
     return {
         "dataset_id": str(uuid.uuid4()),
         "input_shape": [seq_len, n_features],
@@ -6,9 +6,11 @@ from typing import Dict, Tuple
 import numpy as np
 
 
-def _shuffle_split(x: np.ndarray, y: np.ndarray, train_split: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+def _shuffle_split(
+    x: np.ndarray, y: np.ndarray, train_split: float, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     idx = np.arange(len(x))
-    np.random.shuffle(idx)
+    rng.shuffle(idx)
     x = x[idx]
     y = y[idx]
     cut = int(len(x) * train_split)
@@ -27,15 +29,17 @@ def generate_text_tokens(
     vocab_size: int,
     n_classes: int,
     train_split: float,
+    seed: int | None = None,
 ) -> Dict:
+    rng = np.random.default_rng(seed)
     n_samples = max(10, int(n_samples))
     seq_len = max(2, int(seq_len))
     vocab_size = max(5, int(vocab_size))
     n_classes = max(2, int(n_classes))
 
-    x = np.random.randint(0, vocab_size, size=(n_samples, seq_len), dtype=np.int64)
-    y = np.random.randint(0, n_classes, size=(n_samples,), dtype=np.int64)
-    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split)
+    x = rng.integers(0, vocab_size, size=(n_samples, seq_len), dtype=np.int64)
+    y = rng.integers(0, n_classes, size=(n_samples,), dtype=np.int64)
+    x_train, y_train, x_test, y_test = _shuffle_split(x, y, train_split, rng)
 
     return {
         "dataset_id": str(uuid.uuid4()),
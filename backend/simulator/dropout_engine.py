@@ -4,10 +4,13 @@ from typing import Tuple
 import numpy as np
 
 
-def apply_dropout(a: np.ndarray, dropout_rate: float) -> Tuple[np.ndarray, np.ndarray]:
+def apply_dropout(
+    a: np.ndarray, dropout_rate: float, rng: np.random.Generator | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
     if dropout_rate <= 0.0:
         return a, np.ones_like(a)
     keep_prob = 1.0 - dropout_rate
-    mask = (np.random.rand(*a.shape) < keep_prob).astype(np.float32)
+    draws = rng.random(a.shape) if rng is not None else np.random.rand(*a.shape)
+    mask = (draws < keep_prob).astype(np.float32)
     return (a * mask) / keep_prob, mask
 
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from dataclasses import dataclass
+from typing import Deque, List, Tuple
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+from .activations import get_activation
+from .columnar_dataset import ColumnarDataset
+from .loss_functions import per_sample_loss
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EvaluationResult:
+    epoch: int
+    test_loss: float
+    test_accuracy: float
+    samples: int
+    full: bool
+    loss_ci: Tuple[float, float]
+    accuracy_ci: Tuple[float, float]
+    duration_ms: float
+
+
+def _is_dense_stack(graph) -> bool:
+    return all(layer.layer_type in {"dense", "output"} for layer in graph.layers[1:])
+
+
+def predict(graph, X: np.ndarray, chunk: int = 256) -> np.ndarray:
+    """Network outputs for every row of `X`, batched through the weight matrices for dense stacks."""
+    if not _is_dense_stack(graph):
+        return np.stack([graph.forward(x, graph.new_context()).reshape(-1) for x in X])
+    activations = [(layer.activation or "linear").lower() for layer in graph.layers[1:]]
+    outputs = []
+    for start in range(0, len(X), chunk):
+        a = X[start : start + chunk].reshape(min(chunk, len(X) - start), -1)
+        for w, b, act in zip(graph.weights, graph.biases, activations):
+            a = get_activation(act).forward(a @ w.T + b)
+        outputs.append(a)
+    return np.concatenate(outputs)
+
+
+def _correct(Y: np.ndarray, preds: np.ndarray) -> np.ndarray:
+    if preds.shape[1] == 1:
+        return ((preds[:, 0] > 0.5).astype(np.float32) == Y[:, 0]).astype(np.float64)
+    return (np.argmax(preds, axis=1) == np.argmax(Y, axis=1)).astype(np.float64)
+
+
+def stratified_indices(Y: np.ndarray, fraction: float, rng: np.random.Generator | None = None) -> np.ndarray:
+    """Sample `fraction` of each class (argmax / thresholded label), at least one per class."""
+    labels = (Y[:, 0] > 0.5).astype(int) if Y.shape[1] == 1 else np.argmax(Y, axis=1)
+    gen = rng if rng is not None else np.random
+    picked = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        take = max(1, int(round(len(members) * fraction)))
+        picked.append(gen.choice(members, size=min(take, len(members)), replace=False))
+    return np.sort(np.concatenate(picked)) if picked else np.zeros(0, dtype=int)
+
+
+def _wilson(p: float, n: int, z: float = 1.96) -> Tuple[float, float]:
+    if n == 0:
+        return 0.0, 0.0
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def evaluate(graph, data: ColumnarDataset, loss_function: str, epoch: int, full: bool) -> EvaluationResult:
+    start = time.time()
+    if len(data) == 0:
+        return EvaluationResult(epoch, 0.0, 0.0, 0, full, (0.0, 0.0), (0.0, 0.0), 0.0)
+    preds = predict(graph, data.X)
+    losses = per_sample_loss(data.y, preds, loss_function)
+    correct = _correct(data.y, preds)
+    n = len(losses)
+    loss = float(losses.mean())
+    acc = float(correct.mean())
+    if full:
+        loss_ci, acc_ci = (loss, loss), (acc, acc)
+    else:
+        half = 1.96 * float(losses.std(ddof=1)) / math.sqrt(n) if n > 1 else 0.0
+        loss_ci, acc_ci = (loss - half, loss + half), _wilson(acc, n)
+    return EvaluationResult(epoch, loss, acc, n, full, loss_ci, acc_ci, (time.time() - start) * 1000.0)
+
+
+def _log_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background evaluation failed", exc_info=exc)
+
+
+class EvaluationScheduler:
+    """Runs test evaluation on forked weight snapshots in a background thread."""
+
+    def __init__(self, max_completed: int = 256) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: List[Future] = []
+        self._completed: Deque[EvaluationResult] = deque(maxlen=max_completed)
+        self._lock = threading.Lock()
+        self.latest: EvaluationResult | None = None
+
+    @staticmethod
+    def plan(epoch: int, config) -> Tuple[bool, bool]:
+        """Return (run, full) for this epoch under the config's eval schedule."""
+        last = epoch == config.epochs - 1
+        interval = max(1, config.eval_interval)
+        run = last or epoch % interval == 0
+        if not run:
+            return False, False
+        if not config.eval_subsample:
+            return True, True
+        full_every = config.eval_full_interval
+        return True, last or bool(full_every and epoch % full_every == 0)
+
+    def _run(self, graph, data: ColumnarDataset, loss_function: str, epoch: int, full: bool) -> None:
+        result = evaluate(graph, data, loss_function, epoch, full)
+        with self._lock:
+            self._completed.append(result)
+            if self.latest is None or result.epoch >= self.latest.epoch:
+                self.latest = result
+
+    def submit(
+        self, graph, data: ColumnarDataset, config, epoch: int, full: bool, rng: np.random.Generator | None = None
+    ) -> None:
+        if not full and config.eval_subsample:
+            idx = stratified_indices(data.y, config.eval_subsample, rng) if len(data) else np.zeros(0, dtype=int)
+            data = ColumnarDataset(data.X[idx], data.y[idx])
+        snapshot = graph.fork()
+        if not config.eval_async:
+            self._run(snapshot, data, config.loss_function, epoch, full)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="evaluation")
+        future = self._executor.submit(self._run, snapshot, data, config.loss_function, epoch, full)
+        future.add_done_callback(_log_failure)
+        self._pending = [f for f in self._pending if not f.done()] + [future]
+
+    def collect(self) -> List[EvaluationResult]:
+        with self._lock:
+            results = list(self._completed)
+            self._completed.clear()
+        return results
+
+    def wait(self) -> None:
+        # Failures are logged by `_log_failure`; the run carries on without that result.
+        wait_futures(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
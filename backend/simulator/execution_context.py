@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+
+class LayerState:
+    """Forward/backward caches of one layer for a single call.
+
+    Layers write the attributes they used to keep on ``self`` (``X``, ``Z``,
+    ``H``, gate histories, gradients, ...). Unset attributes read as ``None``.
+    """
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+
+@dataclass
+class ExecutionContext:
+    layer_states: List[LayerState]
+    activations: List[np.ndarray] = field(default_factory=list)
+    pre_activations: List[np.ndarray] = field(default_factory=list)
+
+    @classmethod
+    def for_layers(cls, n_layers: int) -> "ExecutionContext":
+        return cls(layer_states=[LayerState() for _ in range(n_layers)])
+
+    def state(self, layer_idx: int) -> LayerState:
+        return self.layer_states[layer_idx]
+
+
+__all__ = ["ExecutionContext", "LayerState"]
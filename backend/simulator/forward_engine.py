@@ -12,11 +12,11 @@ def _fmt_num(v: float) -> str:
     return f"{v:.3f}"
 
 
-def run_forward_full(graph: NetworkGraph, input_vec: List[float]) -> Tuple[List[dict], List[float], Dict[int, List[float]]]:
+def run_forward_full(graph: NetworkGraph, input_vec: List[float]) -> Tuple[List[dict], np.ndarray, Dict[int, np.ndarray]]:
     x = np.asarray(input_vec, dtype=np.float32)
     steps: List[dict] = []
     activations = [x]
-    layer_outputs: Dict[int, List[float]] = {}
+    layer_outputs: Dict[int, np.ndarray] = {}
     step_index = 0
 
     dense_only = all(layer.layer_type in {"input", "dense", "output"} for layer in graph.layers)
@@ -33,9 +33,9 @@ def run_forward_full(graph: NetworkGraph, input_vec: List[float]) -> Tuple[List[
                     "operation": "matmul",
                     "description": f"Layer {layer_idx}: Matrix Multiplication",
                     "equation_text": "z = W·a",
-                    "input_values": activations[-1].tolist(),
-                    "output_values": z_raw.tolist(),
-                    "weights_snapshot": w.tolist(),
+                    "input_values": activations[-1],
+                    "output_values": z_raw,
+                    "weights_snapshot": w,
                 }
             )
             step_index += 1
@@ -48,9 +48,9 @@ def run_forward_full(graph: NetworkGraph, input_vec: List[float]) -> Tuple[List[
                     "operation": "bias_add",
                     "description": f"Layer {layer_idx}: Bias Addition",
                     "equation_text": "z = z + b",
-                    "input_values": z_raw.tolist(),
-                    "output_values": z.tolist(),
-                    "bias_snapshot": b.tolist(),
+                    "input_values": z_raw,
+                    "output_values": z,
+                    "bias_snapshot": b,
                 }
             )
             step_index += 1
@@ -65,42 +65,46 @@ def run_forward_full(graph: NetworkGraph, input_vec: List[float]) -> Tuple[List[
                     "description": f"Layer {layer_idx}: {act_name} Activation",
                     "activation_name": act_name,
                     "equation_text": f"a = {act_name}(z)",
-                    "input_values": z.tolist(),
-                    "output_values": a.tolist(),
+                    "input_values": z,
+                    "output_values": a,
                 }
             )
             step_index += 1
             activations.append(a)
-            layer_outputs[layer_idx - 1] = a.tolist()
+            layer_outputs[layer_idx - 1] = a
 
         graph.pre_activations = [w @ activations[i] + graph.biases[i] for i, w in enumerate(graph.weights)]
         graph.activations = activations
-        return steps, activations[-1].tolist(), layer_outputs
+        return steps, activations[-1], layer_outputs
 
     current = x
-    graph.pre_activations = []
-    graph.activations = [x]
+    ctx = graph.new_context()
+    ctx.activations = [x]
     for layer_idx in range(1, len(graph.layers)):
         layer = graph.layer_instances[layer_idx]
-        current = layer.forward(current)
-        graph.activations.append(current)
-        if hasattr(layer, "Z") and getattr(layer, "Z") is not None:
-            graph.pre_activations.append(layer.Z)
+        state = ctx.state(layer_idx)
+        current = layer.forward(current, state)
+        ctx.activations.append(current)
+        if state.Z is not None:
+            ctx.pre_activations.append(state.Z)
         steps.append(
             {
                 "step_index": step_index,
                 "layer_index": layer_idx - 1,
                 "operation": "forward",
                 "description": f"Layer {layer_idx}: {graph.layers[layer_idx].layer_type} forward",
-                "input_values": activations[-1].reshape(-1).tolist(),
-                "output_values": current.reshape(-1).tolist(),
+                "input_values": activations[-1].reshape(-1),
+                "output_values": current.reshape(-1),
             }
         )
         step_index += 1
         activations.append(current)
-        layer_outputs[layer_idx - 1] = current.reshape(-1).tolist()
+        layer_outputs[layer_idx - 1] = current.reshape(-1)
 
-    return steps, activations[-1].reshape(-1).tolist(), layer_outputs
+    # publish as the graph's "last forward" for the equations view
+    graph.pre_activations = ctx.pre_activations
+    graph.activations = ctx.activations
+    return steps, activations[-1].reshape(-1), layer_outputs
 
 
 def run_forward_step(graph: NetworkGraph, input_vec: List[float], step_index: int) -> dict:
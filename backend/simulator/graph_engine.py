@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
+import copy
 import hashlib
 
 import numpy as np
 
 from .activations import get_activation
+from .execution_context import ExecutionContext
 from .layers.batchnorm import BatchNormLayer
 from .layers.conv2d import Conv2DConfig, Conv2DLayer
 from .layers.dense import DenseLayer
@@ -45,6 +47,21 @@ def _init_bias(shape: Tuple[int], init: str | None) -> np.ndarray:
     return np.zeros(shape, dtype=np.float32)
 
 
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def _readonly_layer(layer: object) -> object:
+    """Shallow copy of `layer` whose array attributes are read-only views of the original's."""
+    clone = copy.copy(layer)
+    for name, value in vars(clone).items():
+        if isinstance(value, np.ndarray):
+            setattr(clone, name, _readonly(value))
+    return clone
+
+
 @dataclass
 class NetworkGraph:
     layers: List[LayerConfig]
@@ -60,31 +77,91 @@ class NetworkGraph:
     architecture_hash: str = ""
     input_shape: Tuple[int, ...] | None = None
 
-    def forward(self, input_vec: np.ndarray) -> np.ndarray:
+    def new_context(self) -> ExecutionContext:
+        return ExecutionContext.for_layers(len(self.layer_instances))
+
+    def forward(self, input_vec: np.ndarray, ctx: ExecutionContext | None = None) -> np.ndarray:
+        # Without a context the caches land on the layers and graph (legacy,
+        # single caller); with one, parameters are only read and the call can
+        # run concurrently with others on the same graph.
+        pre_activations: List[np.ndarray] = []
+        activations: List[np.ndarray] = []
         if self.layer_instances:
-            self.pre_activations = []
-            self.activations = []
             x = input_vec.astype(np.float32)
-            for layer in self.layer_instances:
-                x = layer.forward(x)
-                if hasattr(layer, "Z") and getattr(layer, "Z") is not None:
-                    self.pre_activations.append(layer.Z)
-                self.activations.append(x)
-            return x
-        self.pre_activations = []
-        self.activations = [input_vec.astype(np.float32)]
-        for idx in range(1, len(self.layers)):
-            w = self.weights[idx - 1]
-            b = self.biases[idx - 1]
-            z = w @ self.activations[-1] + b
-            self.pre_activations.append(z)
-            act_name = (self.layers[idx].activation or "linear").lower()
-            a = get_activation(act_name).forward(z)
-            self.activations.append(a)
-        return self.activations[-1]
-
-
-def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
+            for idx, layer in enumerate(self.layer_instances):
+                state = ctx.state(idx) if ctx is not None else None
+                x = layer.forward(x, state)
+                z = getattr(state if state is not None else layer, "Z", None)
+                if z is not None:
+                    pre_activations.append(z)
+                activations.append(x)
+        else:
+            activations.append(input_vec.astype(np.float32))
+            for idx in range(1, len(self.layers)):
+                w = self.weights[idx - 1]
+                b = self.biases[idx - 1]
+                z = w @ activations[-1] + b
+                pre_activations.append(z)
+                act_name = (self.layers[idx].activation or "linear").lower()
+                a = get_activation(act_name).forward(z)
+                activations.append(a)
+        if ctx is not None:
+            ctx.pre_activations = pre_activations
+            ctx.activations = activations
+        else:
+            self.pre_activations = pre_activations
+            self.activations = activations
+        return activations[-1]
+
+    def set_params(self, weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
+        self.weights = list(weights)
+        self.biases = list(biases)
+        for layer_idx, param_idx in self.param_index_by_layer.items():
+            self.layer_instances[layer_idx].set_params(self.weights[param_idx], self.biases[param_idx])
+
+    def update_params(self, updates: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Swap in new arrays for the given parameter indices only; other layers are untouched."""
+        if not updates:
+            return
+        weights, biases = list(self.weights), list(self.biases)
+        for param_idx, (w, b) in updates.items():
+            weights[param_idx], biases[param_idx] = w, b
+        self.weights, self.biases = weights, biases
+        for layer_idx, param_idx in self.param_index_by_layer.items():
+            if param_idx in updates:
+                self.layer_instances[layer_idx].set_params(weights[param_idx], biases[param_idx])
+
+    def fork(self) -> "NetworkGraph":
+        """Cheap what-if copy sharing parameter buffers copy-on-write.
+
+        Layers are shallow-copied, so nothing is materialized until the fork
+        calls ``set_params`` (which only swaps in new arrays on the fork). The
+        shared buffers, including the arrays held by the copied layer instances
+        (``W``, ``b``, ``gamma``, ...), are handed out as read-only views so an
+        accidental in-place edit on the fork raises instead of leaking into the parent.
+        """
+        return NetworkGraph(
+            layers=[copy.copy(layer) for layer in self.layers],
+            weights=[_readonly(w) for w in self.weights],
+            biases=[_readonly(b) for b in self.biases],
+            layer_instances=[_readonly_layer(layer) for layer in self.layer_instances],
+            param_layer_indices=list(self.param_layer_indices),
+            param_index_by_layer=dict(self.param_index_by_layer),
+            total_params=self.total_params,
+            flops_per_sample=self.flops_per_sample,
+            architecture_hash=self.architecture_hash,
+            input_shape=self.input_shape,
+        )
+
+    def backward(self, d_out: np.ndarray, ctx: ExecutionContext | None = None, stop_at: int = 1) -> np.ndarray:
+        grad = d_out
+        for idx in reversed(range(stop_at, len(self.layer_instances))):
+            state = ctx.state(idx) if ctx is not None else None
+            grad = self.layer_instances[idx].backward(grad, state)
+        return grad
+
+
+def build_graph(layers: List[LayerConfig], rng: np.random.Generator | None = None) -> NetworkGraph:
     validation = validate_layers(layers)
     if not validation.valid:
         raise ValueError("; ".join(validation.errors))
@@ -106,6 +183,7 @@ def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
 
     current_shape = input_shape
     layer_instances.append(InputLayer(input_shape))
+    relu_output = False
 
     for idx in range(1, len(layers)):
         layer = layers[idx]
@@ -113,7 +191,8 @@ def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
         if ltype in {"dense", "output"}:
             in_dim = int(current_shape[0])
             out_dim = layer.neurons
-            dense = DenseLayer(in_dim, out_dim, layer.activation, layer.init)
+            dense = DenseLayer(in_dim, out_dim, layer.activation, layer.init, rng=rng)
+            dense.relu_input = relu_output
             layer_instances.append(dense)
             current_shape = (out_dim,)
         elif ltype == "batchnorm":
@@ -135,7 +214,8 @@ def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
                     padding=padding,
                     activation=layer.activation or "relu",
                     init=layer.init or "he",
-                )
+                ),
+                rng=rng,
             )
             layer_instances.append(conv)
             current_shape = conv.output_shape(current_shape)
@@ -159,34 +239,34 @@ def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
             t_len, d_in = current_shape
             hidden = layer.hidden_size or layer.neurons
             return_seq = bool(layer.return_sequences)
-            rnn = RNNLayer(d_in, hidden, return_sequences=return_seq)
+            rnn = RNNLayer(d_in, hidden, return_sequences=return_seq, rng=rng)
             layer_instances.append(rnn)
             current_shape = (t_len, hidden) if return_seq else (hidden,)
         elif ltype == "lstm":
             t_len, d_in = current_shape
             hidden = layer.hidden_size or layer.neurons
             return_seq = bool(layer.return_sequences)
-            lstm = LSTMLayer(d_in, hidden, return_sequences=return_seq)
+            lstm = LSTMLayer(d_in, hidden, return_sequences=return_seq, rng=rng)
             layer_instances.append(lstm)
             current_shape = (t_len, hidden) if return_seq else (hidden,)
         elif ltype == "gru":
             t_len, d_in = current_shape
             hidden = layer.hidden_size or layer.neurons
             return_seq = bool(layer.return_sequences)
-            gru = GRULayer(d_in, hidden, return_sequences=return_seq)
+            gru = GRULayer(d_in, hidden, return_sequences=return_seq, rng=rng)
             layer_instances.append(gru)
             current_shape = (t_len, hidden) if return_seq else (hidden,)
         elif ltype == "embedding":
             t_len = current_shape[0]
             vocab = layer.vocab_size or 50
             emb = layer.embedding_dim or layer.neurons
-            emb_layer = EmbeddingLayer(vocab, emb)
+            emb_layer = EmbeddingLayer(vocab, emb, rng=rng)
             layer_instances.append(emb_layer)
             current_shape = (t_len, emb)
         elif ltype == "attention":
             t_len, d_model = current_shape
             heads = layer.num_heads or 1
-            attn = AttentionLayer(d_model, num_heads=heads)
+            attn = AttentionLayer(d_model, num_heads=heads, rng=rng)
             layer_instances.append(attn)
             current_shape = (t_len, d_model)
         elif ltype == "residual":
@@ -194,6 +274,13 @@ def build_graph(layers: List[LayerConfig]) -> NetworkGraph:
         else:
             raise ValueError(f"Unsupported layer type '{ltype}'")
 
+        if ltype in {"dense", "output"}:
+            relu_output = dense.activation_name == "relu"
+        elif ltype == "conv2d":
+            relu_output = (layer.activation or "relu").lower() == "relu"
+        elif ltype not in {"flatten", "maxpool2d", "residual"}:
+            relu_output = False
+
     for idx, layer in enumerate(layer_instances):
         if getattr(layer, "has_params", False):
             w, b = layer.params()
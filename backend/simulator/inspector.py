@@ -21,8 +21,8 @@ def weight_inspection(graph: NetworkGraph, layer_index: int) -> Dict:
     b = graph.biases[param_idx]
     return {
         "layer_index": layer_index,
-        "weight_matrix": w.tolist(),
-        "bias_vector": b.tolist(),
+        "weight_matrix": w,
+        "bias_vector": b,
         "shape": [int(w.shape[0]), int(w.shape[1])] if w.ndim == 2 else [int(s) for s in w.shape],
         "stats": {
             "mean": float(np.mean(w)),
@@ -37,20 +37,20 @@ def weight_inspection(graph: NetworkGraph, layer_index: int) -> Dict:
 
 
 def activation_inspection(graph: NetworkGraph, layer_index: int, input_vec: List[float]) -> Dict:
-    graph.forward(np.asarray(input_vec, dtype=np.float32))
+    ctx = graph.new_context()
+    graph.forward(np.asarray(input_vec, dtype=np.float32), ctx)
     layer_slot = layer_index + 1
     if layer_slot < 0 or layer_slot >= len(graph.layer_instances):
         raise IndexError("layer_index out of range")
-    layer = graph.layer_instances[layer_slot]
-    pre = layer.Z if hasattr(layer, "Z") else None
-    post = graph.activations[layer_slot]
+    pre = ctx.state(layer_slot).Z
+    post = ctx.activations[layer_slot]
     act_name = (graph.layers[layer_slot].activation or "linear").lower() if layer_slot < len(graph.layers) else "linear"
     post_flat = post.reshape(-1)
     dead = [int(i) for i, v in enumerate(post_flat) if act_name == "relu" and v == 0.0]
     return {
         "layer_index": layer_index,
-        "pre_activation": pre.tolist() if pre is not None else None,
-        "post_activation": post.tolist() if hasattr(post, "tolist") else post,
+        "pre_activation": pre,
+        "post_activation": post,
         "dead_neurons": dead,
         "activation_name": act_name,
         "histogram": _histogram(post_flat),
@@ -14,16 +14,17 @@ def lrp_explain(
     epsilon: float = 1e-2,
 ) -> Dict:
     x = np.asarray(input_vec, dtype=np.float32)
-    graph.forward(x)
+    ctx = graph.new_context()
+    graph.forward(x, ctx)
 
     # dense-only path
     if not graph.weights:
         return {"input_relevance": [], "input_relevance_base64": "", "relevance_per_layer": [], "conservation_error": 0.0}
 
-    activations = graph.activations
+    activations = ctx.activations
     weights = graph.weights
 
-    y = graph.activations[-1].reshape(-1)
+    y = activations[-1].reshape(-1)
     R = np.zeros_like(y)
     if y.size > target_class:
         R[target_class] = y[target_class]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict
 import uuid
 import numpy as np
 
@@ -35,48 +35,31 @@ class LandscapeManager:
         task = LandscapeTask(task_id=task_id, status="computing", progress=0.0)
         self._tasks[task_id] = task
 
-        dataset = dataset_manager.get(dataset_id)
-        train = dataset.get("train", [])
-        if isinstance(train, list):
-            data = [(np.asarray(p["x"], dtype=np.float32), np.asarray(p["y"], dtype=np.float32)) for p in train]
-        else:
-            xs = np.asarray(train.get("x", []), dtype=np.float32)
-            ys = np.asarray(train.get("y", []), dtype=np.float32)
-            data = [(xs[i], ys[i]) for i in range(len(xs))]
+        data = dataset_manager.samples(dataset_id, "train")
 
-        base_vec = param_vector_from_weights(graph.weights, graph.biases)
+        # Perturb a fork so the live session (possibly training) is never touched.
+        work = graph.fork()
+        ctx = work.new_context()
+        base_w, base_b = list(work.weights), list(work.biases)
+        base_vec = param_vector_from_weights(base_w, base_b)
         d1, d2 = random_directions(base_vec, seed=seed)
         grid = np.linspace(-span, span, resolution)
         loss_surface = np.zeros((resolution, resolution), dtype=np.float32)
 
-        def _set_graph_params(weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
-            graph.weights = [w.astype(np.float32) for w in weights]
-            graph.biases = [b.astype(np.float32) for b in biases]
-            for layer_idx, param_idx in graph.param_index_by_layer.items():
-                layer = graph.layer_instances[layer_idx]
-                if hasattr(layer, "set_params"):
-                    layer.set_params(graph.weights[param_idx], graph.biases[param_idx])
-
-        original_weights = [w.copy() for w in graph.weights]
-        original_biases = [b.copy() for b in graph.biases]
-
         total = resolution * resolution
         counter = 0
-        try:
-            for i, a in enumerate(grid):
-                for j, b in enumerate(grid):
-                    new_w, new_b = apply_vector_to_weights(graph.weights, graph.biases, d1, d2, float(a), float(b))
-                    _set_graph_params(new_w, new_b)
-                    loss_val = 0.0
-                    for x, y in data:
-                        pred = graph.forward(x)
-                        loss_val += compute_loss(y, pred, "mse")[0]
-                    loss_val /= max(len(data), 1)
-                    loss_surface[i, j] = loss_val
-                    counter += 1
-                    task.progress = counter / total
-        finally:
-            _set_graph_params(original_weights, original_biases)
+        for i, a in enumerate(grid):
+            for j, b in enumerate(grid):
+                new_w, new_b = apply_vector_to_weights(base_w, base_b, d1, d2, float(a), float(b))
+                work.set_params(new_w, new_b)
+                loss_val = 0.0
+                for x, y in data:
+                    pred = work.forward(x, ctx)
+                    loss_val += compute_loss(y, pred, "mse")[0]
+                loss_val /= max(len(data), 1)
+                loss_surface[i, j] = loss_val
+                counter += 1
+                task.progress = counter / total
 
         task.status = "complete"
         task.result = {
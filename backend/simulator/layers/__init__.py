@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
+from .shape_inference import LayerInference, ShapeInferenceEngine, shape_inference
+
 
 @dataclass
 class LayerConfig:
@@ -56,13 +58,6 @@ def _is_supported(layer_type: str) -> bool:
     }
 
 
-def _shape_size(shape: tuple[int, ...]) -> int:
-    size = 1
-    for dim in shape:
-        size *= dim
-    return size
-
-
 def validate_layers(layers: List[LayerConfig]) -> ValidationResult:
     errors: List[str] = []
     warnings: List[str] = []
@@ -72,8 +67,6 @@ def validate_layers(layers: List[LayerConfig]) -> ValidationResult:
 
     if len(layers) < 2:
         errors.append("At least input and output layers are required.")
-    if len(layers) > 12:
-        errors.append("Maximum 10 hidden layers allowed.")
 
     if layers:
         if layers[0].layer_type != "input":
@@ -96,159 +89,21 @@ def validate_layers(layers: List[LayerConfig]) -> ValidationResult:
             warnings=warnings,
         )
 
-    input_layer = layers[0]
-    if input_layer.input_shape:
-        current_shape = tuple(int(v) for v in input_layer.input_shape)
-    else:
-        current_shape = (input_layer.neurons,)
-    if len(current_shape) == 3:
-        current_type = "spatial"
-    elif len(current_shape) == 2:
-        current_type = "sequence"
-    else:
-        current_type = "vector"
-
-    for idx, layer in enumerate(layers):
-        if layer.neurons < 1 or layer.neurons > 512:
-            errors.append(f"Layer {idx} has invalid neuron count (1-512).")
+    for idx, (layer, info) in enumerate(zip(layers, shape_inference.infer(layers))):
+        if layer.neurons < 1:
+            errors.append(f"Layer {idx} must have at least one neuron.")
         if not _is_supported(layer.layer_type):
             errors.append(f"Layer {idx} type '{layer.layer_type}' not supported.")
 
-        if idx == 0:
-            architecture.append(layer.neurons)
-            continue
-
-        ltype = layer.layer_type
-        if ltype in {"dense", "output"}:
-            if current_type != "vector":
-                errors.append(f"Layer {idx} ({ltype}) requires vector input. Add Flatten first.")
-            in_dim = current_shape[0] if current_shape else layer.neurons
-            out_dim = layer.neurons
-            weights = in_dim * out_dim
-            biases = out_dim
-            total = weights + biases
-            total_params += total
-            layer_params.append({"layer": idx, "weights": weights, "biases": biases, "total": total})
-            flops += 2 * weights + biases
-            current_shape = (out_dim,)
-            current_type = "vector"
-            activations.append((layer.activation or "linear").lower())
-            architecture.append(out_dim)
-        elif ltype == "conv2d":
-            if current_type != "spatial":
-                errors.append(f"Layer {idx} (conv2d) requires spatial input (C,H,W).")
-                continue
-            c_in, h_in, w_in = current_shape
-            c_out = layer.filters or layer.neurons
-            k = layer.kernel_size or 3
-            stride = layer.stride or 1
-            padding = (layer.padding or "valid").lower()
-            pad = (k - 1) // 2 if padding == "same" else 0
-            h_out = (h_in + 2 * pad - k) // stride + 1
-            w_out = (w_in + 2 * pad - k) // stride + 1
-            weights = c_out * c_in * k * k
-            biases = c_out
-            total = weights + biases
-            total_params += total
-            layer_params.append({"layer": idx, "weights": weights, "biases": biases, "total": total})
-            flops += 2 * c_in * k * k * c_out * h_out * w_out
-            current_shape = (c_out, h_out, w_out)
-            current_type = "spatial"
-            activations.append((layer.activation or "linear").lower())
-            architecture.append(_shape_size(current_shape))
-        elif ltype in {"maxpool2d", "avgpool2d"}:
-            if current_type != "spatial":
-                errors.append(f"Layer {idx} ({ltype}) requires spatial input (C,H,W).")
-                continue
-            c_in, h_in, w_in = current_shape
-            k = layer.pool_size or layer.kernel_size or 2
-            stride = layer.pool_stride or layer.stride or k
-            h_out = (h_in - k) // stride + 1
-            w_out = (w_in - k) // stride + 1
-            layer_params.append({"layer": idx, "weights": 0, "biases": 0, "total": 0})
-            flops += c_in * h_out * w_out * k * k
-            current_shape = (c_in, h_out, w_out)
-            current_type = "spatial"
-            architecture.append(_shape_size(current_shape))
-        elif ltype == "flatten":
-            if current_type != "spatial":
-                errors.append(f"Layer {idx} (flatten) requires spatial input.")
-                continue
-            current_shape = (_shape_size(current_shape),)
-            current_type = "vector"
-            layer_params.append({"layer": idx, "weights": 0, "biases": 0, "total": 0})
-            architecture.append(current_shape[0])
-        elif ltype == "batchnorm":
-            if current_type == "vector":
-                features = current_shape[0]
-                weights = features
-                biases = features
-            elif current_type == "spatial":
-                features = current_shape[0]
-                weights = features
-                biases = features
-            else:
-                errors.append(f"Layer {idx} (batchnorm) requires vector or spatial input.")
-                continue
-            total = weights + biases
-            total_params += total
-            layer_params.append({"layer": idx, "weights": weights, "biases": biases, "total": total})
-            architecture.append(_shape_size(current_shape))
-        elif ltype in {"rnn", "lstm", "gru"}:
-            if current_type != "sequence":
-                errors.append(f"Layer {idx} ({ltype}) requires sequence input (T,D).")
-                continue
-            t_len, d_in = current_shape
-            hidden = layer.hidden_size or layer.neurons
-            if ltype == "rnn":
-                total = hidden * (d_in + hidden + 1)
-                total_params += total
-                layer_params.append({"layer": idx, "weights": hidden * (d_in + hidden), "biases": hidden, "total": total})
-            else:
-                if ltype == "gru":
-                    total = 3 * hidden * (d_in + hidden + 1)
-                    total_params += total
-                    layer_params.append({"layer": idx, "weights": 3 * hidden * (d_in + hidden), "biases": 3 * hidden, "total": total})
-                else:
-                    total = 4 * hidden * (d_in + hidden + 1)
-                    total_params += total
-                    layer_params.append({"layer": idx, "weights": 4 * hidden * (d_in + hidden), "biases": 4 * hidden, "total": total})
-            return_seq = bool(layer.return_sequences)
-            if return_seq:
-                current_shape = (t_len, hidden)
-                current_type = "sequence"
-                architecture.append(t_len * hidden)
-            else:
-                current_shape = (hidden,)
-                current_type = "vector"
-                architecture.append(hidden)
-        elif ltype == "embedding":
-            if current_type not in {"sequence", "vector"}:
-                errors.append(f"Layer {idx} (embedding) requires sequence input.")
-                continue
-            t_len = current_shape[0]
-            vocab = layer.vocab_size or 50
-            emb = layer.embedding_dim or layer.neurons
-            total = vocab * emb
-            total_params += total
-            layer_params.append({"layer": idx, "weights": total, "biases": 0, "total": total})
-            current_shape = (t_len, emb)
-            current_type = "sequence"
-            architecture.append(t_len * emb)
-        elif ltype == "attention":
-            if current_type != "sequence":
-                errors.append(f"Layer {idx} (attention) requires sequence input.")
-                continue
-            t_len, d_model = current_shape
-            total = 4 * d_model * d_model
-            total_params += total
-            layer_params.append({"layer": idx, "weights": total, "biases": 0, "total": total})
-            current_shape = (t_len, d_model)
-            current_type = "sequence"
-            architecture.append(t_len * d_model)
-        elif ltype == "residual":
-            layer_params.append({"layer": idx, "weights": 0, "biases": 0, "total": 0})
-            architecture.append(_shape_size(current_shape))
+        errors.extend(info.errors)
+        if info.architecture_units is not None:
+            architecture.append(info.architecture_units)
+        if info.activation is not None:
+            activations.append(info.activation)
+        if info.has_param_entry:
+            layer_params.append({"layer": idx, "weights": info.weights, "biases": info.biases, "total": info.params})
+        total_params += info.params
+        flops += info.flops_forward
 
     return ValidationResult(
         valid=len(errors) == 0,
@@ -262,4 +117,11 @@ def validate_layers(layers: List[LayerConfig]) -> ValidationResult:
     )
 
 
-__all__ = ["LayerConfig", "ValidationResult", "validate_layers"]
+__all__ = [
+    "LayerConfig",
+    "LayerInference",
+    "ShapeInferenceEngine",
+    "ValidationResult",
+    "shape_inference",
+    "validate_layers",
+]
@@ -2,18 +2,74 @@ from __future__ import annotations
 
 import numpy as np
 
+from ..execution_context import LayerState
+
+
+class KVCache:
+    """Keys and values of the positions decoded so far, for incremental attention.
+
+    Rows live in a buffer that grows by doubling, so appending is amortized O(1). Caches
+    derived from one another share the buffer; only the one at the buffer's fill level
+    appends in place, any other (e.g. a branch from a saved state) copies its rows first,
+    so a cache never changes once handed out.
+    """
+
+    __slots__ = ("keys", "values", "length", "_fill")
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray, length: int, fill: list) -> None:
+        self.keys = keys
+        self.values = values
+        self.length = length
+        self._fill = fill
+
+    @classmethod
+    def empty(cls, d_model: int, capacity: int = 16) -> "KVCache":
+        shape = (max(1, capacity), d_model)
+        return cls(np.zeros(shape, dtype=np.float32), np.zeros(shape, dtype=np.float32), 0, [0])
+
+    @property
+    def K(self) -> np.ndarray:
+        return self.keys[: self.length]
+
+    @property
+    def V(self) -> np.ndarray:
+        return self.values[: self.length]
+
+    def append(self, k: np.ndarray, v: np.ndarray) -> "KVCache":
+        keys, values, fill = self.keys, self.values, self._fill
+        n = self.length
+        if fill[0] != n or n == len(keys):
+            capacity = max(len(keys), 2 * n) if n == len(keys) else len(keys)
+            keys = np.zeros((capacity, keys.shape[1]), dtype=np.float32)
+            values = np.zeros_like(keys)
+            keys[:n], values[:n] = self.K, self.V
+            fill = [n]
+        keys[n], values[n] = k, v
+        fill[0] = n + 1
+        return KVCache(keys, values, n + 1, fill)
+
+    def trim(self, keep_last: int) -> "KVCache":
+        """A new cache holding only the most recent `keep_last` positions (sliding window)."""
+        keep = max(0, min(int(keep_last), self.length))
+        cache = KVCache.empty(self.keys.shape[1], max(16, keep))
+        cache.keys[:keep] = self.keys[self.length - keep : self.length]
+        cache.values[:keep] = self.values[self.length - keep : self.length]
+        cache.length = cache._fill[0] = keep
+        return cache
+
 
 class AttentionLayer:
     layer_type = "attention"
     has_params = True
 
-    def __init__(self, d_model: int, num_heads: int = 1) -> None:
+    def __init__(self, d_model: int, num_heads: int = 1, rng: np.random.Generator | None = None) -> None:
+        gen = rng if rng is not None else np.random
         self.d_model = d_model
         self.num_heads = max(1, num_heads)
-        self.W_q = np.random.randn(d_model, d_model).astype(np.float32) * 0.1
-        self.W_k = np.random.randn(d_model, d_model).astype(np.float32) * 0.1
-        self.W_v = np.random.randn(d_model, d_model).astype(np.float32) * 0.1
-        self.W_o = np.random.randn(d_model, d_model).astype(np.float32) * 0.1
+        self.W_q = gen.standard_normal((d_model, d_model)).astype(np.float32) * 0.1
+        self.W_k = gen.standard_normal((d_model, d_model)).astype(np.float32) * 0.1
+        self.W_v = gen.standard_normal((d_model, d_model)).astype(np.float32) * 0.1
+        self.W_o = gen.standard_normal((d_model, d_model)).astype(np.float32) * 0.1
         self.last_input: np.ndarray | None = None
         self.Q: np.ndarray | None = None
         self.K: np.ndarray | None = None
@@ -24,10 +80,11 @@ class AttentionLayer:
         self.dW: np.ndarray | None = None
         self.db: np.ndarray | None = None
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         if x.ndim == 1:
             x = x.reshape(-1, self.d_model)
-        self.last_input = x.astype(np.float32)
+        st.last_input = x.astype(np.float32)
         Q = x @ self.W_q
         K = x @ self.W_k
         V = x @ self.W_v
@@ -35,34 +92,53 @@ class AttentionLayer:
         scores = (Q @ K.T) / scale
         exp = np.exp(scores - np.max(scores, axis=-1, keepdims=True))
         A = exp / np.sum(exp, axis=-1, keepdims=True)
-        self.Q = Q
-        self.K = K
-        self.V = V
-        self.A = A
-        self.attn_weights = A
+        st.Q = Q
+        st.K = K
+        st.V = V
+        st.A = A
+        st.attn_weights = A
         O = A @ V
-        self.O = O
+        st.O = O
         return O @ self.W_o
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.last_input is None or self.Q is None or self.K is None or self.V is None or self.A is None or self.O is None:
+    def initial_state(self) -> KVCache:
+        return KVCache.empty(self.d_model)
+
+    def step(self, x_t: np.ndarray, cache: KVCache) -> tuple[np.ndarray, KVCache, dict]:
+        """Incremental decode: attend from the new position to itself and every cached one.
+
+        Only the new row's q, k and v are computed, so a step costs O(T) instead of the
+        O(T^2) of re-running `forward` on the extended sequence. The returned row equals
+        the last row of that forward; the rows of earlier positions are not revised, so a
+        stepped sequence is causal while `forward` lets each position see later ones.
+        """
+        x_t = x_t.astype(np.float32)
+        cache = cache.append(x_t @ self.W_k, x_t @ self.W_v)
+        scores = (cache.K @ (x_t @ self.W_q)) / np.sqrt(self.d_model)
+        exp = np.exp(scores - scores.max())
+        weights = exp / exp.sum()
+        return (weights @ cache.V) @ self.W_o, cache, {"weights": weights}
+
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.last_input is None or st.Q is None or st.K is None or st.V is None or st.A is None or st.O is None:
             raise RuntimeError("AttentionLayer.backward called before forward.")
-        X = self.last_input
+        X = st.last_input
         scale = np.sqrt(self.d_model)
         dY = d_out
-        dW_o = self.O.T @ dY
+        dW_o = st.O.T @ dY
         dO = dY @ self.W_o.T
-        dA = dO @ self.V.T
-        dV = self.A.T @ dO
+        dA = dO @ st.V.T
+        dV = st.A.T @ dO
 
-        dS = np.zeros_like(self.A)
-        for i in range(self.A.shape[0]):
-            ai = self.A[i]
+        dS = np.zeros_like(st.A)
+        for i in range(st.A.shape[0]):
+            ai = st.A[i]
             dai = dA[i]
             dS[i] = ai * (dai - np.sum(dai * ai))
 
-        dQ = dS @ self.K / scale
-        dK = dS.T @ self.Q / scale
+        dQ = dS @ st.K / scale
+        dK = dS.T @ st.Q / scale
 
         dW_q = X.T @ dQ
         dW_k = X.T @ dK
@@ -70,8 +146,8 @@ class AttentionLayer:
 
         dX = dQ @ self.W_q.T + dK @ self.W_k.T + dV @ self.W_v.T
 
-        self.dW = np.stack([dW_q, dW_k, dW_v, dW_o], axis=0)
-        self.db = np.zeros((1,), dtype=np.float32)
+        st.dW = np.stack([dW_q, dW_k, dW_v, dW_o], axis=0)
+        st.db = np.zeros((1,), dtype=np.float32)
         return dX
 
     def params(self) -> tuple[np.ndarray, np.ndarray]:
@@ -79,8 +155,9 @@ class AttentionLayer:
         w = np.stack([self.W_q, self.W_k, self.W_v, self.W_o], axis=0)
         return w, np.zeros((1,), dtype=np.float32)
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dW, self.db
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dW, st.db
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         if w.ndim == 4 and w.shape[0] >= 4:
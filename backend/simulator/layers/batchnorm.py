@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import numpy as np
 
+from ..execution_context import LayerState
+
 
 class BatchNormLayer:
     layer_type = "batchnorm"
@@ -39,51 +41,54 @@ class BatchNormLayer:
         x_hat = (x - mean) / np.sqrt(var + self.eps)
         return mean, var, x_hat
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         x = x.astype(np.float32)
-        self.last_input = x
+        st.last_input = x
         mean, var, x_hat = self._compute_stats(x)
-        self.mean = mean
-        self.var = var
-        self.x_hat = x_hat
-        # update running stats
-        self.running_mean = self.momentum * self.running_mean + (1 - self.momentum) * mean
-        self.running_var = self.momentum * self.running_var + (1 - self.momentum) * var
+        st.mean = mean
+        st.var = var
+        st.x_hat = x_hat
+        # update running stats; a per-call state gets its own copy so shared layers stay untouched
+        st.running_mean = self.momentum * self.running_mean + (1 - self.momentum) * mean
+        st.running_var = self.momentum * self.running_var + (1 - self.momentum) * var
         if x.ndim == 3:
             return self.gamma[:, None, None] * x_hat + self.beta[:, None, None]
         return self.gamma * x_hat + self.beta
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.x_hat is None or self.last_input is None or self.mean is None or self.var is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.x_hat is None or st.last_input is None or st.mean is None or st.var is None:
             raise RuntimeError("BatchNormLayer.backward called before forward.")
-        x = self.last_input
+        x = st.last_input
         if x.ndim == 3:
             c, h, w = x.shape
             N = h * w
-            x_hat = self.x_hat
-            self.dgamma = np.sum(d_out * x_hat, axis=(1, 2))
-            self.dbeta = np.sum(d_out, axis=(1, 2))
+            x_hat = st.x_hat
+            st.dgamma = np.sum(d_out * x_hat, axis=(1, 2))
+            st.dbeta = np.sum(d_out, axis=(1, 2))
             dx_hat = d_out * self.gamma[:, None, None]
-            dvar = np.sum(dx_hat * (x - self.mean[:, None, None]) * -0.5 * (self.var[:, None, None] + self.eps) ** -1.5, axis=(1, 2))
-            dmean = np.sum(dx_hat * -1 / np.sqrt(self.var[:, None, None] + self.eps), axis=(1, 2)) + dvar * np.mean(-2 * (x - self.mean[:, None, None]), axis=(1, 2))
-            dx = dx_hat / np.sqrt(self.var[:, None, None] + self.eps) + dvar[:, None, None] * 2 * (x - self.mean[:, None, None]) / N + dmean[:, None, None] / N
+            dvar = np.sum(dx_hat * (x - st.mean[:, None, None]) * -0.5 * (st.var[:, None, None] + self.eps) ** -1.5, axis=(1, 2))
+            dmean = np.sum(dx_hat * -1 / np.sqrt(st.var[:, None, None] + self.eps), axis=(1, 2)) + dvar * np.mean(-2 * (x - st.mean[:, None, None]), axis=(1, 2))
+            dx = dx_hat / np.sqrt(st.var[:, None, None] + self.eps) + dvar[:, None, None] * 2 * (x - st.mean[:, None, None]) / N + dmean[:, None, None] / N
             return dx.astype(np.float32)
 
         N = x.shape[0]
-        x_hat = self.x_hat
-        self.dgamma = np.sum(d_out * x_hat)
-        self.dbeta = np.sum(d_out)
+        x_hat = st.x_hat
+        st.dgamma = np.sum(d_out * x_hat)
+        st.dbeta = np.sum(d_out)
         dx_hat = d_out * self.gamma
-        dvar = np.sum(dx_hat * (x - self.mean) * -0.5 * (self.var + self.eps) ** -1.5)
-        dmean = np.sum(dx_hat * -1 / np.sqrt(self.var + self.eps)) + dvar * np.mean(-2 * (x - self.mean))
-        dx = dx_hat / np.sqrt(self.var + self.eps) + dvar * 2 * (x - self.mean) / N + dmean / N
+        dvar = np.sum(dx_hat * (x - st.mean) * -0.5 * (st.var + self.eps) ** -1.5)
+        dmean = np.sum(dx_hat * -1 / np.sqrt(st.var + self.eps)) + dvar * np.mean(-2 * (x - st.mean))
+        dx = dx_hat / np.sqrt(st.var + self.eps) + dvar * 2 * (x - st.mean) / N + dmean / N
         return dx.astype(np.float32)
 
     def params(self) -> tuple[np.ndarray, np.ndarray]:
         return self.gamma, self.beta
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dgamma, self.dbeta
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dgamma, st.dbeta
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         self.gamma = w.astype(np.float32)
@@ -6,6 +6,7 @@ from typing import Tuple
 import numpy as np
 
 from ..activations import get_activation
+from ..execution_context import LayerState
 
 
 @dataclass
@@ -23,13 +24,14 @@ class Conv2DLayer:
     layer_type = "conv2d"
     has_params = True
 
-    def __init__(self, cfg: Conv2DConfig) -> None:
+    def __init__(self, cfg: Conv2DConfig, rng: np.random.Generator | None = None) -> None:
+        gen = rng if rng is not None else np.random
         self.cfg = cfg
         k_h, k_w = cfg.kernel_size
         fan_in = cfg.c_in * k_h * k_w
         fan_out = cfg.c_out * k_h * k_w
         std = np.sqrt(2.0 / fan_in) if cfg.init == "he" else np.sqrt(2.0 / (fan_in + fan_out))
-        self.K = (np.random.randn(cfg.c_out, cfg.c_in, k_h, k_w) * std).astype(np.float32)
+        self.K = (gen.standard_normal((cfg.c_out, cfg.c_in, k_h, k_w)) * std).astype(np.float32)
         self.b = np.zeros(cfg.c_out, dtype=np.float32)
         self.dK: np.ndarray | None = None
         self.db: np.ndarray | None = None
@@ -46,17 +48,17 @@ class Conv2DLayer:
         pad_w = max((w - 1) * self.cfg.stride + k_w - w, 0) // 2
         return pad_h, pad_w
 
-    def _pad(self, x: np.ndarray) -> np.ndarray:
+    def _pad(self, x: np.ndarray) -> tuple[np.ndarray, tuple[int, int]]:
         pad_h, pad_w = self._compute_padding(x)
-        self._pad_hw = (pad_h, pad_w)
         if pad_h == 0 and pad_w == 0:
-            return x
-        return np.pad(x, ((0, 0), (pad_h, pad_h), (pad_w, pad_w)), mode="constant")
+            return x, (0, 0)
+        return np.pad(x, ((0, 0), (pad_h, pad_h), (pad_w, pad_w)), mode="constant"), (pad_h, pad_w)
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         x = x.astype(np.float32)
-        x_p = self._pad(x)
-        self.X_padded = x_p
+        x_p, st._pad_hw = self._pad(x)
+        st.X_padded = x_p
         c_out, _, k_h, k_w = self.K.shape
         _, h, w = x_p.shape
         out_h = (h - k_h) // self.cfg.stride + 1
@@ -69,23 +71,24 @@ class Conv2DLayer:
                     w0 = j * self.cfg.stride
                     patch = x_p[:, h0 : h0 + k_h, w0 : w0 + k_w]
                     z[f, i, j] = np.sum(patch * self.K[f]) + self.b[f]
-        self.Z = z
+        st.Z = z
         act = get_activation(self.cfg.activation)
         return act.forward(z)
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.X_padded is None or self.Z is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.X_padded is None or st.Z is None:
             raise RuntimeError("Conv2DLayer.backward called before forward.")
         act = get_activation(self.cfg.activation)
-        dZ = d_out * act.derivative(self.Z)
+        dZ = d_out * act.derivative(st.Z)
         c_out, c_in, k_h, k_w = self.K.shape
-        _, h_p, w_p = self.X_padded.shape
+        _, h_p, w_p = st.X_padded.shape
         out_h = (h_p - k_h) // self.cfg.stride + 1
         out_w = (w_p - k_w) // self.cfg.stride + 1
 
         dK = np.zeros_like(self.K, dtype=np.float32)
         db = np.zeros_like(self.b, dtype=np.float32)
-        dX_p = np.zeros_like(self.X_padded, dtype=np.float32)
+        dX_p = np.zeros_like(st.X_padded, dtype=np.float32)
 
         for f in range(c_out):
             db[f] = np.sum(dZ[f])
@@ -93,13 +96,13 @@ class Conv2DLayer:
                 for j in range(out_w):
                     h0 = i * self.cfg.stride
                     w0 = j * self.cfg.stride
-                    patch = self.X_padded[:, h0 : h0 + k_h, w0 : w0 + k_w]
+                    patch = st.X_padded[:, h0 : h0 + k_h, w0 : w0 + k_w]
                     dK[f] += dZ[f, i, j] * patch
                     dX_p[:, h0 : h0 + k_h, w0 : w0 + k_w] += dZ[f, i, j] * self.K[f]
 
-        self.dK = dK
-        self.db = db
-        pad_h, pad_w = self._pad_hw
+        st.dK = dK
+        st.db = db
+        pad_h, pad_w = st._pad_hw
         if pad_h == 0 and pad_w == 0:
             return dX_p
         return dX_p[:, pad_h : h_p - pad_h, pad_w : w_p - pad_w]
@@ -107,8 +110,9 @@ class Conv2DLayer:
     def params(self) -> tuple[np.ndarray, np.ndarray]:
         return self.K, self.b
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dK, self.db
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dK, st.db
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         self.K = w.astype(np.float32)
@@ -3,26 +3,42 @@ from __future__ import annotations
 import numpy as np
 
 from ..activations import get_activation
+from ..execution_context import LayerState
 
 
 class DenseLayer:
     layer_type = "dense"
     has_params = True
 
-    def __init__(self, in_dim: int, out_dim: int, activation: str | None = None, init: str | None = None) -> None:
+    def __init__(
+        self,
+        in_dim: int,
+        out_dim: int,
+        activation: str | None = None,
+        init: str | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> None:
         self.in_dim = in_dim
         self.out_dim = out_dim
         self.activation_name = (activation or "linear").lower()
         self.init = init
-        self.W = self._init_weights((out_dim, in_dim), init)
-        self.b = self._init_bias((out_dim,), init)
+        gen = rng if rng is not None else np.random
+        self.W = self._init_weights((out_dim, in_dim), init, gen)
+        self.b = self._init_bias((out_dim,), init, gen)
         self.X: np.ndarray | None = None
         self.Z: np.ndarray | None = None
         self.dW: np.ndarray | None = None
         self.db: np.ndarray | None = None
+        # Input compaction is only exact when zeros in X also zero the upstream
+        # gradient, i.e. X comes out of a ReLU (build_graph sets relu_input).
+        self.relu_input = False
+        self.sparse_threshold: float | None = None
+        self.input_sparsity = 0.0
+        self.nz: np.ndarray | None = None
+        self._W_T: tuple[np.ndarray, np.ndarray] | None = None
 
     @staticmethod
-    def _init_weights(shape: tuple[int, int], init: str | None) -> np.ndarray:
+    def _init_weights(shape: tuple[int, int], init: str | None, gen=np.random) -> np.ndarray:
         init_name = (init or "xavier").lower()
         fan_out, fan_in = shape
         if init_name in {"xavier", "glorot"}:
@@ -35,40 +51,73 @@ class DenseLayer:
             return np.zeros(shape, dtype=np.float32)
         else:
             std = 0.01
-        return np.random.normal(0.0, std, size=shape).astype(np.float32)
+        return gen.normal(0.0, std, size=shape).astype(np.float32)
 
     @staticmethod
-    def _init_bias(shape: tuple[int], init: str | None) -> np.ndarray:
+    def _init_bias(shape: tuple[int], init: str | None, gen=np.random) -> np.ndarray:
         init_name = (init or "zeros").lower()
         if init_name == "random":
-            return np.random.normal(0.0, 0.01, size=shape).astype(np.float32)
+            return gen.normal(0.0, 0.01, size=shape).astype(np.float32)
         return np.zeros(shape, dtype=np.float32)
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def _select_nonzero(self, x: np.ndarray, st) -> np.ndarray | None:
+        if self.sparse_threshold is None or not self.relu_input or x.size == 0:
+            return None
+        nz = np.flatnonzero(x)
+        st.input_sparsity = 1.0 - nz.size / x.size
+        if st.input_sparsity < self.sparse_threshold:
+            return None
+        return nz
+
+    def _weights_t(self) -> np.ndarray:
+        # row-major W^T makes the column gather W[:, nz] a contiguous row gather;
+        # keyed on the W it was built from so concurrent set_params can't leave it stale
+        w = self.W
+        cached = self._W_T
+        if cached is None or cached[0] is not w:
+            cached = (w, np.ascontiguousarray(w.T))
+            self._W_T = cached
+        return cached[1]
+
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         x = x.reshape(-1).astype(np.float32)
-        self.X = x
-        z = self.W @ x + self.b
-        self.Z = z
+        st.X = x
+        st.nz = self._select_nonzero(x, st)
+        if st.nz is not None:
+            z = x[st.nz] @ self._weights_t()[st.nz] + self.b
+        else:
+            z = self.W @ x + self.b
+        st.Z = z
         act = get_activation(self.activation_name)
         return act.forward(z)
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.X is None or self.Z is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.X is None or st.Z is None:
             raise RuntimeError("DenseLayer.backward called before forward.")
         act = get_activation(self.activation_name)
-        dZ = d_out * act.derivative(self.Z)
-        self.dW = np.outer(dZ, self.X)
-        self.db = dZ.copy()
+        dZ = d_out * act.derivative(st.Z)
+        st.db = dZ.copy()
+        if st.nz is not None:
+            st.dW = np.zeros_like(self.W)
+            st.dW[:, st.nz] = np.outer(dZ, st.X[st.nz])
+            dX = np.zeros_like(st.X)
+            dX[st.nz] = self._weights_t()[st.nz] @ dZ
+            return dX
+        st.dW = np.outer(dZ, st.X)
         dX = self.W.T @ dZ
         return dX
 
     def params(self) -> tuple[np.ndarray, np.ndarray]:
         return self.W, self.b
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dW, self.db
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dW, st.db
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         self.W = w.astype(np.float32)
         self.b = b.astype(np.float32)
+        self._W_T = None
 
@@ -2,19 +2,24 @@ from __future__ import annotations
 
 import numpy as np
 
+from ..execution_context import LayerState
+
 
 class GRULayer:
     layer_type = "gru"
     has_params = True
 
-    def __init__(self, input_dim: int, hidden_dim: int, return_sequences: bool = False) -> None:
+    def __init__(
+        self, input_dim: int, hidden_dim: int, return_sequences: bool = False, rng: np.random.Generator | None = None
+    ) -> None:
+        gen = rng if rng is not None else np.random
         self.input_dim = input_dim
         self.hidden_dim = hidden_dim
         self.return_sequences = return_sequences
         concat_dim = input_dim + hidden_dim
-        self.W_r = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
-        self.W_z = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
-        self.W_h = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
+        self.W_r = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
+        self.W_z = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
+        self.W_h = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
         self.b_r = np.zeros(hidden_dim, dtype=np.float32)
         self.b_z = np.zeros(hidden_dim, dtype=np.float32)
         self.b_h = np.zeros(hidden_dim, dtype=np.float32)
@@ -28,65 +33,73 @@ class GRULayer:
     def _sigmoid(x: np.ndarray) -> np.ndarray:
         return 1.0 / (1.0 + np.exp(-x))
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def initial_state(self) -> tuple[np.ndarray]:
+        return (np.zeros(self.hidden_dim, dtype=np.float32),)
+
+    def step(self, x_t: np.ndarray, carry: tuple[np.ndarray]) -> tuple[np.ndarray, tuple[np.ndarray], dict]:
+        """One timestep from the previous `(h,)`: returns `(h_t, (h_t,), gates)`."""
+        (h_prev,) = carry
+        concat = np.concatenate([h_prev, x_t])
+        r = self._sigmoid(self.W_r @ concat + self.b_r)
+        z = self._sigmoid(self.W_z @ concat + self.b_z)
+        concat_h = np.concatenate([r * h_prev, x_t])
+        h_tilde = np.tanh(self.W_h @ concat_h + self.b_h)
+        h = (1 - z) * h_prev + z * h_tilde
+        return h, (h,), {"r": r, "z": z, "h_tilde": h_tilde}
+
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         if x.ndim == 1:
             x = x.reshape(-1, self.input_dim)
-        self.X = x.astype(np.float32)
-        T = self.X.shape[0]
+        st.X = x.astype(np.float32)
+        T = st.X.shape[0]
         H = np.zeros((T, self.hidden_dim), dtype=np.float32)
         gates = {"r": [], "z": [], "h_tilde": []}
-        h_prev = np.zeros(self.hidden_dim, dtype=np.float32)
+        carry = self.initial_state()
         for t in range(T):
-            concat = np.concatenate([h_prev, self.X[t]])
-            r = self._sigmoid(self.W_r @ concat + self.b_r)
-            z = self._sigmoid(self.W_z @ concat + self.b_z)
-            concat_h = np.concatenate([r * h_prev, self.X[t]])
-            h_tilde = np.tanh(self.W_h @ concat_h + self.b_h)
-            h = (1 - z) * h_prev + z * h_tilde
-            gates["r"].append(r)
-            gates["z"].append(z)
-            gates["h_tilde"].append(h_tilde)
-            H[t] = h
-            h_prev = h
-        self.H = H
-        self.gates = {k: np.stack(v) for k, v in gates.items()}
+            H[t], carry, step_gates = self.step(st.X[t], carry)
+            for name, values in step_gates.items():
+                gates[name].append(values)
+        st.H = H
+        st.gates = {k: np.stack(v) for k, v in gates.items()}
         return H if self.return_sequences else H[-1]
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.X is None or self.H is None or self.gates is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.X is None or st.H is None or st.gates is None:
             raise RuntimeError("GRULayer.backward called before forward.")
-        T = self.X.shape[0]
+        T = st.X.shape[0]
         dW_r = np.zeros_like(self.W_r)
         dW_z = np.zeros_like(self.W_z)
         dW_h = np.zeros_like(self.W_h)
         db_r = np.zeros_like(self.b_r)
         db_z = np.zeros_like(self.b_z)
         db_h = np.zeros_like(self.b_h)
-        dX = np.zeros_like(self.X)
+        dX = np.zeros_like(st.X)
         dh_next = np.zeros(self.hidden_dim, dtype=np.float32)
         if d_out.ndim == 1:
-            d_out_seq = np.zeros_like(self.H)
+            d_out_seq = np.zeros_like(st.H)
             d_out_seq[-1] = d_out
         else:
             d_out_seq = d_out
         for t in reversed(range(T)):
-            h_prev = self.H[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
-            r = self.gates["r"][t]
-            z = self.gates["z"][t]
-            h_tilde = self.gates["h_tilde"][t]
+            h_prev = st.H[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
+            r = st.gates["r"][t]
+            z = st.gates["z"][t]
+            h_tilde = st.gates["h_tilde"][t]
             dh = d_out_seq[t] + dh_next
             dh_tilde = dh * z
             dz = dh * (h_tilde - h_prev)
             dh_prev = dh * (1 - z)
             dh_tilde_raw = dh_tilde * (1 - h_tilde ** 2)
-            concat_h = np.concatenate([r * h_prev, self.X[t]])
+            concat_h = np.concatenate([r * h_prev, st.X[t]])
             dW_h += np.outer(dh_tilde_raw, concat_h)
             db_h += dh_tilde_raw
             dconcat_h = self.W_h.T @ dh_tilde_raw
             dr = dconcat_h[: self.hidden_dim] * h_prev
             dx_h = dconcat_h[self.hidden_dim :]
             dr_raw = dr * r * (1 - r)
-            concat = np.concatenate([h_prev, self.X[t]])
+            concat = np.concatenate([h_prev, st.X[t]])
             dW_r += np.outer(dr_raw, concat)
             db_r += dr_raw
             dconcat_r = self.W_r.T @ dr_raw
@@ -96,8 +109,8 @@ class GRULayer:
             dconcat_z = self.W_z.T @ dz_raw
             dh_next = dh_prev + dconcat_r[: self.hidden_dim] + dconcat_z[: self.hidden_dim] + dconcat_h[: self.hidden_dim] * r
             dX[t] = dx_h + dconcat_r[self.hidden_dim :] + dconcat_z[self.hidden_dim :]
-        self.dW = np.concatenate([dW_r, dW_z, dW_h], axis=0)
-        self.db = np.concatenate([db_r, db_z, db_h], axis=0)
+        st.dW = np.concatenate([dW_r, dW_z, dW_h], axis=0)
+        st.db = np.concatenate([db_r, db_z, db_h], axis=0)
         return dX
 
     def params(self) -> tuple[np.ndarray, np.ndarray]:
@@ -105,8 +118,9 @@ class GRULayer:
         b = np.concatenate([self.b_r, self.b_z, self.b_h], axis=0)
         return w, b
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dW, self.db
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dW, st.db
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         h = self.hidden_dim
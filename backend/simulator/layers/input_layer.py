@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import numpy as np
 
+from ..execution_context import LayerState
+
 
 class InputLayer:
     layer_type = "input"
@@ -11,17 +13,18 @@ class InputLayer:
         self.input_shape = input_shape
         self.last_input: np.ndarray | None = None
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
-        self.last_input = x
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        st.last_input = x
         return x.astype(np.float32)
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
         return d_out
 
     def params(self) -> tuple[None, None]:
         return None, None
 
-    def grads(self) -> tuple[None, None]:
+    def grads(self, state: LayerState | None = None) -> tuple[None, None]:
         return None, None
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
@@ -2,20 +2,25 @@ from __future__ import annotations
 
 import numpy as np
 
+from ..execution_context import LayerState
+
 
 class LSTMLayer:
     layer_type = "lstm"
     has_params = True
 
-    def __init__(self, input_dim: int, hidden_dim: int, return_sequences: bool = False) -> None:
+    def __init__(
+        self, input_dim: int, hidden_dim: int, return_sequences: bool = False, rng: np.random.Generator | None = None
+    ) -> None:
+        gen = rng if rng is not None else np.random
         self.input_dim = input_dim
         self.hidden_dim = hidden_dim
         self.return_sequences = return_sequences
         concat_dim = input_dim + hidden_dim
-        self.W_f = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
-        self.W_i = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
-        self.W_o = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
-        self.W_c = np.random.randn(hidden_dim, concat_dim).astype(np.float32) * 0.1
+        self.W_f = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
+        self.W_i = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
+        self.W_o = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
+        self.W_c = gen.standard_normal((hidden_dim, concat_dim)).astype(np.float32) * 0.1
         self.b_f = np.zeros(hidden_dim, dtype=np.float32)
         self.b_i = np.zeros(hidden_dim, dtype=np.float32)
         self.b_o = np.zeros(hidden_dim, dtype=np.float32)
@@ -31,41 +36,48 @@ class LSTMLayer:
     def _sigmoid(x: np.ndarray) -> np.ndarray:
         return 1.0 / (1.0 + np.exp(-x))
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
+    def initial_state(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros(self.hidden_dim, dtype=np.float32), np.zeros(self.hidden_dim, dtype=np.float32)
+
+    def step(
+        self, x_t: np.ndarray, carry: tuple[np.ndarray, np.ndarray]
+    ) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray], dict]:
+        """One timestep from the previous `(h, c)`: returns `(h_t, (h_t, c_t), gates)`."""
+        h_prev, c_prev = carry
+        concat = np.concatenate([h_prev, x_t])
+        f = self._sigmoid(self.W_f @ concat + self.b_f)
+        i = self._sigmoid(self.W_i @ concat + self.b_i)
+        o = self._sigmoid(self.W_o @ concat + self.b_o)
+        g = np.tanh(self.W_c @ concat + self.b_c)
+        c = f * c_prev + i * g
+        h = o * np.tanh(c)
+        return h, (h, c), {"f": f, "i": i, "o": o, "g": g}
+
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
         if x.ndim == 1:
             x = x.reshape(-1, self.input_dim)
-        self.X = x.astype(np.float32)
-        T = self.X.shape[0]
+        st.X = x.astype(np.float32)
+        T = st.X.shape[0]
         H = np.zeros((T, self.hidden_dim), dtype=np.float32)
         C = np.zeros((T, self.hidden_dim), dtype=np.float32)
         gates = {"f": [], "i": [], "o": [], "g": []}
-        h_prev = np.zeros(self.hidden_dim, dtype=np.float32)
-        c_prev = np.zeros(self.hidden_dim, dtype=np.float32)
+        carry = self.initial_state()
         for t in range(T):
-            concat = np.concatenate([h_prev, self.X[t]])
-            f = self._sigmoid(self.W_f @ concat + self.b_f)
-            i = self._sigmoid(self.W_i @ concat + self.b_i)
-            o = self._sigmoid(self.W_o @ concat + self.b_o)
-            g = np.tanh(self.W_c @ concat + self.b_c)
-            c = f * c_prev + i * g
-            h = o * np.tanh(c)
-            gates["f"].append(f)
-            gates["i"].append(i)
-            gates["o"].append(o)
-            gates["g"].append(g)
-            H[t] = h
-            C[t] = c
-            h_prev = h
-            c_prev = c
-        self.H = H
-        self.C = C
-        self.gates = {k: np.stack(v) for k, v in gates.items()}
+            H[t], carry, step_gates = self.step(st.X[t], carry)
+            C[t] = carry[1]
+            for name, values in step_gates.items():
+                gates[name].append(values)
+        st.H = H
+        st.C = C
+        st.gates = {k: np.stack(v) for k, v in gates.items()}
         return H if self.return_sequences else H[-1]
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.X is None or self.H is None or self.C is None or self.gates is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.X is None or st.H is None or st.C is None or st.gates is None:
             raise RuntimeError("LSTMLayer.backward called before forward.")
-        T = self.X.shape[0]
+        T = st.X.shape[0]
         dW_f = np.zeros_like(self.W_f)
         dW_i = np.zeros_like(self.W_i)
         dW_o = np.zeros_like(self.W_o)
@@ -74,23 +86,23 @@ class LSTMLayer:
         db_i = np.zeros_like(self.b_i)
         db_o = np.zeros_like(self.b_o)
         db_c = np.zeros_like(self.b_c)
-        dX = np.zeros_like(self.X)
+        dX = np.zeros_like(st.X)
         dh_next = np.zeros(self.hidden_dim, dtype=np.float32)
         dc_next = np.zeros(self.hidden_dim, dtype=np.float32)
         if d_out.ndim == 1:
-            d_out_seq = np.zeros_like(self.H)
+            d_out_seq = np.zeros_like(st.H)
             d_out_seq[-1] = d_out
         else:
             d_out_seq = d_out
 
         for t in reversed(range(T)):
-            h_prev = self.H[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
-            c_prev = self.C[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
-            f = self.gates["f"][t]
-            i = self.gates["i"][t]
-            o = self.gates["o"][t]
-            g = self.gates["g"][t]
-            c = self.C[t]
+            h_prev = st.H[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
+            c_prev = st.C[t - 1] if t > 0 else np.zeros(self.hidden_dim, dtype=np.float32)
+            f = st.gates["f"][t]
+            i = st.gates["i"][t]
+            o = st.gates["o"][t]
+            g = st.gates["g"][t]
+            c = st.C[t]
             tanh_c = np.tanh(c)
             dh = d_out_seq[t] + dh_next
             do = dh * tanh_c
@@ -103,7 +115,7 @@ class LSTMLayer:
             do_raw = do * o * (1 - o)
             dg_raw = dg * (1 - g ** 2)
 
-            concat = np.concatenate([h_prev, self.X[t]])
+            concat = np.concatenate([h_prev, st.X[t]])
             dW_f += np.outer(df_raw, concat)
             dW_i += np.outer(di_raw, concat)
             dW_o += np.outer(do_raw, concat)
@@ -123,8 +135,8 @@ class LSTMLayer:
             dc_next = dc * f
             dX[t] = dconcat[self.hidden_dim :]
 
-        self.dW = np.concatenate([dW_f, dW_i, dW_o, dW_c], axis=0)
-        self.db = np.concatenate([db_f, db_i, db_o, db_c], axis=0)
+        st.dW = np.concatenate([dW_f, dW_i, dW_o, dW_c], axis=0)
+        st.db = np.concatenate([db_f, db_i, db_o, db_c], axis=0)
         return dX
 
     def params(self) -> tuple[np.ndarray, np.ndarray]:
@@ -132,8 +144,9 @@ class LSTMLayer:
         b = np.concatenate([self.b_f, self.b_i, self.b_o, self.b_c], axis=0)
         return w, b
 
-    def grads(self) -> tuple[np.ndarray | None, np.ndarray | None]:
-        return self.dW, self.db
+    def grads(self, state: LayerState | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        st = self if state is None else state
+        return st.dW, st.db
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
         h = self.hidden_dim
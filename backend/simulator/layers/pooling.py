@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 import numpy as np
 
+from ..execution_context import LayerState
+
 
 @dataclass
 class PoolConfig:
@@ -19,35 +21,37 @@ class MaxPool2DLayer:
         self.max_indices: np.ndarray | None = None
         self.input_shape: tuple[int, int, int] | None = None
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
-        self.input_shape = x.shape
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        st.input_shape = x.shape
         c, h, w = x.shape
         k = self.cfg.pool_size
         s = self.cfg.stride or k
         out_h = (h - k) // s + 1
         out_w = (w - k) // s + 1
         out = np.zeros((c, out_h, out_w), dtype=np.float32)
-        self.max_indices = np.zeros_like(out, dtype=np.int32)
+        st.max_indices = np.zeros_like(out, dtype=np.int32)
         for i in range(out_h):
             for j in range(out_w):
                 patch = x[:, i * s : i * s + k, j * s : j * s + k]
                 flat = patch.reshape(c, -1)
                 idx = np.argmax(flat, axis=1)
                 out[:, i, j] = flat[np.arange(c), idx]
-                self.max_indices[:, i, j] = idx
+                st.max_indices[:, i, j] = idx
         return out
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.input_shape is None or self.max_indices is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.input_shape is None or st.max_indices is None:
             raise RuntimeError("MaxPool2DLayer.backward called before forward.")
-        c, h, w = self.input_shape
+        c, h, w = st.input_shape
         k = self.cfg.pool_size
         s = self.cfg.stride or k
         out_h, out_w = d_out.shape[1], d_out.shape[2]
         dX = np.zeros((c, h, w), dtype=np.float32)
         for i in range(out_h):
             for j in range(out_w):
-                idx = self.max_indices[:, i, j]
+                idx = st.max_indices[:, i, j]
                 for ch in range(c):
                     r = idx[ch] // k
                     c_idx = idx[ch] % k
@@ -57,7 +61,7 @@ class MaxPool2DLayer:
     def params(self) -> tuple[None, None]:
         return None, None
 
-    def grads(self) -> tuple[None, None]:
+    def grads(self, state: LayerState | None = None) -> tuple[None, None]:
         return None, None
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
@@ -72,8 +76,9 @@ class AvgPool2DLayer:
         self.cfg = cfg
         self.input_shape: tuple[int, int, int] | None = None
 
-    def forward(self, x: np.ndarray) -> np.ndarray:
-        self.input_shape = x.shape
+    def forward(self, x: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        st.input_shape = x.shape
         c, h, w = x.shape
         k = self.cfg.pool_size
         s = self.cfg.stride or k
@@ -86,10 +91,11 @@ class AvgPool2DLayer:
                 out[:, i, j] = patch.mean(axis=(1, 2))
         return out
 
-    def backward(self, d_out: np.ndarray) -> np.ndarray:
-        if self.input_shape is None:
+    def backward(self, d_out: np.ndarray, state: LayerState | None = None) -> np.ndarray:
+        st = self if state is None else state
+        if st.input_shape is None:
             raise RuntimeError("AvgPool2DLayer.backward called before forward.")
-        c, h, w = self.input_shape
+        c, h, w = st.input_shape
         k = self.cfg.pool_size
         s = self.cfg.stride or k
         out_h, out_w = d_out.shape[1], d_out.shape[2]
@@ -103,7 +109,7 @@ class AvgPool2DLayer:
     def params(self) -> tuple[None, None]:
         return None, None
 
-    def grads(self) -> tuple[None, None]:
+    def grads(self, state: LayerState | None = None) -> tuple[None, None]:
         return None, None
 
     def set_params(self, w: np.ndarray, b: np.ndarray) -> None:
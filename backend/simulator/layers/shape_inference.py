@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import hashlib
+import threading
+
+if TYPE_CHECKING:
+    from . import LayerConfig
+
+
+@dataclass(frozen=True)
+class LayerInference:
+    index: int
+    layer_type: str
+    input_shape: Tuple[int, ...]
+    output_shape: Tuple[int, ...]
+    output_kind: str
+    weights: int = 0
+    biases: int = 0
+    flops_forward: int = 0
+    flops_backward: int = 0
+    architecture_units: Optional[int] = None
+    activation: Optional[str] = None
+    has_param_entry: bool = False
+    errors: Tuple[str, ...] = ()
+
+    @property
+    def params(self) -> int:
+        return self.weights + self.biases
+
+    def cost_row(self) -> Dict:
+        return {
+            "layer_index": self.index,
+            "layer_type": self.layer_type,
+            "params": int(self.params),
+            "flops_forward": int(self.flops_forward),
+            "flops_backward": int(self.flops_backward),
+            "output_shape": [int(v) for v in self.output_shape],
+        }
+
+
+def _shape_size(shape: Tuple[int, ...]) -> int:
+    size = 1
+    for dim in shape:
+        size *= dim
+    return size
+
+
+def _shape_kind(shape: Tuple[int, ...]) -> str:
+    if len(shape) == 3:
+        return "spatial"
+    if len(shape) == 2:
+        return "sequence"
+    return "vector"
+
+
+def _input_shape(layer: "LayerConfig") -> Tuple[int, ...]:
+    if layer.input_shape:
+        return tuple(int(v) for v in layer.input_shape)
+    if layer.sequence_length and layer.neurons:
+        return (int(layer.sequence_length), int(layer.neurons))
+    return (int(layer.neurons),)
+
+
+def _layer_key(layer: "LayerConfig") -> str:
+    return repr(tuple(getattr(layer, f.name) for f in fields(layer)))
+
+
+def _infer_layer(idx: int, layer: "LayerConfig", shape: Tuple[int, ...], kind: str) -> LayerInference:
+    ltype = layer.layer_type
+
+    def skip(message: str) -> LayerInference:
+        return LayerInference(idx, ltype, shape, shape, kind, errors=(message,))
+
+    def done(out_shape: Tuple[int, ...], weights: int = 0, biases: int = 0, flops: int = 0, **extra) -> LayerInference:
+        out_shape = tuple(int(v) for v in out_shape)
+        backward = flops * 3 if ltype == "conv2d" else flops * 2
+        return LayerInference(
+            idx,
+            ltype,
+            shape,
+            out_shape,
+            extra.pop("kind", _shape_kind(out_shape)),
+            weights=int(weights),
+            biases=int(biases),
+            flops_forward=int(flops),
+            flops_backward=int(backward),
+            architecture_units=extra.pop("units", _shape_size(out_shape)),
+            has_param_entry=True,
+            **extra,
+        )
+
+    if ltype in {"dense", "output"}:
+        errors: Tuple[str, ...] = ()
+        if kind != "vector":
+            errors = (f"Layer {idx} ({ltype}) requires vector input. Add Flatten first.",)
+        in_dim = shape[0] if shape else layer.neurons
+        out_dim = layer.neurons
+        weights = in_dim * out_dim
+        return done(
+            (out_dim,),
+            weights,
+            out_dim,
+            2 * weights + out_dim,
+            kind="vector",
+            activation=(layer.activation or "linear").lower(),
+            errors=errors,
+        )
+    if ltype == "conv2d":
+        if kind != "spatial":
+            return skip(f"Layer {idx} (conv2d) requires spatial input (C,H,W).")
+        c_in, h_in, w_in = shape
+        c_out = layer.filters or layer.neurons
+        k = layer.kernel_size or 3
+        stride = layer.stride or 1
+        pad = (k - 1) // 2 if (layer.padding or "valid").lower() == "same" else 0
+        h_out = (h_in + 2 * pad - k) // stride + 1
+        w_out = (w_in + 2 * pad - k) // stride + 1
+        return done(
+            (c_out, h_out, w_out),
+            c_out * c_in * k * k,
+            c_out,
+            2 * c_in * k * k * c_out * h_out * w_out,
+            activation=(layer.activation or "linear").lower(),
+        )
+    if ltype in {"maxpool2d", "avgpool2d"}:
+        if kind != "spatial":
+            return skip(f"Layer {idx} ({ltype}) requires spatial input (C,H,W).")
+        c_in, h_in, w_in = shape
+        k = layer.pool_size or layer.kernel_size or 2
+        stride = layer.pool_stride or layer.stride or k
+        h_out = (h_in - k) // stride + 1
+        w_out = (w_in - k) // stride + 1
+        return done((c_in, h_out, w_out), flops=c_in * h_out * w_out * k * k)
+    if ltype == "flatten":
+        if kind != "spatial":
+            return skip(f"Layer {idx} (flatten) requires spatial input.")
+        return done((_shape_size(shape),))
+    if ltype == "batchnorm":
+        if kind not in {"vector", "spatial"}:
+            return skip(f"Layer {idx} (batchnorm) requires vector or spatial input.")
+        features = shape[0]
+        return done(shape, features, features, 4 * features, kind=kind)
+    if ltype in {"rnn", "lstm", "gru"}:
+        if kind != "sequence":
+            return skip(f"Layer {idx} ({ltype}) requires sequence input (T,D).")
+        t_len, d_in = shape
+        hidden = layer.hidden_size or layer.neurons
+        gates = {"rnn": 1, "gru": 3, "lstm": 4}[ltype]
+        out_shape = (t_len, hidden) if layer.return_sequences else (hidden,)
+        return done(
+            out_shape,
+            gates * hidden * (d_in + hidden),
+            gates * hidden,
+            gates * t_len * hidden * (d_in + hidden),
+        )
+    if ltype == "embedding":
+        if kind not in {"sequence", "vector"}:
+            return skip(f"Layer {idx} (embedding) requires sequence input.")
+        vocab = layer.vocab_size or 50
+        emb = layer.embedding_dim or layer.neurons
+        return done((shape[0], emb), vocab * emb, 0, 0)
+    if ltype == "attention":
+        if kind != "sequence":
+            return skip(f"Layer {idx} (attention) requires sequence input.")
+        t_len, d_model = shape
+        return done(
+            shape,
+            4 * d_model * d_model,
+            0,
+            2 * t_len * d_model * d_model + 2 * t_len * t_len * d_model,
+        )
+    if ltype == "residual":
+        return done(shape, flops=_shape_size(shape), kind=kind)
+    return LayerInference(idx, ltype, shape, shape, kind)
+
+
+class ShapeInferenceEngine:
+    """Shape, parameter and FLOP inference memoized by layer-prefix hash.
+
+    Entry k is keyed on the hash of layers[0..k], so editing layer k reuses
+    every earlier entry and only re-infers layers k..n.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._memo: OrderedDict[str, LayerInference] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: str) -> LayerInference | None:
+        with self._lock:
+            info = self._memo.get(key)
+            if info is None:
+                self.misses += 1
+                return None
+            self._memo.move_to_end(key)
+            self.hits += 1
+            return info
+
+    def _store(self, key: str, info: LayerInference) -> None:
+        with self._lock:
+            self._memo[key] = info
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def infer(self, layers: List["LayerConfig"]) -> List[LayerInference]:
+        results: List[LayerInference] = []
+        prefix = hashlib.sha1()
+        for idx, layer in enumerate(layers):
+            prefix.update(_layer_key(layer).encode("utf-8"))
+            key = prefix.hexdigest()
+            info = self._lookup(key)
+            if info is None:
+                if idx == 0:
+                    shape = _input_shape(layer)
+                    info = LayerInference(0, layer.layer_type, shape, shape, _shape_kind(shape), architecture_units=layer.neurons)
+                else:
+                    prev = results[-1]
+                    info = _infer_layer(idx, layer, prev.output_shape, prev.output_kind)
+                self._store(key, info)
+            results.append(info)
+        return results
+
+    def output_shapes(self, layers: List["LayerConfig"]) -> List[Tuple[int, ...]]:
+        return [info.output_shape for info in self.infer(layers)]
+
+    def cost_table(self, layers: List["LayerConfig"]) -> List[Dict]:
+        return [info.cost_row() for info in self.infer(layers)[1:]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+
+shape_inference = ShapeInferenceEngine()
@@ -27,3 +27,13 @@ def compute_loss(y_true: np.ndarray, y_pred: np.ndarray, loss_fn: str) -> Tuple[
         return mse_loss(y_true, y_pred)
     return bce_loss(y_true, y_pred)
 
+
+
+def per_sample_loss(y_true: np.ndarray, y_pred: np.ndarray, loss_fn: str) -> np.ndarray:
+    """Row-wise compute_loss for (N, K) batches."""
+    key = (loss_fn or "bce").lower()
+    if key == "mse":
+        return np.mean(0.5 * (y_true - y_pred) ** 2, axis=1)
+    eps = 1e-8
+    y_pred = np.clip(y_pred, eps, 1.0 - eps)
+    return np.mean(-(y_true * np.log(y_pred) + (1 - y_true) * np.log(1 - y_pred)), axis=1)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass
 
 
 def get_lr(base_lr: float, epoch: int, scheduler: str | None, decay_rate: float | None, step_size: int | None) -> float:
@@ -18,3 +19,33 @@ def get_lr(base_lr: float, epoch: int, scheduler: str | None, decay_rate: float
         return 0.5 * base_lr * (1 + math.cos(math.pi * epoch / t))
     return base_lr
 
+
+@dataclass
+class ReduceLROnPlateau:
+    factor: float = 0.5
+    patience: int = 5
+    min_lr: float = 1e-6
+    mode: str = "min"
+    min_delta: float = 0.0
+    best: float | None = None
+    wait: int = 0
+    scale: float = 1.0
+
+    def step(self, value: float) -> bool:
+        """Record a monitored value; returns True when the LR was reduced."""
+        better = self.best is None or (
+            value < self.best - self.min_delta if self.mode == "min" else value > self.best + self.min_delta
+        )
+        if better:
+            self.best = value
+            self.wait = 0
+            return False
+        self.wait += 1
+        if self.wait < self.patience:
+            return False
+        self.wait = 0
+        self.scale *= self.factor
+        return True
+
+    def apply(self, lr: float) -> float:
+        return max(lr * self.scale, min(lr, self.min_lr))
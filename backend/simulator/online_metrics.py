@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+
+class OnlineEpochMetrics:
+    """Running loss/accuracy counters and per-neuron activity bitmaps for one epoch.
+
+    Fed from the training forward pass, so epoch metrics need no extra passes.
+    """
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.loss_sum = 0.0
+        self.correct = 0.0
+        self.active: List[np.ndarray] = []
+        self.act_sum: List[float] = []
+        self.act_sq_sum: List[float] = []
+        self.act_count: List[int] = []
+
+    def observe_sample(self, loss: float, correct: float) -> None:
+        self.samples += 1
+        self.loss_sum += float(loss)
+        self.correct += float(correct)
+
+    def observe_layer(self, layer: int, output: np.ndarray) -> None:
+        flat = output.reshape(-1)
+        while len(self.active) <= layer:
+            self.active.append(np.zeros(0, dtype=bool))
+            self.act_sum.append(0.0)
+            self.act_sq_sum.append(0.0)
+            self.act_count.append(0)
+        if self.active[layer].shape != flat.shape:
+            self.active[layer] = np.zeros(flat.shape, dtype=bool)
+        np.logical_or(self.active[layer], flat != 0, out=self.active[layer])
+        self.act_sum[layer] += float(flat.sum())
+        self.act_sq_sum[layer] += float(np.dot(flat, flat))
+        self.act_count[layer] += flat.size
+
+    def merge(self, other: "OnlineEpochMetrics") -> None:
+        self.samples += other.samples
+        self.loss_sum += other.loss_sum
+        self.correct += other.correct
+        for layer, active in enumerate(other.active):
+            while len(self.active) <= layer:
+                self.active.append(np.zeros(0, dtype=bool))
+                self.act_sum.append(0.0)
+                self.act_sq_sum.append(0.0)
+                self.act_count.append(0)
+            if self.active[layer].shape != active.shape:
+                self.active[layer] = active.copy()
+            else:
+                np.logical_or(self.active[layer], active, out=self.active[layer])
+            self.act_sum[layer] += other.act_sum[layer]
+            self.act_sq_sum[layer] += other.act_sq_sum[layer]
+            self.act_count[layer] += other.act_count[layer]
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.samples if self.samples else 0.0
+
+    @property
+    def loss(self) -> float:
+        return self.loss_sum / self.samples if self.samples else 0.0
+
+    def dead_counts(self) -> List[int]:
+        return [int(active.size - np.count_nonzero(active)) for active in self.active]
+
+    def activation_stats(self) -> List[Dict]:
+        stats = []
+        for layer, count in enumerate(self.act_count):
+            mean = self.act_sum[layer] / count if count else 0.0
+            var = self.act_sq_sum[layer] / count - mean * mean if count else 0.0
+            stats.append(
+                {
+                    "layer": layer,
+                    "mean": float(mean),
+                    "std": float(np.sqrt(max(var, 0.0))),
+                    "active_fraction": float(np.count_nonzero(self.active[layer]) / max(self.active[layer].size, 1)),
+                }
+            )
+        return stats
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple
 
 import numpy as np
@@ -13,6 +13,7 @@ class OptimizerState:
     v_w: List[np.ndarray]
     m_b: List[np.ndarray]
     v_b: List[np.ndarray]
+    last_update_norms: List[float] = field(default_factory=list)
 
 
 def _init_state(weights: List[np.ndarray], biases: List[np.ndarray]) -> OptimizerState:
@@ -25,6 +26,19 @@ def _init_state(weights: List[np.ndarray], biases: List[np.ndarray]) -> Optimize
     )
 
 
+def _step(
+    weights: List[np.ndarray],
+    biases: List[np.ndarray],
+    steps_w: List[np.ndarray],
+    steps_b: List[np.ndarray],
+    state: OptimizerState,
+) -> Tuple[List[np.ndarray], List[np.ndarray], OptimizerState]:
+    state.last_update_norms = [float(np.linalg.norm(s)) for s in steps_w]
+    new_w = [w - s for w, s in zip(weights, steps_w)]
+    new_b = [b - s for b, s in zip(biases, steps_b)]
+    return new_w, new_b, state
+
+
 def apply_update(
     weights: List[np.ndarray],
     biases: List[np.ndarray],
@@ -43,23 +57,23 @@ def apply_update(
         state = _init_state(weights, biases)
 
     if opt == "sgd":
-        new_w = [w - lr * gw for w, gw in zip(weights, grads_w)]
-        new_b = [b - lr * gb for b, gb in zip(biases, grads_b)]
-        return new_w, new_b, state
+        steps_w = [lr * gw for gw in grads_w]
+        steps_b = [lr * gb for gb in grads_b]
+        return _step(weights, biases, steps_w, steps_b, state)
 
     if opt in {"sgd_momentum", "momentum"}:
         state.m_w = [momentum * m + gw for m, gw in zip(state.m_w, grads_w)]
         state.m_b = [momentum * m + gb for m, gb in zip(state.m_b, grads_b)]
-        new_w = [w - lr * m for w, m in zip(weights, state.m_w)]
-        new_b = [b - lr * m for b, m in zip(biases, state.m_b)]
-        return new_w, new_b, state
+        steps_w = [lr * m for m in state.m_w]
+        steps_b = [lr * m for m in state.m_b]
+        return _step(weights, biases, steps_w, steps_b, state)
 
     if opt == "rmsprop":
         state.v_w = [beta2 * v + (1 - beta2) * (gw ** 2) for v, gw in zip(state.v_w, grads_w)]
         state.v_b = [beta2 * v + (1 - beta2) * (gb ** 2) for v, gb in zip(state.v_b, grads_b)]
-        new_w = [w - lr * gw / (np.sqrt(v) + eps) for w, gw, v in zip(weights, grads_w, state.v_w)]
-        new_b = [b - lr * gb / (np.sqrt(v) + eps) for b, gb, v in zip(biases, grads_b, state.v_b)]
-        return new_w, new_b, state
+        steps_w = [lr * gw / (np.sqrt(v) + eps) for gw, v in zip(grads_w, state.v_w)]
+        steps_b = [lr * gb / (np.sqrt(v) + eps) for gb, v in zip(grads_b, state.v_b)]
+        return _step(weights, biases, steps_w, steps_b, state)
 
     if opt == "adam":
         state.t += 1
@@ -73,9 +87,10 @@ def apply_update(
         m_b_hat = [m / (1 - beta1 ** state.t) for m in state.m_b]
         v_b_hat = [v / (1 - beta2 ** state.t) for v in state.v_b]
 
-        new_w = [w - lr * m / (np.sqrt(v) + eps) for w, m, v in zip(weights, m_w_hat, v_w_hat)]
-        new_b = [b - lr * m / (np.sqrt(v) + eps) for b, m, v in zip(biases, m_b_hat, v_b_hat)]
-        return new_w, new_b, state
+        steps_w = [lr * m / (np.sqrt(v) + eps) for m, v in zip(m_w_hat, v_w_hat)]
+        steps_b = [lr * m / (np.sqrt(v) + eps) for m, v in zip(m_b_hat, v_b_hat)]
+        return _step(weights, biases, steps_w, steps_b, state)
 
+    state.last_update_norms = [0.0] * len(weights)
     return weights, biases, state
 
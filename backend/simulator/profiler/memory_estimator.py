@@ -3,33 +3,30 @@ from __future__ import annotations
 from typing import Dict, List
 
 from ..graph_engine import NetworkGraph
-from .utils import infer_layer_shapes
+from ..layers import LayerConfig, shape_inference
 
 
-def estimate_memory(graph: NetworkGraph) -> Dict:
-    params = sum(w.size + b.size for w, b in zip(graph.weights, graph.biases))
-    params_bytes = params * 4
-
-    shapes = infer_layer_shapes(graph.layers)
-    activation_elems = 0
+def _activation_table(layers: List[LayerConfig]) -> List[Dict]:
     per_layer: List[Dict] = []
-    for idx, shape in enumerate(shapes[1:], start=1):
+    for info in shape_inference.infer(layers)[1:]:
         elems = 1
-        for dim in shape:
+        for dim in info.output_shape:
             elems *= dim
-        activation_elems += elems
         per_layer.append(
             {
-                "layer_index": idx,
+                "layer_index": info.index,
                 "activation_elements": int(elems),
                 "activation_bytes": int(elems * 4),
             }
         )
+    return per_layer
 
-    activations_bytes = activation_elems * 4
+
+def _memory_report(params: int, per_layer: List[Dict]) -> Dict:
+    params_bytes = params * 4
+    activations_bytes = sum(row["activation_bytes"] for row in per_layer)
     gradients_bytes = params_bytes
     optimizer_bytes = params_bytes * 2
-
     return {
         "params": int(params),
         "params_bytes": int(params_bytes),
@@ -38,3 +35,14 @@ def estimate_memory(graph: NetworkGraph) -> Dict:
         "optimizer_bytes": int(optimizer_bytes),
         "per_layer": per_layer,
     }
+
+
+def estimate_memory(graph: NetworkGraph) -> Dict:
+    params = sum(w.size + b.size for w, b in zip(graph.weights, graph.biases))
+    return _memory_report(params, _activation_table(graph.layers))
+
+
+def project_memory(layers: List[LayerConfig]) -> Dict:
+    """Same report as estimate_memory, projected from layer configs before a graph is built."""
+    params = sum(info.params for info in shape_inference.infer(layers))
+    return _memory_report(params, _activation_table(layers))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+STREAMS = ("init", "shuffle", "dropout", "augmentation", "evaluation")
+
+
+class SessionRNG:
+    """Independent `numpy.random.Generator` streams derived from one session seed.
+
+    Stream `i` is child `i` of `SeedSequence(seed)` (what `SeedSequence.spawn` would
+    return), built from its spawn key so the same seed always yields the same streams
+    no matter how many times or in which process they are derived. Consuming one stream
+    (e.g. more dropout) never shifts another (e.g. the shuffle order).
+    """
+
+    def __init__(self, seed: int | None = None, replica: int = 0) -> None:
+        root = np.random.SeedSequence(seed)
+        self.seed: int = int(root.entropy)
+        self.replica = replica
+        self._streams: Dict[str, np.random.Generator] = {}
+        for index, name in enumerate(STREAMS):
+            # Replicas (data-parallel ranks) get their own grandchildren of each stream.
+            key = (index,) if replica == 0 else (index, replica)
+            self._streams[name] = np.random.Generator(
+                np.random.PCG64(np.random.SeedSequence(self.seed, spawn_key=key))
+            )
+
+    @property
+    def init(self) -> np.random.Generator:
+        return self._streams["init"]
+
+    @property
+    def shuffle(self) -> np.random.Generator:
+        return self._streams["shuffle"]
+
+    @property
+    def dropout(self) -> np.random.Generator:
+        return self._streams["dropout"]
+
+    @property
+    def augmentation(self) -> np.random.Generator:
+        return self._streams["augmentation"]
+
+    @property
+    def evaluation(self) -> np.random.Generator:
+        return self._streams["evaluation"]
+
+    def for_replica(self, replica: int) -> "SessionRNG":
+        return SessionRNG(self.seed, replica)
+
+    def state(self) -> Dict:
+        return {name: gen.bit_generator.state for name, gen in self._streams.items()}
+
+    def set_state(self, state: Dict) -> None:
+        for name, value in state.items():
+            self._streams[name].bit_generator.state = value
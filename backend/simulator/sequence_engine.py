@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple
+import uuid
 
 import numpy as np
 
+import config
+
+from .execution_context import LayerState
 from .graph_engine import NetworkGraph
+from .layers.attention import KVCache
 from .visualization.rendering import render_gray
 
 
@@ -15,13 +21,23 @@ def _find_sequence_layer(graph: NetworkGraph) -> int:
     return -1
 
 
+def _lstm_gates(gates: Dict) -> Dict:
+    return {
+        "forget": {"values": gates["f"], "equation": "f_t = sigmoid(W_f · [h_{t-1}, x_t] + b_f)"},
+        "input": {"values": gates["i"], "equation": "i_t = sigmoid(W_i · [h_{t-1}, x_t] + b_i)"},
+        "output": {"values": gates["o"], "equation": "o_t = sigmoid(W_o · [h_{t-1}, x_t] + b_o)"},
+        "candidate": {"values": gates["g"], "equation": "c~_t = tanh(W_c · [h_{t-1}, x_t] + b_c)"},
+    }
+
+
 def sequence_step(graph: NetworkGraph, sequence: List[List[float]], timestep: int) -> Dict:
     seq = np.asarray(sequence, dtype=np.float32)
     layer_idx = _find_sequence_layer(graph)
     if layer_idx < 0:
         raise ValueError("No sequence layer found")
     layer = graph.layer_instances[layer_idx]
-    output = layer.forward(seq)
+    state = LayerState()
+    output = layer.forward(seq, state)
     t = int(timestep)
     if t < 0 or t >= seq.shape[0]:
         raise IndexError("timestep out of range")
@@ -29,25 +45,20 @@ def sequence_step(graph: NetworkGraph, sequence: List[List[float]], timestep: in
     result = {
         "timestep": t,
         "input_t": seq[t].tolist(),
-        "new_hidden": (layer.H[t] if hasattr(layer, "H") else output).tolist(),
-        "hidden_history": [{"t": i + 1, "h": layer.H[i].tolist()} for i in range(t + 1)]
-        if hasattr(layer, "H")
+        "new_hidden": (state.H[t] if state.H is not None else output).tolist(),
+        "hidden_history": [{"t": i + 1, "h": state.H[i].tolist()} for i in range(t + 1)]
+        if state.H is not None
         else [],
     }
 
     if graph.layers[layer_idx].layer_type == "lstm":
-        result["previous_hidden"] = layer.H[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
-        result["previous_cell"] = layer.C[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
-        result["new_cell"] = layer.C[t].tolist()
-        if layer.gates is not None:
-            result["gates"] = {
-                "forget": {"values": layer.gates["f"][t].tolist(), "equation": "f_t = sigmoid(W_f · [h_{t-1}, x_t] + b_f)"},
-                "input": {"values": layer.gates["i"][t].tolist(), "equation": "i_t = sigmoid(W_i · [h_{t-1}, x_t] + b_i)"},
-                "output": {"values": layer.gates["o"][t].tolist(), "equation": "o_t = sigmoid(W_o · [h_{t-1}, x_t] + b_o)"},
-                "candidate": {"values": layer.gates["g"][t].tolist(), "equation": "c~_t = tanh(W_c · [h_{t-1}, x_t] + b_c)"},
-            }
+        result["previous_hidden"] = state.H[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
+        result["previous_cell"] = state.C[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
+        result["new_cell"] = state.C[t].tolist()
+        if state.gates is not None:
+            result["gates"] = _lstm_gates({k: v[t].tolist() for k, v in state.gates.items()})
     else:
-        result["previous_hidden"] = layer.H[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
+        result["previous_hidden"] = state.H[t - 1].tolist() if t > 0 else [0.0] * layer.hidden_dim
 
     return result
 
@@ -58,19 +69,214 @@ def sequence_full(graph: NetworkGraph, sequence: List[List[float]]) -> Dict:
     if layer_idx < 0:
         raise ValueError("No sequence layer found")
     layer = graph.layer_instances[layer_idx]
-    output = layer.forward(seq)
+    state = LayerState()
+    output = layer.forward(seq, state)
     data = {
-        "all_hidden_states": layer.H.tolist() if hasattr(layer, "H") else [],
-        "all_cell_states": layer.C.tolist() if hasattr(layer, "C") else [],
-        "all_gate_values": layer.gates if hasattr(layer, "gates") else {},
+        "all_hidden_states": state.H.tolist() if state.H is not None else [],
+        "all_cell_states": state.C.tolist() if state.C is not None else [],
+        "all_gate_values": state.gates if state.gates is not None else {},
         "final_output": output.tolist() if hasattr(output, "tolist") else output,
     }
     # attention weights if present
     for idx in range(1, len(graph.layer_instances)):
         if graph.layers[idx].layer_type == "attention":
-            attn = graph.layer_instances[idx]
-            if attn.attn_weights is not None:
-                data["all_attention_weights"] = attn.attn_weights.tolist()
-                data["attention_heatmap_base64"] = render_gray(attn.attn_weights)
+            ctx = graph.new_context()
+            try:
+                graph.forward(seq, ctx)
+            except ValueError:
+                break
+            attn_weights = ctx.state(idx).attn_weights
+            if attn_weights is not None:
+                data["all_attention_weights"] = attn_weights.tolist()
+                data["attention_heatmap_base64"] = render_gray(attn_weights)
             break
     return data
+
+
+RECURRENT = {"rnn", "lstm", "gru"}
+# Layers whose state is carried between steps: recurrent carries and attention KV caches.
+STATEFUL = RECURRENT | {"attention"}
+# Layers that map one timestep's vector to one vector, so they can run per step.
+PER_STEP = {"input", "dense", "output", "residual"}
+
+
+class SequenceStepper:
+    """Advances a graph one timestep at a time, carrying every recurrent layer's state.
+
+    Each `step` costs one timestep of work however long the sequence already is (the full
+    forward in `sequence_step` re-runs every earlier timestep). Carried states are never
+    modified in place, so `save` only records references and `restore` branches from a
+    saved point without copying. Layers after a recurrent layer see its latest hidden
+    state, i.e. the model's output as if the sequence ended at the current timestep.
+
+    Attention layers decode incrementally against a key/value cache: the new position
+    attends to itself and every earlier one. Stepping is causal-only: rows already emitted
+    are never revised, whereas the full forward (and /sequence/full) lets every position
+    attend to later ones too. Only an attention layer's newest row matches the full forward
+    on the same prefix, so layers after it (e.g. a recurrent layer reading every position)
+    see different inputs and stepped outputs differ from the full-sequence ones. Caches grow
+    with the sequence until `evict` trims them, or automatically beyond
+    `SIMULATOR_ATTENTION_CACHE_LIMIT` positions.
+    """
+
+    max_saved = 64
+
+    def __init__(self, graph: NetworkGraph) -> None:
+        self.graph = graph
+        layers = [cfg.layer_type for cfg in graph.layers]
+        self.tokens = len(layers) > 1 and layers[1] == "embedding"
+        width = 1 if self.tokens else int((graph.input_shape or (1,))[-1])
+        self.input_width = width
+        for idx, (kind, layer) in enumerate(zip(layers, graph.layer_instances)):
+            if kind == "embedding" and idx == 1:
+                width = layer.embedding_dim
+            elif kind in RECURRENT:
+                if layer.input_dim != width:
+                    raise ValueError(f"Layer {idx} ({kind}) expects {layer.input_dim} features per step, got {width}")
+                width = layer.hidden_dim
+            elif kind == "attention":
+                if layer.d_model != width:
+                    raise ValueError(f"Layer {idx} ({kind}) expects {layer.d_model} features per step, got {width}")
+            elif kind in {"dense", "output"}:
+                if layer.in_dim != width:
+                    raise ValueError(f"Layer {idx} ({kind}) reads a whole sequence and cannot be stepped")
+                width = layer.out_dim
+            elif kind not in PER_STEP:
+                raise ValueError(f"Layer {idx} ({kind}) cannot be stepped one timestep at a time")
+        if not any(kind in STATEFUL for kind in layers):
+            raise ValueError("No sequence layer found")
+        self._saved: Dict[str, Tuple[int, Dict[int, Tuple], np.ndarray | None]] = OrderedDict()
+        self.reset()
+
+    def reset(self) -> None:
+        self.t = 0
+        self.carries: Dict[int, Tuple] = {
+            idx: layer.initial_state()
+            for idx, layer in enumerate(self.graph.layer_instances)
+            if self.graph.layers[idx].layer_type in STATEFUL
+        }
+        self.output: np.ndarray | None = None
+
+    def step(self, x_t) -> Dict:
+        """Feed one timestep (a feature vector, or a token id for embedding models)."""
+        x = np.asarray(x_t, dtype=np.float32).reshape(-1)
+        if x.size != self.input_width:
+            raise ValueError(f"Expected {self.input_width} value(s) per timestep, got {x.size}")
+        result: Dict = {"type": "step", "timestep": self.t, "input_t": x, "layers": []}
+        for idx, layer in enumerate(self.graph.layer_instances):
+            kind = self.graph.layers[idx].layer_type
+            if kind == "embedding":
+                token = int(x[0])
+                if not 0 <= token < layer.vocab_size:
+                    raise ValueError(f"Token {token} is outside the vocabulary")
+                result["token"] = token
+                x = layer.E[token]
+            elif kind == "attention":
+                x, cache, details = layer.step(x, self.carries[idx])
+                limit = config.SIMULATOR_ATTENTION_CACHE_LIMIT
+                self.carries[idx] = cache.trim(limit) if limit and cache.length > limit else cache
+                result["layers"].append(
+                    {"layer_index": idx, "layer_type": kind, "attention_weights": details["weights"], "cache_length": cache.length}
+                )
+            elif kind in RECURRENT:
+                previous = self.carries[idx]
+                x, carry, details = layer.step(x, previous)
+                self.carries[idx] = carry
+                result["layers"].append(self._describe(idx, kind, previous, carry, details))
+            else:
+                x = layer.forward(x, LayerState())
+        self.output = x
+        self.t += 1
+        result["output"] = x
+        return result
+
+    @staticmethod
+    def _describe(idx: int, kind: str, previous: Tuple, carry: Tuple, details: Dict) -> Dict:
+        record = {"layer_index": idx, "layer_type": kind, "previous_hidden": previous[0], "new_hidden": carry[0]}
+        if kind == "lstm":
+            record["previous_cell"] = previous[1]
+            record["new_cell"] = carry[1]
+            record["gates"] = _lstm_gates(details)
+        elif kind == "gru":
+            record["gates"] = details
+        return record
+
+    def cache_lengths(self) -> Dict[int, int]:
+        return {idx: carry.length for idx, carry in self.carries.items() if isinstance(carry, KVCache)}
+
+    def evict(self, keep_last: int | None = None) -> Dict[int, int]:
+        """Drop cached attention keys/values, keeping the newest `keep_last` positions if given.
+
+        Recurrent state is untouched; later steps attend only to what is left in the caches.
+        """
+        for idx, carry in self.carries.items():
+            if isinstance(carry, KVCache):
+                self.carries[idx] = carry.trim(keep_last or 0)
+        return self.cache_lengths()
+
+    def save(self) -> str:
+        state_id = uuid.uuid4().hex[:8]
+        self._saved[state_id] = (self.t, dict(self.carries), self.output)
+        while len(self._saved) > self.max_saved:
+            self._saved.popitem(last=False)
+        return state_id
+
+    def restore(self, state_id: str) -> None:
+        if state_id not in self._saved:
+            raise KeyError("Saved state not found")
+        self._saved.move_to_end(state_id)
+        self.t, carries, self.output = self._saved[state_id]
+        self.carries = dict(carries)
+
+    def _next_input(self, temperature: float, rng: np.random.Generator):
+        if self.output is None:
+            raise ValueError("Feed at least one timestep before generating")
+        if not self.tokens:
+            if self.output.size != self.input_width:
+                raise ValueError("Generation needs token input or an output as wide as the input")
+            return self.output
+        out = self.output.astype(np.float64)
+        if out.min() >= 0 and abs(out.sum() - 1.0) < 1e-3:
+            logits = np.log(np.maximum(out, 1e-12))
+        else:
+            logits = out
+        if temperature <= 0:
+            return int(np.argmax(logits))
+        logits = logits / temperature
+        probs = np.exp(logits - logits.max())
+        probs = probs[: self.graph.layer_instances[1].vocab_size]
+        return int(rng.choice(len(probs), p=probs / probs.sum()))
+
+    def generate(self, steps: int, temperature: float = 1.0, rng: np.random.Generator | None = None) -> Iterator[Dict]:
+        """Autoregressively feed each output back in as the next timestep (sampled token or vector)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        for _ in range(max(0, int(steps))):
+            yield self.step(self._next_input(temperature, rng))
+
+
+class SequenceSessions:
+    """Steppers kept between REST calls, least recently used evicted beyond the limit."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, SequenceStepper] = OrderedDict()
+
+    def create(self, graph: NetworkGraph) -> Tuple[str, SequenceStepper]:
+        stepper = SequenceStepper(graph)
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = stepper
+        while len(self._sessions) > config.SIMULATOR_SEQUENCE_SESSIONS:
+            self._sessions.popitem(last=False)
+        return session_id, stepper
+
+    def get(self, session_id: str) -> SequenceStepper:
+        if session_id not in self._sessions:
+            raise KeyError("Sequence session not found")
+        self._sessions.move_to_end(session_id)
+        return self._sessions[session_id]
+
+    def delete(self, session_id: str) -> None:
+        if self._sessions.pop(session_id, None) is None:
+            raise KeyError("Sequence session not found")
+
+
+sequence_sessions = SequenceSessions()
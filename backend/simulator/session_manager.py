@@ -1,29 +1,84 @@
 from __future__ import annotations
 
-import uuid
+from collections import OrderedDict
 from typing import Dict, List
+import uuid
 
+from .admission import memory_admission
+from .broadcast import broadcast_hub, training_topic
 from .graph_engine import NetworkGraph, build_graph
 from .layers import LayerConfig
+from .rng import SessionRNG
+from .snapshot_manager import snapshot_manager
+from .training_engine import training_sessions
 
 
 class SessionManager:
+    """Live graphs, each holding a memory reservation until it is deleted or evicted.
+
+    When a new graph does not fit the global budget, the least recently used graphs that are
+    not training are evicted to make room.
+    """
+
     def __init__(self) -> None:
-        self._graphs: Dict[str, NetworkGraph] = {}
+        self._graphs: Dict[str, NetworkGraph] = OrderedDict()
+        self._seeds: Dict[str, int] = {}
+
+    def _evict_idle(self, keep: str | None = None) -> bool:
+        for graph_id in self._graphs:
+            if graph_id != keep and not training_sessions.is_running(graph_id):
+                self.delete_graph(graph_id)
+                return True
+        return False
 
-    def create_graph(self, layers: List[LayerConfig]) -> str:
-        graph = build_graph(layers)
-        graph_id = str(uuid.uuid4())
+    def create_graph(self, layers: List[LayerConfig], graph_id: str | None = None, seed: int | None = None) -> str:
+        decision = memory_admission.evaluate(layers)
+        # Evicting only helps when the global budget, not the per-session one, is the limit.
+        while (
+            not decision.admitted
+            and decision.core_bytes <= memory_admission.session_budget
+            and self._evict_idle(keep=graph_id)
+        ):
+            decision = memory_admission.evaluate(layers)
+        if not decision.admitted:
+            raise ValueError("; ".join(decision.reasons))
+        rng = SessionRNG(seed)
+        graph = build_graph(layers, rng=rng.init)
+        graph_id = graph_id or str(uuid.uuid4())
+        memory_admission.reserve(graph_id, decision)
         self._graphs[graph_id] = graph
+        self._seeds[graph_id] = rng.seed
         return graph_id
 
     def get_graph(self, graph_id: str) -> NetworkGraph:
         if graph_id not in self._graphs:
             raise KeyError("Graph not found")
+        self._graphs.move_to_end(graph_id)
+        return self._graphs[graph_id]
+
+    def has_graph(self, graph_id: str) -> bool:
+        return graph_id in self._graphs
+
+    def seed(self, graph_id: str) -> int:
+        """The seed the graph was initialized from; training on it defaults to the same seed."""
+        if graph_id not in self._seeds:
+            raise KeyError("Graph not found")
+        return self._seeds[graph_id]
+
+    def ensure_graph(self, graph_id: str, layers: List[LayerConfig]) -> NetworkGraph:
+        """Return the live graph, rebuilding it under the same id (e.g. after a restart) if missing."""
+        if graph_id not in self._graphs:
+            self.create_graph(layers, graph_id)
         return self._graphs[graph_id]
 
     def delete_graph(self, graph_id: str) -> None:
-        self._graphs.pop(graph_id, None)
+        if self._graphs.pop(graph_id, None) is None:
+            raise KeyError("Graph not found")
+        training_sessions.discard(graph_id)
+        self._seeds.pop(graph_id, None)
+        memory_admission.release(graph_id)
+        snapshot_manager.clear(graph_id)
+        broadcast_hub.discard(training_topic(graph_id))
 
 
 session_manager = SessionManager()
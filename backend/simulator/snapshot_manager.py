@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
+import os
+import tempfile
+import threading
+import uuid
 
 import numpy as np
 
+import config
+from .boundary import BoundaryRaster
 from .graph_engine import NetworkGraph
 
 
@@ -14,37 +21,296 @@ class Snapshot:
     weights: List[np.ndarray]
     biases: List[np.ndarray]
     metrics: dict
-    boundary: List[List[float]] | None = None
+    boundary: BoundaryRaster | None = None
 
 
-class SnapshotManager:
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+class _Blob:
+    """One stored tensor: in memory (raw or zstd) or spilled to an .npy file read back via mmap."""
+
+    __slots__ = ("shape", "dtype", "data", "compressed", "path")
+
+    def __init__(self, array: np.ndarray, compress: bool) -> None:
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.path: str | None = None
+        codec = _zstd() if compress else None
+        self.compressed = codec is not None
+        self.data = codec.ZstdCompressor(level=3).compress(array.tobytes()) if codec else array
+
+    @property
+    def nbytes(self) -> int:
+        if self.data is None:
+            return 0
+        return len(self.data) if self.compressed else self.data.nbytes
+
+    def array(self) -> np.ndarray:
+        if self.path is not None:
+            return np.load(self.path, mmap_mode="r")
+        if self.compressed:
+            raw = _zstd().ZstdDecompressor().decompress(self.data)
+            return np.frombuffer(raw, dtype=self.dtype).reshape(self.shape)
+        return self.data
+
+    def spill(self, directory: str) -> None:
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.npy")
+        np.save(path, np.asarray(self.array()))
+        self.path = path
+        self.data = None
+        self.compressed = False
+
+    def discard(self) -> None:
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+@dataclass
+class SnapshotRecord:
+    """Metadata for one stored snapshot; parameters are decoded on demand."""
+
+    epoch: int
+    metrics: dict
+    # Filled in later by the boundary worker for 2-D datasets.
+    boundary: BoundaryRaster | None
+    keyframe: bool
+    # Per parameter layer: (weight blob, bias blob), full on keyframes, a delta otherwise; None if unchanged.
+    blobs: List[Tuple[_Blob, _Blob] | None] = field(default_factory=list, repr=False)
+    # Per parameter layer: whether it differs from the previous snapshot.
+    changes: List[bool] = field(default_factory=list, repr=False)
+
+
+class _Timeline:
     def __init__(self) -> None:
-        self._snapshots: Dict[str, List[Snapshot]] = {}
+        self.records: List[SnapshotRecord] = []
+        # Reconstructed parameters of the newest record; deltas are encoded against these
+        # (closed loop), so fp16 quantization error never accumulates along the chain.
+        self.tip: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.cursor: Tuple[int, Dict[int, Tuple[np.ndarray, np.ndarray]]] | None = None
+        self.applied: Tuple[int, List[Tuple[np.ndarray, np.ndarray]]] | None = None
 
-    def add_snapshot(self, graph_id: str, snapshot: Snapshot, max_snapshots: int = 200) -> None:
-        if graph_id not in self._snapshots:
-            self._snapshots[graph_id] = []
-        self._snapshots[graph_id].append(snapshot)
-        if len(self._snapshots[graph_id]) > max_snapshots:
-            self._snapshots[graph_id] = self._snapshots[graph_id][-max_snapshots:]
 
-    def list_snapshots(self, graph_id: str) -> List[Snapshot]:
-        return self._snapshots.get(graph_id, [])
+class SnapshotManager:
+    """Per-graph snapshot timelines stored as keyframes plus sparse per-layer deltas.
 
-    def get_snapshot(self, graph_id: str, index: int) -> Snapshot:
-        snaps = self._snapshots.get(graph_id, [])
-        if index < 0 or index >= len(snaps):
+    Older blobs spill to disk once resident snapshot memory exceeds the budget, and
+    restoring a snapshot only decodes and applies the layers that differ from what
+    the graph currently holds.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval: int = 10,
+        memory_budget: int = config.SIMULATOR_SNAPSHOT_MEMORY_BUDGET,
+        precision: str = config.SIMULATOR_SNAPSHOT_PRECISION,
+        compress: bool = config.SIMULATOR_SNAPSHOT_COMPRESSION == "zstd",
+        spill_dir: str | None = config.SIMULATOR_SNAPSHOT_DIR,
+    ) -> None:
+        self._timelines: Dict[str, _Timeline] = {}
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.memory_budget = memory_budget
+        self.delta_dtype = np.float16 if precision == "fp16" else np.float32
+        self.compress = compress
+        self._spill_root = spill_dir
+        self._spill_dir: str | None = None
+        self._resident: "OrderedDict[int, _Blob]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+
+    # -- storage -------------------------------------------------------------
+
+    def _store(self, array: np.ndarray) -> _Blob:
+        blob = _Blob(array, self.compress)
+        self._resident[id(blob)] = blob
+        self._resident_bytes += blob.nbytes
+        return blob
+
+    def _forget(self, blob: _Blob) -> None:
+        if self._resident.pop(id(blob), None) is not None:
+            self._resident_bytes -= blob.nbytes
+        blob.discard()
+
+    def _enforce_budget(self) -> None:
+        while self._resident_bytes > self.memory_budget and self._resident:
+            _, blob = self._resident.popitem(last=False)
+            self._resident_bytes -= blob.nbytes
+            if self._spill_dir is None:
+                root = self._spill_root or tempfile.gettempdir()
+                os.makedirs(root, exist_ok=True)
+                self._spill_dir = tempfile.mkdtemp(prefix="snapshots-", dir=root)
+            blob.spill(self._spill_dir)
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident_bytes
+
+    # -- encoding ------------------------------------------------------------
+
+    def _keyframe(self, params: List[Tuple[np.ndarray, np.ndarray]]) -> List[Tuple[_Blob, _Blob]]:
+        return [(self._store(np.array(w, dtype=np.float32)), self._store(np.array(b, dtype=np.float32))) for w, b in params]
+
+    def add_snapshot(self, graph_id: str, snapshot: Snapshot, max_snapshots: int = 200) -> SnapshotRecord:
+        params = [
+            (np.asarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32))
+            for w, b in zip(snapshot.weights, snapshot.biases)
+        ]
+        with self._lock:
+            timeline = self._timelines.setdefault(graph_id, _Timeline())
+            since_key = next(
+                (n for n, rec in enumerate(reversed(timeline.records)) if rec.keyframe), None
+            )
+            keyframe = (
+                since_key is None
+                or since_key + 1 >= self.keyframe_interval
+                or [w.shape for w, _ in timeline.tip] != [w.shape for w, _ in params]
+            )
+            record = SnapshotRecord(snapshot.epoch, snapshot.metrics, snapshot.boundary, keyframe)
+            if keyframe:
+                record.blobs = self._keyframe(params)
+                same_shapes = len(timeline.tip) == len(params)
+                record.changes = [
+                    not (same_shapes and np.array_equal(w, tw) and np.array_equal(b, tb))
+                    for (w, b), (tw, tb) in zip(params, timeline.tip if same_shapes else params)
+                ]
+                timeline.tip = [(w.copy(), b.copy()) for w, b in params]
+            else:
+                tip = []
+                for (w, b), (tw, tb) in zip(params, timeline.tip):
+                    dw = (w - tw).astype(self.delta_dtype)
+                    db = (b - tb).astype(self.delta_dtype)
+                    if not dw.any() and not db.any():
+                        record.blobs.append(None)
+                        tip.append((tw, tb))
+                        continue
+                    record.blobs.append((self._store(dw), self._store(db)))
+                    tip.append((tw + dw.astype(np.float32), tb + db.astype(np.float32)))
+                timeline.tip = tip
+                record.changes = [pair is not None for pair in record.blobs]
+            timeline.records.append(record)
+            while len(timeline.records) > max_snapshots:
+                self._drop_oldest(timeline)
+            self._enforce_budget()
+        return record
+
+    def _drop_oldest(self, timeline: _Timeline) -> None:
+        oldest = timeline.records[0]
+        if len(timeline.records) > 1 and not timeline.records[1].keyframe:
+            rebased = self._reconstruct(timeline, 1, range(len(oldest.blobs)))
+            successor = timeline.records[1]
+            for pair in successor.blobs:
+                if pair is not None:
+                    self._forget(pair[0])
+                    self._forget(pair[1])
+            successor.blobs = self._keyframe([rebased[s] for s in range(len(oldest.blobs))])
+            successor.keyframe = True
+        for pair in oldest.blobs:
+            if pair is not None:
+                self._forget(pair[0])
+                self._forget(pair[1])
+        timeline.records.pop(0)
+        timeline.cursor = None
+        timeline.applied = None
+
+    # -- decoding ------------------------------------------------------------
+
+    def _reconstruct(self, timeline: _Timeline, index: int, slots) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        records = timeline.records
+        key = index
+        while not records[key].keyframe:
+            key -= 1
+        start, values = key, {}
+        # Scrubbing forward within a keyframe segment continues from the last decode.
+        if timeline.cursor is not None and key <= timeline.cursor[0] <= index:
+            start, values = timeline.cursor[0], dict(timeline.cursor[1])
+        out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for slot in slots:
+            if slot in values:
+                w, b = values[slot]
+                first = start + 1
+            else:
+                kw, kb = records[key].blobs[slot]
+                w, b = np.array(kw.array(), dtype=np.float32), np.array(kb.array(), dtype=np.float32)
+                first = key + 1
+            for rec in records[first : index + 1]:
+                if rec.blobs[slot] is not None:
+                    dw, db = rec.blobs[slot]
+                    w = w + dw.array().astype(np.float32)
+                    b = b + db.array().astype(np.float32)
+            out[slot] = (w, b)
+        timeline.cursor = (index, out)
+        return out
+
+    def list_snapshots(self, graph_id: str) -> List[SnapshotRecord]:
+        timeline = self._timelines.get(graph_id)
+        return list(timeline.records) if timeline else []
+
+    def _timeline(self, graph_id: str, index: int) -> _Timeline:
+        timeline = self._timelines.get(graph_id)
+        if timeline is None or index < 0 or index >= len(timeline.records):
             raise IndexError("snapshot_index out of range")
-        return snaps[index]
+        return timeline
+
+    def get_snapshot(self, graph_id: str, index: int) -> Snapshot:
+        with self._lock:
+            timeline = self._timeline(graph_id, index)
+            record = timeline.records[index]
+            params = self._reconstruct(timeline, index, range(len(record.blobs)))
+        return Snapshot(
+            epoch=record.epoch,
+            weights=[params[s][0] for s in sorted(params)],
+            biases=[params[s][1] for s in sorted(params)],
+            metrics=record.metrics,
+            boundary=record.boundary,
+        )
+
+    def restore(self, graph_id: str, graph: NetworkGraph, index: int) -> Snapshot:
+        """Apply snapshot `index` to `graph`, decoding only layers that differ from its current state."""
+        with self._lock:
+            timeline = self._timeline(graph_id, index)
+            record = timeline.records[index]
+            slots = range(len(record.blobs))
+            stale = set(slots)
+            if timeline.applied is not None and len(graph.weights) == len(record.blobs):
+                applied_index, arrays = timeline.applied
+                lo, hi = sorted((applied_index, index))
+                for slot in slots:
+                    untouched = graph.weights[slot] is arrays[slot][0] and graph.biases[slot] is arrays[slot][1]
+                    if untouched and not any(rec.changes[slot] for rec in timeline.records[lo + 1 : hi + 1]):
+                        stale.discard(slot)
+            updates = self._reconstruct(timeline, index, sorted(stale)) if stale else {}
+            graph.update_params(updates)
+            timeline.applied = (index, list(zip(graph.weights, graph.biases)))
+        return Snapshot(
+            epoch=record.epoch,
+            weights=list(graph.weights),
+            biases=list(graph.biases),
+            metrics=record.metrics,
+            boundary=record.boundary,
+        )
 
     @staticmethod
     def apply_snapshot(graph: NetworkGraph, snapshot: Snapshot) -> None:
-        graph.weights = [w.copy() for w in snapshot.weights]
-        graph.biases = [b.copy() for b in snapshot.biases]
-        if graph.layer_instances:
-            for layer_idx, param_idx in graph.param_index_by_layer.items():
-                layer = graph.layer_instances[layer_idx]
-                layer.set_params(graph.weights[param_idx], graph.biases[param_idx])
+        graph.set_params([w.copy() for w in snapshot.weights], [b.copy() for b in snapshot.biases])
+
+    def clear(self, graph_id: str) -> None:
+        with self._lock:
+            timeline = self._timelines.pop(graph_id, None)
+            if timeline is None:
+                return
+            for record in timeline.records:
+                for pair in record.blobs:
+                    if pair is not None:
+                        self._forget(pair[0])
+                        self._forget(pair[1])
 
 
 snapshot_manager = SnapshotManager()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class EarlyStopping:
+    patience: int = 10
+    min_delta: float = 0.0
+    mode: str = "min"
+    best: float | None = None
+    best_epoch: int | None = None
+    wait: int = 0
+
+    def step(self, epoch: int, value: float) -> bool:
+        """Record a monitored value; returns True when it is a new best."""
+        better = self.best is None or (
+            value < self.best - self.min_delta if self.mode == "min" else value > self.best + self.min_delta
+        )
+        if better:
+            self.best = value
+            self.best_epoch = epoch
+            self.wait = 0
+            return True
+        self.wait += 1
+        return False
+
+    @property
+    def triggered(self) -> bool:
+        return self.wait >= self.patience
+
+
+@dataclass
+class TrainingBudget:
+    max_seconds: float | None = None
+    max_samples: int | None = None
+    max_flops: int | None = None
+
+    def exceeded(self, seconds: float, samples: int, flops: int) -> str | None:
+        if self.max_seconds is not None and seconds >= self.max_seconds:
+            return "time_budget"
+        if self.max_samples is not None and samples >= self.max_samples:
+            return "sample_budget"
+        if self.max_flops is not None and flops >= self.max_flops:
+            return "flop_budget"
+        return None
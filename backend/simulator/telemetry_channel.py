@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Sequence
+import asyncio
+import threading
+import time
+
+import config
+
+
+def _rate(requested: float | str | None) -> float:
+    """Clamp a client-requested rate (e.g. a query parameter) to (0, SIMULATOR_WS_MAX_RATE]."""
+    ceiling = config.SIMULATOR_WS_MAX_RATE
+    try:
+        value = float(requested) if requested is not None else ceiling
+    except (TypeError, ValueError):
+        return ceiling
+    return min(ceiling, value) if value > 0 else ceiling
+
+
+class _Window:
+    """Batch samples published since the last send: the latest message plus per-field min/max/mean."""
+
+    __slots__ = ("latest", "fields", "count", "mins", "maxs", "sums")
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self.latest: Dict = {}
+        self.count = 0
+        self.mins: Dict[str, float] = {}
+        self.maxs: Dict[str, float] = {}
+        self.sums: Dict[str, float] = {}
+
+    def add(self, message: Dict) -> None:
+        self.latest = message
+        self.count += 1
+        for name in self.fields:
+            value = message.get(name)
+            if value is None:
+                continue
+            value = float(value)
+            if name in self.sums:
+                self.mins[name] = min(self.mins[name], value)
+                self.maxs[name] = max(self.maxs[name], value)
+                self.sums[name] += value
+            else:
+                self.mins[name] = self.maxs[name] = self.sums[name] = value
+
+    def message(self) -> Dict:
+        return {
+            **self.latest,
+            "coalesced": self.count,
+            "window": {
+                name: {"min": self.mins[name], "max": self.maxs[name], "mean": self.sums[name] / self.count}
+                for name in self.sums
+            },
+        }
+
+
+class TelemetryChannel:
+    """Per-client outbound message queue with coalescing, rate limiting and drop-oldest backpressure.
+
+    Producers call `publish`/`publish_sample` from any thread and never block; a single
+    `pump` task owns the socket and sends at most `max_rate` messages per second. High-rate
+    samples of one type (e.g. per-batch metrics) collapse into one message per send window,
+    and discrete messages queue up to `max_queue`, beyond which the oldest are dropped.
+    """
+
+    def __init__(self, max_rate: float | str | None = None, max_queue: int | None = None) -> None:
+        self.max_rate = _rate(max_rate)
+        self._queue: Deque[Dict] = deque(maxlen=max(1, max_queue or config.SIMULATOR_WS_QUEUE_SIZE))
+        self._windows: Dict[str, _Window] = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._ready = asyncio.Event()
+        self._wake_scheduled = False
+        self._closed = False
+        # Token bucket: one second's worth of burst, refilled at max_rate.
+        self._tokens = self.max_rate
+        self._refilled = time.monotonic()
+        self.dropped = 0
+        self.sent = 0
+
+    # -- producers ---------------------------------------------------------------
+
+    def _wake(self) -> None:
+        # Caller holds the lock. At most one wake-up is in flight, however fast producers publish.
+        if self._wake_scheduled:
+            return
+        self._wake_scheduled = True
+        if threading.get_ident() == self._loop_thread:
+            self._ready.set()
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._ready.set)
+            except RuntimeError:
+                pass
+
+    def _enqueue(self, message: Dict) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(message)
+
+    def _flush_windows(self) -> None:
+        for window in self._windows.values():
+            self._enqueue(window.message())
+        self._windows.clear()
+
+    def publish(self, message: Dict) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            # Pending samples go first so the client sees events in production order.
+            self._flush_windows()
+            self._enqueue(message)
+            self._wake()
+
+    def publish_sample(self, message: Dict, fields: Sequence[str]) -> None:
+        """Coalesce `message` with earlier unsent samples of the same type."""
+        with self._lock:
+            if self._closed:
+                return
+            kind = message.get("type", "")
+            window = self._windows.get(kind)
+            if window is None:
+                window = self._windows[kind] = _Window(fields)
+            window.add(message)
+            self._wake()
+
+    def close(self) -> None:
+        """Stop accepting messages; `pump` returns once everything queued has been sent."""
+        with self._lock:
+            self._closed = True
+            self._wake()
+
+    # -- consumer ----------------------------------------------------------------
+
+    def _take(self) -> Dict | None:
+        with self._lock:
+            if not self._queue:
+                self._flush_windows()
+            return self._queue.popleft() if self._queue else None
+
+    def _pending(self) -> bool:
+        with self._lock:
+            self._wake_scheduled = False
+            return bool(self._queue or self._windows or self._closed)
+
+    async def _acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_rate, self._tokens + (now - self._refilled) * self.max_rate)
+        self._refilled = now
+        if self._tokens < 1.0:
+            await asyncio.sleep((1.0 - self._tokens) / self.max_rate)
+            self._tokens = 1.0
+            self._refilled = time.monotonic()
+        self._tokens -= 1.0
+
+    async def pump(self, send: Callable[[Dict], Awaitable[None]]) -> None:
+        while True:
+            while not self._pending():
+                self._ready.clear()
+                if self._pending():
+                    break
+                await self._ready.wait()
+            # Wait for a send slot before taking a message, so samples keep coalescing meanwhile.
+            await self._acquire()
+            message = self._take()
+            if message is None:
+                if self._closed:
+                    return
+                continue
+            if self.dropped and message.get("type") == "batch":
+                message["dropped"] = self.dropped
+            try:
+                await send(message)
+            except Exception:
+                # The socket is gone; the endpoint's receive loop handles the disconnect.
+                self.close()
+                return
+            self.sent += 1
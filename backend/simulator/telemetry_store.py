@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+class _Ring:
+    """Fixed-capacity ring of bucket rows laid out as [t0, t1, count, mean..., min..., max...]."""
+
+    def __init__(self, capacity: int, width: int) -> None:
+        self.data = np.zeros((capacity, width), dtype=np.float64)
+        self.start = 0
+        self.size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.data.shape[0]
+
+    def push(self, row: np.ndarray) -> np.ndarray | None:
+        """Append a row, returning the evicted oldest row when full."""
+        if self.size == self.capacity:
+            evicted = self.data[self.start].copy()
+            self.data[self.start] = row
+            self.start = (self.start + 1) % self.capacity
+            return evicted
+        self.data[(self.start + self.size) % self.capacity] = row
+        self.size += 1
+        return None
+
+    def rows(self) -> np.ndarray:
+        idx = (self.start + np.arange(self.size)) % self.capacity
+        return self.data[idx]
+
+    def replace(self, rows: np.ndarray) -> None:
+        self.start = 0
+        self.size = len(rows)
+        self.data[: self.size] = rows
+
+
+def _merge(rows: np.ndarray, channels: int, bounds: np.ndarray) -> np.ndarray:
+    """Combine consecutive rows into buckets starting at the row indices in `bounds`."""
+    c = channels
+    counts = rows[:, 2]
+    merged = np.empty((len(bounds), rows.shape[1]), dtype=np.float64)
+    merged[:, 0] = np.minimum.reduceat(rows[:, 0], bounds)
+    merged[:, 1] = np.maximum.reduceat(rows[:, 1], bounds)
+    merged[:, 2] = np.add.reduceat(counts, bounds)
+    weighted = np.add.reduceat(rows[:, 3 : 3 + c] * counts[:, None], bounds, axis=0)
+    merged[:, 3 : 3 + c] = weighted / np.maximum(merged[:, 2:3], 1.0)
+    merged[:, 3 + c : 3 + 2 * c] = np.minimum.reduceat(rows[:, 3 + c : 3 + 2 * c], bounds, axis=0)
+    merged[:, 3 + 2 * c :] = np.maximum.reduceat(rows[:, 3 + 2 * c :], bounds, axis=0)
+    return merged
+
+
+def _combine(a: np.ndarray, b: np.ndarray, channels: int) -> np.ndarray:
+    """Merge two bucket rows; the hot path of tier eviction."""
+    c = channels
+    row = np.empty_like(a)
+    row[0] = min(a[0], b[0])
+    row[1] = max(a[1], b[1])
+    row[2] = a[2] + b[2]
+    row[3 : 3 + c] = (a[3 : 3 + c] * a[2] + b[3 : 3 + c] * b[2]) / max(row[2], 1.0)
+    np.minimum(a[3 + c : 3 + 2 * c], b[3 + c : 3 + 2 * c], out=row[3 + c : 3 + 2 * c])
+    np.maximum(a[3 + 2 * c :], b[3 + 2 * c :], out=row[3 + 2 * c :])
+    return row
+
+
+class TelemetrySeries:
+    """Fixed-memory multi-channel time series.
+
+    The newest `recent` points are kept at full resolution. Older points fall into
+    progressively coarser min/max/mean tiers, each bucket covering `factor` buckets of
+    the tier below; the last tier halves its own resolution (and doubles the span of
+    new buckets) when full, so the whole run stays covered within the same footprint.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        recent: int = 1024,
+        tiers: int = 4,
+        tier_capacity: int = 256,
+        factor: int = 4,
+    ) -> None:
+        self.channels = channels
+        self.factor = max(2, factor)
+        width = 3 + 3 * channels
+        self._levels = [_Ring(recent, width)] + [_Ring(tier_capacity, width) for _ in range(max(1, tiers))]
+        # Partially filled bucket for each coarser tier: (merged row, rows merged so far).
+        self._pending: List[tuple[np.ndarray, int] | None] = [None for _ in self._levels]
+        self._factors = [self.factor] * len(self._levels)
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.data.nbytes for level in self._levels)
+
+    def append(self, t: float, values: Iterable[float]) -> None:
+        v = np.asarray(values, dtype=np.float64).reshape(-1)
+        if v.size != self.channels:
+            raise ValueError(f"Expected {self.channels} channels, got {v.size}")
+        row = np.empty(3 + 3 * self.channels)
+        row[:3] = (t, t, 1.0)
+        row[3:].reshape(3, -1)[:] = v
+        self.total += 1
+        self._push(0, row)
+
+    def extend(self, ts: Iterable[float], values: np.ndarray) -> None:
+        for t, v in zip(ts, np.asarray(values, dtype=np.float64).reshape(-1, self.channels)):
+            self.append(float(t), v)
+
+    def _push(self, level: int, row: np.ndarray) -> None:
+        ring = self._levels[level]
+        if level == len(self._levels) - 1 and ring.size == ring.capacity:
+            rows = ring.rows()
+            usable = len(rows) - len(rows) % 2
+            halved = _merge(rows[:usable], self.channels, np.arange(0, usable, 2))
+            ring.replace(np.concatenate([halved, rows[usable:]]))
+            self._factors[level] *= 2
+        evicted = ring.push(row)
+        if evicted is None:
+            return
+        pending = self._pending[level + 1]
+        if pending is not None:
+            evicted = _combine(pending[0], evicted, self.channels)
+        merged = 1 + (pending[1] if pending is not None else 0)
+        if merged >= self._factors[level + 1]:
+            self._pending[level + 1] = None
+            self._push(level + 1, evicted)
+        else:
+            self._pending[level + 1] = (evicted, merged)
+
+    def _rows(self) -> np.ndarray:
+        # Coarsest (oldest) first; pending rows sit between a tier and the finer one below it.
+        parts = []
+        for level in reversed(range(len(self._levels))):
+            parts.append(self._levels[level].rows())
+            if self._pending[level] is not None:
+                parts.append(self._pending[level][0][None, :])
+        return np.concatenate(parts) if parts else np.zeros((0, 3 + 3 * self.channels))
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        resolution: int | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """Return buckets overlapping [start, end], min/max-downsampled to at most `resolution`."""
+        rows = self._rows()
+        if start is not None:
+            rows = rows[rows[:, 1] >= start]
+        if end is not None:
+            rows = rows[rows[:, 0] <= end]
+        if resolution and len(rows) > resolution:
+            bounds = np.unique(np.linspace(0, len(rows), resolution, endpoint=False).astype(np.intp))
+            rows = _merge(rows, self.channels, bounds)
+        c = self.channels
+        return {
+            "t_start": rows[:, 0],
+            "t_end": rows[:, 1],
+            "count": rows[:, 2].astype(np.int64),
+            "mean": rows[:, 3 : 3 + c],
+            "min": rows[:, 3 + c : 3 + 2 * c],
+            "max": rows[:, 3 + 2 * c :],
+        }
+
+
+class TelemetryStore:
+    """Named telemetry series for one training session."""
+
+    def __init__(self, **series_options) -> None:
+        self._series: Dict[str, TelemetrySeries] = {}
+        self._options = series_options
+
+    def series(self, name: str) -> TelemetrySeries | None:
+        return self._series.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._series)
+
+    def append(self, name: str, t: float, values: Iterable[float]) -> None:
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        series = self._series.get(name)
+        if series is None or series.channels != values.size:
+            series = self._series[name] = TelemetrySeries(values.size, **self._options)
+        series.append(t, values)
+
+    def extend(self, name: str, ts: Iterable[float], values: np.ndarray) -> None:
+        for t, v in zip(ts, values):
+            self.append(name, float(t), v)
+
+    def query(
+        self,
+        name: str,
+        start: float | None = None,
+        end: float | None = None,
+        resolution: int | None = None,
+    ) -> Dict[str, np.ndarray]:
+        if name not in self._series:
+            raise KeyError(f"Telemetry series not found: {name}")
+        return self._series[name].query(start, end, resolution)
+
+    def since(self, name: str, t: float) -> Dict[str, np.ndarray] | None:
+        """Points of `name` newer than `t`, for shipping incremental telemetry between processes."""
+        series = self._series.get(name)
+        if series is None:
+            return None
+        window = series.query(start=t)
+        keep = window["t_start"] > t
+        return {key: value[keep] for key, value in window.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(series.nbytes for series in self._series.values())
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+import asyncio
+
+import numpy as np
+
+import config
+from .broadcast import Subscription, broadcast_hub
+from .dataset_manager import dataset_manager
+from .session_manager import session_manager
+from .training_engine import training_sessions
+from .wire import FrameEncoder
+
+Tensors = List[np.ndarray]
+
+
+def _sparse(current: np.ndarray, reference: np.ndarray, threshold: float) -> Dict | None:
+    """Indices (into the flattened tensor) and new values of entries that moved more than `threshold`."""
+    flat = current.reshape(-1)
+    index = np.flatnonzero(np.abs(flat - reference.reshape(-1)) > threshold)
+    if not len(index):
+        return None
+    values = flat[index]
+    reference.reshape(-1)[index] = values
+    return {"index": index.astype(np.int32), "value": values}
+
+
+class DeltaEncoder:
+    """Encodes successive (weights, biases, activations) states as keyframes plus sparse deltas.
+
+    The reference only moves where a delta was sent (closed loop), so what a client holds
+    never drifts more than `threshold` from the real model, however many deltas it applies.
+    """
+
+    def __init__(self, threshold: float, keyframe_interval: int) -> None:
+        self.threshold = threshold
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.seq = -1
+        self._since_keyframe = 0
+        self._reference: Tuple[Tensors, Tensors, Tensors] | None = None
+        self._header: Dict = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._reference is not None
+
+    def reset(self) -> None:
+        self._reference = None
+        self._since_keyframe = 0
+
+    def _shapes_changed(self, state: Tuple[Tensors, Tensors, Tensors]) -> bool:
+        return self._reference is None or any(
+            [a.shape for a in ref] != [a.shape for a in cur] for ref, cur in zip(self._reference, state)
+        )
+
+    def keyframe(self) -> Dict:
+        """The reference state as a keyframe at the current sequence number (for late joiners)."""
+        weights, biases, activations = self._reference
+        return {
+            "type": "keyframe",
+            "seq": self.seq,
+            **self._header,
+            "weights": weights,
+            "biases": biases,
+            "activations": activations,
+        }
+
+    def encode(self, state: Tuple[Tensors, Tensors, Tensors], header: Dict) -> Dict | None:
+        """Next message for `state`, or None when nothing moved past the threshold."""
+        self._header = header
+        if self._shapes_changed(state) or self._since_keyframe + 1 >= self.keyframe_interval:
+            self._reference = tuple([np.array(a, dtype=np.float32) for a in group] for group in state)
+            self._since_keyframe = 0
+            self.seq += 1
+            return self.keyframe()
+        changes: Dict[str, List[Dict]] = {}
+        for name, current, reference in zip(("weights", "biases", "activations"), state, self._reference):
+            entries = []
+            for slot, (cur, ref) in enumerate(zip(current, reference)):
+                delta = _sparse(np.asarray(cur, dtype=np.float32), ref, self.threshold)
+                if delta is not None:
+                    entries.append({"slot": slot, **delta})
+            if entries:
+                changes[name] = entries
+        if not changes:
+            return None
+        self._since_keyframe += 1
+        self.seq += 1
+        return {"type": "delta", "seq": self.seq, "base": self.seq - 1, **header, **changes}
+
+
+class TopologyStream:
+    """One producer per (graph, probe) that samples the live model into a broadcast topic.
+
+    Each tick runs at most one probe forward pass and one delta encode regardless of how many
+    clients watch, and ticks where the graph's parameters were not replaced are skipped
+    outright. Keyframes are the topic's sync points: late joiners and subscribers that fall
+    out of the ring start from the latest keyframe and replay the deltas after it.
+    """
+
+    def __init__(self, graph_id: str, dataset_id: str | None, threshold: float, keyframe_interval: int, interval: float) -> None:
+        self.graph_id = graph_id
+        self.dataset_id = dataset_id
+        self.interval = interval
+        self.encoder = DeltaEncoder(threshold, keyframe_interval)
+        self.topic = broadcast_hub.topic(f"topology/{graph_id}/{dataset_id or ''}")
+        self._task: asyncio.Task | None = None
+        # The parameter arrays last sampled; arrays are replaced, never mutated, so identity means unchanged.
+        self._seen: List[np.ndarray] = []
+        self._error: str | None = None
+
+    def _probe(self, graph) -> np.ndarray:
+        if self.dataset_id is not None:
+            test = dataset_manager.tensors(self.dataset_id, "test")
+            if len(test):
+                return test.X[0]
+        return np.zeros(graph.input_shape or (1,), dtype=np.float32)
+
+    def _sample(self) -> Dict | None:
+        graph = session_manager.get_graph(self.graph_id)
+        arrays = [*graph.weights, *graph.biases]
+        if len(arrays) == len(self._seen) and all(a is b for a, b in zip(arrays, self._seen)):
+            return None
+        ctx = graph.new_context()
+        graph.forward(self._probe(graph), ctx)
+        header = {"graph_id": self.graph_id}
+        try:
+            session = training_sessions.get(self.graph_id)
+        except KeyError:
+            session = None
+        if session is not None and session.history:
+            latest = session.history[-1]
+            header["epoch"] = latest.epoch
+            header["metrics"] = {
+                "train_loss": latest.train_loss,
+                "test_loss": latest.test_loss,
+                "train_accuracy": latest.train_accuracy,
+                "test_accuracy": latest.test_accuracy,
+            }
+        state = (list(graph.weights), list(graph.biases), [np.asarray(a) for a in ctx.activations])
+        message = self.encoder.encode(state, header)
+        self._seen = arrays
+        return message
+
+    async def _run(self) -> None:
+        while self.topic.subscribers:
+            try:
+                message = self._sample()
+                self._error = None
+            except KeyError:
+                message = None
+            except Exception as exc:
+                # e.g. a probe that does not fit the graph's input; retried every tick, reported once.
+                message = None
+                if str(exc) != self._error:
+                    self._error = str(exc)
+                    self.topic.publish({"type": "error", "graph_id": self.graph_id, "message": self._error})
+            if message is not None:
+                self.topic.publish(message, sync=message["type"] == "keyframe")
+            await asyncio.sleep(self.interval)
+        # Nobody is watching: free the reference copy; the next sample is a keyframe again.
+        self.encoder.reset()
+        self._seen = []
+        self._error = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.topic.subscribers)
+
+    def subscribe(self, encoder: FrameEncoder, resume: str | None = None) -> Subscription:
+        subscription = self.topic.subscribe(encoder, resume)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+
+class TopologyStreams:
+    def __init__(self) -> None:
+        self._streams: Dict[Tuple[str, str | None], TopologyStream] = {}
+
+    def get(self, graph_id: str, dataset_id: str | None = None) -> TopologyStream:
+        session_manager.get_graph(graph_id)
+        for key in [k for k, stream in self._streams.items() if not stream.active and not session_manager.has_graph(k[0])]:
+            broadcast_hub.discard(self._streams.pop(key).topic.key)
+        key = (graph_id, dataset_id)
+        if key not in self._streams:
+            self._streams[key] = TopologyStream(
+                graph_id,
+                dataset_id,
+                config.SIMULATOR_STREAM_THRESHOLD,
+                config.SIMULATOR_STREAM_KEYFRAME_INTERVAL,
+                config.SIMULATOR_STREAM_INTERVAL,
+            )
+        return self._streams[key]
+
+
+topology_streams = TopologyStreams()
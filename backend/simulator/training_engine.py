@@ -1,17 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Tuple
+import os
 import time
 
 import numpy as np
 
 from .activations import get_activation
+from .columnar_dataset import ColumnarDataset
+from .admission import memory_admission
+from .augmentation.batched import BatchAugmenter
+from .boundary import boundary_worker
+from .data_parallel import DataParallelPool
 from .dropout_engine import apply_dropout
+from .evaluation import EvaluationResult, EvaluationScheduler
+from .execution_context import ExecutionContext
 from .loss_functions import compute_loss
-from .lr_scheduler import get_lr
+from .online_metrics import OnlineEpochMetrics
+from .lr_scheduler import ReduceLROnPlateau, get_lr
 from .optimizer_engine import OptimizerState, apply_update
+from .rng import SessionRNG
 from .snapshot_manager import Snapshot, snapshot_manager
+from .stopping import EarlyStopping, TrainingBudget
+from .telemetry_store import TelemetryStore
 
 
 @dataclass
@@ -28,6 +41,27 @@ class TrainingConfig:
     lr_step_size: int | None = None
     shuffle: bool = True
     snapshot_interval: int = 5
+    sparse_input_threshold: float | None = None
+    record_history: bool = True
+    history_limit: int = 1000
+    workers: int = 1
+    eval_interval: int = 1
+    eval_subsample: float | None = None
+    eval_full_interval: int = 0
+    eval_async: bool = True
+    monitor: str = "test_loss"
+    early_stopping_patience: int | None = None
+    early_stopping_min_delta: float = 0.0
+    restore_best_weights: bool = True
+    plateau_patience: int = 5
+    plateau_factor: float = 0.5
+    min_lr: float = 1e-6
+    max_wall_time_s: float | None = None
+    max_samples: int | None = None
+    max_flops: int | None = None
+    checkpoint_interval: int = 1
+    seed: int | None = None
+    augmentation: List[Dict] | None = None
 
 
 @dataclass
@@ -44,24 +78,91 @@ class TrainingMetrics:
     dead_neurons: List[int]
     batch_losses: List[float]
     epoch_duration_ms: float
+    activation_stats: List[Dict] = field(default_factory=list)
+    test_epoch: int | None = None
 
 
 class TrainingEngine:
     def __init__(self, graph, config: TrainingConfig):
         self.graph = graph
         self.config = config
+        self.rng = SessionRNG(config.seed)
+        # Record the drawn seed so checkpoints and replicas reproduce an unseeded run too.
+        config.seed = self.rng.seed
         self.optimizer_state: OptimizerState | None = None
         self.epoch = 0
-        self.history: List[TrainingMetrics] = []
+        self.history: Deque[TrainingMetrics] = deque(maxlen=max(1, config.history_limit))
         self.is_running = False
-        self.is_paused = False
+        self._paused_at: float | None = None
+        self.paused_seconds = 0.0
         self.last_gradients: Dict[str, List[np.ndarray]] = {"dW": [], "db": []}
-        self.weight_history: List[Dict] = []
+        self.telemetry = TelemetryStore()
+        self.global_step = 0
+        self.last_weight_deltas: List[float] = []
+        self._parallel: DataParallelPool | None = None
+        self._epoch_metrics: OnlineEpochMetrics | None = None
+        self.evaluator = EvaluationScheduler()
+        self.stop_reason: str | None = None
+        self.samples_seen = 0
+        self.flops_spent = 0
+        self.train_seconds = 0.0
+        # Wall-clock budget: seconds elapsed in earlier runs (from a checkpoint) plus this one,
+        # not counting time spent paused.
+        self.wall_seconds_before = 0.0
+        self._started_at: float | None = None
+        mode = "max" if config.monitor.endswith("accuracy") else "min"
+        self.plateau = ReduceLROnPlateau(
+            factor=config.plateau_factor, patience=config.plateau_patience, min_lr=config.min_lr, mode=mode
+        )
+        self.early_stopping = (
+            EarlyStopping(config.early_stopping_patience, config.early_stopping_min_delta, mode)
+            if config.early_stopping_patience is not None
+            else None
+        )
+        self.budget = TrainingBudget(config.max_wall_time_s, config.max_samples, config.max_flops)
+        self._best_params: Tuple[List[np.ndarray], List[np.ndarray]] | None = None
+        self._epoch_params: Dict[int, Tuple[List[np.ndarray], List[np.ndarray]]] = {}
+        self._unreported: List[EvaluationResult] = []
+        # Test split of the latest epoch and whether it got a full evaluation, for `finish`.
+        self._test_data: ColumnarDataset | None = None
+        self._full_evaluated = False
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused_at is not None
+
+    @is_paused.setter
+    def is_paused(self, paused: bool) -> None:
+        now = time.monotonic()
+        if paused and self._paused_at is None:
+            self._paused_at = now
+        elif not paused and self._paused_at is not None:
+            self.paused_seconds += now - self._paused_at
+            self._paused_at = None
+
+    def wall_seconds(self) -> float:
+        """Wall-clock seconds since the run started (including evaluation and callbacks, excluding pauses)."""
+        if self._started_at is None:
+            return self.wall_seconds_before
+        now = time.monotonic()
+        paused = self.paused_seconds + (now - self._paused_at if self._paused_at is not None else 0.0)
+        return self.wall_seconds_before + max(0.0, now - self._started_at - paused)
 
     def _uses_layer_instances(self) -> bool:
         return bool(self.graph.layer_instances)
 
-    def _forward(self, x: np.ndarray, training: bool) -> Tuple[List[np.ndarray], List[np.ndarray], List[np.ndarray]]:
+    def _configure_sparse_kernels(self) -> None:
+        for layer in self.graph.layer_instances:
+            if getattr(layer, "relu_input", False):
+                layer.sparse_threshold = self.config.sparse_input_threshold
+
+    def _forward(
+        self,
+        x: np.ndarray,
+        training: bool,
+        ctx: ExecutionContext | None = None,
+        observe: OnlineEpochMetrics | None = None,
+    ) -> Tuple[List[np.ndarray], List[np.ndarray], List[np.ndarray]]:
         if not self._uses_layer_instances():
             activations = [x]
             pre_acts = []
@@ -73,25 +174,32 @@ class TrainingEngine:
                 pre_acts.append(z)
                 act_name = (self.graph.layers[idx + 1].activation or "linear").lower()
                 a = get_activation(act_name).forward(z)
+                if observe is not None:
+                    observe.observe_layer(idx, a)
                 if training and self.config.dropout_rate > 0.0 and idx < len(self.graph.weights) - 1:
-                    a, mask = apply_dropout(a, self.config.dropout_rate)
+                    a, mask = apply_dropout(a, self.config.dropout_rate, self.rng.dropout)
                 else:
                     mask = np.ones_like(a)
                 masks.append(mask)
                 activations.append(a)
             return activations, pre_acts, masks
 
+        if ctx is None:
+            ctx = self.graph.new_context()
         activations = [x]
         pre_acts = []
         masks = []
         current = x
         for idx in range(1, len(self.graph.layer_instances)):
             layer = self.graph.layer_instances[idx]
-            current = layer.forward(current)
-            if hasattr(layer, "Z") and getattr(layer, "Z") is not None:
-                pre_acts.append(layer.Z)
+            state = ctx.state(idx)
+            current = layer.forward(current, state)
+            if state.Z is not None:
+                pre_acts.append(state.Z)
+            if observe is not None:
+                observe.observe_layer(idx - 1, current)
             if training and self.config.dropout_rate > 0.0 and idx < len(self.graph.layer_instances) - 1:
-                current, mask = apply_dropout(current, self.config.dropout_rate)
+                current, mask = apply_dropout(current, self.config.dropout_rate, self.rng.dropout)
             else:
                 mask = np.ones_like(current)
             masks.append(mask)
@@ -104,6 +212,7 @@ class TrainingEngine:
         pre_acts: List[np.ndarray],
         masks: List[np.ndarray],
         y: np.ndarray,
+        ctx: ExecutionContext | None = None,
     ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
         if not self._uses_layer_instances():
             num_layers = len(self.graph.weights)
@@ -139,10 +248,11 @@ class TrainingEngine:
         grads_by_layer: Dict[int, Dict[str, np.ndarray]] = {}
         y_hat = activations[-1].reshape(-1)
         last_layer = self.graph.layer_instances[-1]
+        last_state = ctx.state(len(self.graph.layer_instances) - 1)
         if hasattr(last_layer, "activation_name"):
             act = get_activation(last_layer.activation_name)
-            if self.config.loss_function == "mse" and hasattr(last_layer, "Z") and last_layer.Z is not None:
-                d_out = (y_hat - y) * act.derivative(last_layer.Z)
+            if self.config.loss_function == "mse" and last_state.Z is not None:
+                d_out = (y_hat - y) * act.derivative(last_state.Z)
             else:
                 d_out = y_hat - y
         else:
@@ -153,9 +263,10 @@ class TrainingEngine:
                 keep_prob = 1.0 - self.config.dropout_rate
                 d_out = d_out * masks[idx - 1] / keep_prob
             layer = self.graph.layer_instances[idx]
-            d_out = layer.backward(d_out)
+            state = ctx.state(idx)
+            d_out = layer.backward(d_out, state)
             if getattr(layer, "has_params", False):
-                dw, db = layer.grads()
+                dw, db = layer.grads(state)
                 if dw is not None and self.config.l2_lambda > 0.0:
                     dw = dw + self.config.l2_lambda * layer.params()[0]
                 grads_by_layer[idx] = {"dW": dw, "db": db}
@@ -178,53 +289,83 @@ class TrainingEngine:
         true = int(np.argmax(y_true))
         return float(pred == true)
 
-    def train_batch(self, batch: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[float, float, float]:
+    def accumulate_gradients(
+        self, xb: np.ndarray, yb: np.ndarray
+    ) -> Tuple[List[np.ndarray], List[np.ndarray], float, float]:
         batch_loss = 0.0
         batch_acc = 0.0
         grads_w_sum = [np.zeros_like(w) for w in self.graph.weights]
         grads_b_sum = [np.zeros_like(b) for b in self.graph.biases]
 
-        for x, y in batch:
-            activations, pre_acts, masks = self._forward(x, training=True)
+        for x, y in zip(xb, yb):
+            ctx = self.graph.new_context() if self._uses_layer_instances() else None
+            activations, pre_acts, masks = self._forward(x, training=True, ctx=ctx, observe=self._epoch_metrics)
             y_hat = activations[-1].reshape(-1)
             loss, _ = compute_loss(y, y_hat, self.config.loss_function)
-            grads_w, grads_b = self._backward(activations, pre_acts, masks, y)
+            grads_w, grads_b = self._backward(activations, pre_acts, masks, y, ctx)
             grads_w_sum = [a + b for a, b in zip(grads_w_sum, grads_w)]
             grads_b_sum = [a + b for a, b in zip(grads_b_sum, grads_b)]
+            correct = self._accuracy(y, y_hat)
+            if self._epoch_metrics is not None:
+                self._epoch_metrics.observe_sample(loss, correct)
             batch_loss += loss
-            batch_acc += self._accuracy(y, y_hat)
+            batch_acc += correct
+        return grads_w_sum, grads_b_sum, batch_loss, batch_acc
+
+    def _parallel_pool(self):
+        workers = min(self.config.workers, os.cpu_count() or 1)
+        if workers <= 1:
+            self.close_parallel()
+            return None
+        if self._parallel is None or self._parallel.workers != workers:
+            self.close_parallel()
+            self._parallel = DataParallelPool(self.graph, self.config, workers)
+        return self._parallel
+
+    def close_parallel(self) -> None:
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+
+    def current_lr(self) -> float:
+        lr = get_lr(self.config.learning_rate, self.epoch, self.config.lr_scheduler, self.config.lr_decay_rate, self.config.lr_step_size)
+        return self.plateau.apply(lr) if (self.config.lr_scheduler or "").lower() == "plateau" else lr
+
+    def train_batch(self, xb: np.ndarray, yb: np.ndarray) -> Tuple[float, float, float]:
+        started = time.time()
+        pool = self._parallel_pool()
+        if pool is not None:
+            grads_w_sum, grads_b_sum, batch_loss, batch_acc = pool.accumulate_gradients(self, xb, yb)
+        else:
+            grads_w_sum, grads_b_sum, batch_loss, batch_acc = self.accumulate_gradients(xb, yb)
 
-        batch_size = max(1, len(batch))
+        batch_size = max(1, len(xb))
         grads_w_avg = [g / batch_size for g in grads_w_sum]
         grads_b_avg = [g / batch_size for g in grads_b_sum]
 
-        lr = get_lr(self.config.learning_rate, self.epoch, self.config.lr_scheduler, self.config.lr_decay_rate, self.config.lr_step_size)
-        old_weights = [w.copy() for w in self.graph.weights]
+        lr = self.current_lr()
         new_w, new_b, self.optimizer_state = apply_update(
             self.graph.weights, self.graph.biases, grads_w_avg, grads_b_avg, lr, self.config.optimizer, self.optimizer_state
         )
-        self.graph.weights = new_w
-        self.graph.biases = new_b
-        if self._uses_layer_instances():
-            for layer_idx, param_idx in self.graph.param_index_by_layer.items():
-                layer = self.graph.layer_instances[layer_idx]
-                layer.set_params(self.graph.weights[param_idx], self.graph.biases[param_idx])
-        weight_deltas = [float(np.linalg.norm(n - o)) for n, o in zip(new_w, old_weights)]
+        self.graph.set_params(new_w, new_b)
+        weight_deltas = list(self.optimizer_state.last_update_norms)
 
         self.last_gradients = {"dW": grads_w_avg, "db": grads_b_avg}
         grad_norm = float(np.linalg.norm(np.concatenate([g.flatten() for g in grads_w_avg]))) if grads_w_avg else 0.0
 
-        self.weight_history.append(
-            {
-                "epoch": self.epoch,
-                "weight_norms": [float(np.linalg.norm(w)) for w in self.graph.weights],
-                "weight_deltas": weight_deltas,
-            }
-        )
+        self.last_weight_deltas = weight_deltas
+        if self.config.record_history:
+            weight_norms = [float(np.linalg.norm(w)) for w in self.graph.weights]
+            self.telemetry.append("weights", self.global_step, [self.epoch, *weight_norms, *weight_deltas])
+        self.global_step += 1
 
+        self.samples_seen += len(xb)
+        # Backward costs roughly twice the forward pass.
+        self.flops_spent += 3 * len(xb) * int(getattr(self.graph, "flops_per_sample", 0) or 0)
+        self.train_seconds += time.time() - started
         return batch_loss / batch_size, batch_acc / batch_size, grad_norm
 
-    def compute_test_metrics(self, data: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[float, float]:
+    def compute_test_metrics(self, data: Iterable[Tuple[np.ndarray, np.ndarray]]) -> Tuple[float, float]:
         losses = []
         accs = []
         for x, y in data:
@@ -239,35 +380,64 @@ class TrainingEngine:
 
     def train_epoch(
         self,
-        train_data: List[Tuple[np.ndarray, np.ndarray]],
-        test_data: List[Tuple[np.ndarray, np.ndarray]],
-        graph_id: str,
+        train_data: ColumnarDataset | List[Tuple[np.ndarray, np.ndarray]],
+        test_data: ColumnarDataset | List[Tuple[np.ndarray, np.ndarray]],
+        graph_id: str | None,
         batch_callback=None,
+        batch_gate=None,
     ) -> TrainingMetrics:
         start = time.time()
-        if self.config.shuffle:
-            np.random.shuffle(train_data)
-        batch_size = self.config.batch_size if self.config.batch_size > 0 else len(train_data)
-        batches = [train_data[i : i + batch_size] for i in range(0, len(train_data), batch_size)]
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+            # Pauses before the first epoch are not part of the run.
+            self.paused_seconds = 0.0
+            if self._paused_at is not None:
+                self._paused_at = self._started_at
+        self._configure_sparse_kernels()
+        train_data = ColumnarDataset.coerce(train_data)
+        test_data = ColumnarDataset.coerce(test_data)
+        total_batches = train_data.num_batches(self.config.batch_size)
+        online = self._epoch_metrics = OnlineEpochMetrics()
 
         batch_losses: List[float] = []
         grad_norms = []
-        for bi, batch in enumerate(batches):
-            loss, acc, grad_norm = self.train_batch(batch)
+        transform = None
+        if self.config.augmentation:
+            augmenter = BatchAugmenter(self.config.augmentation, self.graph.input_shape)
+
+            def transform(xb: np.ndarray) -> np.ndarray:
+                return augmenter(xb, self.rng.augmentation)
+
+        batches = train_data.batches(
+            self.config.batch_size, shuffle=self.config.shuffle, rng=self.rng.shuffle, transform=transform
+        )
+        for bi, (xb, yb) in enumerate(batches):
+            if batch_gate:
+                batch_gate()
+            loss, acc, grad_norm = self.train_batch(xb, yb)
             batch_losses.append(loss)
             grad_norms.append(grad_norm)
             if batch_callback:
-                batch_callback(bi, len(batches), loss, acc, grad_norm)
+                batch_callback(bi, total_batches, loss, acc, grad_norm)
+            reason = self.budget.exceeded(self.wall_seconds(), self.samples_seen, self.flops_spent)
+            if reason:
+                self.stop_reason = self.stop_reason or reason
+                break
 
+        self._epoch_metrics = None
         train_loss = float(np.mean(batch_losses)) if batch_losses else 0.0
-        train_acc = float(np.mean([self._accuracy(y, self._forward(x, training=False)[0][-1].reshape(-1)) for x, y in train_data])) if train_data else 0.0
-        test_loss, test_acc = self.compute_test_metrics(test_data)
-
-        lr = get_lr(self.config.learning_rate, self.epoch, self.config.lr_scheduler, self.config.lr_decay_rate, self.config.lr_step_size)
+        train_acc = online.accuracy
+        run_eval, full_eval = EvaluationScheduler.plan(self.epoch, self.config)
+        if run_eval:
+            self.evaluator.submit(self.graph, test_data, self.config, self.epoch, full_eval, self.rng.evaluation)
+        self._test_data, self._full_evaluated = test_data, run_eval and full_eval
+        latest = self.evaluator.latest
+        test_loss, test_acc = (latest.test_loss, latest.test_accuracy) if latest else (0.0, 0.0)
+
+        lr = self.current_lr()
         weight_norms = [float(np.linalg.norm(w)) for w in self.graph.weights]
-        weight_deltas = self.weight_history[-1]["weight_deltas"] if self.weight_history else [0.0] * len(weight_norms)
-        dead_neurons = [int(np.sum(self._forward(x, training=False)[0][i + 1] == 0.0)) for i in range(len(self.graph.weights)) for x, _ in train_data[:1]]
-        dead_neurons = dead_neurons[: len(self.graph.weights)]
+        weight_deltas = self.last_weight_deltas or [0.0] * len(weight_norms)
+        dead_neurons = online.dead_counts()
 
         metrics = TrainingMetrics(
             epoch=self.epoch,
@@ -282,32 +452,164 @@ class TrainingEngine:
             dead_neurons=dead_neurons,
             batch_losses=batch_losses,
             epoch_duration_ms=(time.time() - start) * 1000.0,
+            activation_stats=online.activation_stats(),
+            test_epoch=latest.epoch if latest else None,
         )
-        self.history.append(metrics)
+        self._record_epoch(graph_id, metrics)
+        # Parameter arrays are replaced, never mutated, so holding references is a free snapshot.
+        params = (list(self.graph.weights), list(self.graph.biases))
+        if self.config.monitor.startswith("train_"):
+            self._observe_monitor(self.epoch, getattr(metrics, self.config.monitor), params)
+        elif run_eval and self._monitoring:
+            self._epoch_params[self.epoch] = params
+        self._absorb_completed()
 
-        if self.config.snapshot_interval and (self.epoch % self.config.snapshot_interval == 0 or self.epoch == 0):
-            snapshot_manager.add_snapshot(
+        self.epoch += 1
+        return metrics
+
+    @property
+    def _monitoring(self) -> bool:
+        return self.early_stopping is not None or (self.config.lr_scheduler or "").lower() == "plateau"
+
+    def _observe_monitor(self, epoch: int, value: float, params) -> None:
+        if not self._monitoring:
+            return
+        if (self.config.lr_scheduler or "").lower() == "plateau":
+            self.plateau.step(value)
+        if self.early_stopping is None:
+            return
+        if self.early_stopping.step(epoch, value):
+            self._best_params = params
+        elif self.early_stopping.triggered:
+            self.stop_reason = self.stop_reason or "early_stopping"
+
+    def finish(self) -> None:
+        """Settle pending evaluations and restore the best weights if training stopped early.
+
+        A run stopped early (early stopping or budget) never reaches the scheduled final
+        full evaluation, so its last epoch is evaluated in full here. Results stay queued
+        for `collect_evaluations`.
+        """
+        if self.stop_reason and self._test_data is not None and not self._full_evaluated:
+            self.evaluator.submit(self.graph, self._test_data, self.config, self.epoch - 1, True, self.rng.evaluation)
+            self._full_evaluated = True
+        self.evaluator.wait()
+        self._absorb_completed()
+        self._epoch_params.clear()
+        if self.stop_reason == "early_stopping" and self.config.restore_best_weights and self._best_params:
+            self.graph.set_params(*self._best_params)
+
+    def absorb_evaluation(self, result: EvaluationResult) -> None:
+        for metrics in reversed(self.history):
+            if metrics.epoch == result.epoch:
+                metrics.test_loss = result.test_loss
+                metrics.test_accuracy = result.test_accuracy
+                metrics.test_epoch = result.epoch
+                break
+        self.telemetry.append("evaluation", result.epoch, [result.test_loss, result.test_accuracy])
+        params = self._epoch_params.pop(result.epoch, None)
+        for epoch in [e for e in self._epoch_params if e < result.epoch]:
+            del self._epoch_params[epoch]
+        if params is not None and self.config.monitor.startswith("test_"):
+            self._observe_monitor(result.epoch, getattr(result, self.config.monitor), params)
+
+    def _absorb_completed(self) -> None:
+        for result in self.evaluator.collect():
+            self.absorb_evaluation(result)
+            self._unreported.append(result)
+
+    def collect_evaluations(self, wait: bool = False) -> List[EvaluationResult]:
+        if wait:
+            self.evaluator.wait()
+        self._absorb_completed()
+        results, self._unreported = self._unreported, []
+        return results
+
+    def close(self) -> None:
+        self.close_parallel()
+        self.evaluator.close()
+
+    def _record_epoch(self, graph_id: str | None, metrics: TrainingMetrics) -> None:
+        self.history.append(metrics)
+        self.telemetry.append("epochs", metrics.epoch, [metrics.train_loss, metrics.train_accuracy, metrics.learning_rate])
+        self._record_snapshot(graph_id, metrics)
+
+    def weight_telemetry(
+        self, start: float | None = None, end: float | None = None, resolution: int | None = None
+    ) -> Dict:
+        """Per-layer weight norm/delta history, bucketed to at most `resolution` points."""
+        series = self.telemetry.series("weights")
+        if series is None:
+            return {"steps": [], "epochs": [], "per_layer": []}
+        window = series.query(start, end, resolution)
+        layers = (series.channels - 1) // 2
+        per_layer = []
+        for li in range(layers):
+            norm, delta = 1 + li, 1 + layers + li
+            per_layer.append(
+                {
+                    "layer": li,
+                    "norms": window["mean"][:, norm].tolist(),
+                    "norms_min": window["min"][:, norm].tolist(),
+                    "norms_max": window["max"][:, norm].tolist(),
+                    "means": [],
+                    "stds": [],
+                    "deltas": window["mean"][:, delta].tolist(),
+                    "deltas_max": window["max"][:, delta].tolist(),
+                }
+            )
+        return {
+            "steps": window["t_start"].astype(int).tolist(),
+            "epochs": window["min"][:, 0].astype(int).tolist(),
+            "counts": window["count"].tolist(),
+            "per_layer": per_layer,
+        }
+
+    def _record_snapshot(self, graph_id: str | None, metrics: TrainingMetrics) -> None:
+        if graph_id is None or not self.config.record_history or not self.config.snapshot_interval:
+            return
+        if metrics.epoch % self.config.snapshot_interval == 0 or metrics.epoch == 0:
+            weights, biases = list(self.graph.weights), list(self.graph.biases)
+            record = snapshot_manager.add_snapshot(
                 graph_id,
-                Snapshot(
-                    epoch=self.epoch,
-                    weights=[w.copy() for w in self.graph.weights],
-                    biases=[b.copy() for b in self.graph.biases],
-                    metrics=metrics.__dict__,
-                ),
+                Snapshot(epoch=metrics.epoch, weights=weights, biases=biases, metrics=metrics.__dict__),
             )
+            boundary_worker.submit(graph_id, self.graph, record, weights, biases)
 
-        self.epoch += 1
-        return metrics
+    def absorb_epoch(
+        self,
+        graph_id: str,
+        metrics: TrainingMetrics,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        weight_points: Dict[str, np.ndarray] | None,
+        last_gradients: Dict[str, List[np.ndarray]],
+    ) -> None:
+        """Mirror an epoch trained elsewhere (e.g. in a worker process) into this session."""
+        self.graph.set_params(weights, biases)
+        if self.config.record_history and weight_points is not None and len(weight_points["t_start"]):
+            self.telemetry.extend("weights", weight_points["t_start"], weight_points["mean"])
+            self.global_step = int(weight_points["t_start"][-1]) + 1
+        self.last_weight_deltas = list(metrics.weight_deltas)
+        self.last_gradients = last_gradients
+        self._record_epoch(graph_id, metrics)
+        self.epoch = metrics.epoch + 1
 
 
 class TrainingSessionManager:
     def __init__(self) -> None:
         self._sessions: Dict[str, TrainingEngine] = {}
 
+    @staticmethod
+    def _admitted_config(graph_id: str, config: TrainingConfig) -> TrainingConfig:
+        if memory_admission.is_degraded(graph_id):
+            config.record_history = False
+        return config
+
     def get_or_create(self, graph_id: str, graph, config: TrainingConfig | None = None) -> TrainingEngine:
         if graph_id not in self._sessions:
             cfg = config if config else TrainingConfig()
-            self._sessions[graph_id] = TrainingEngine(graph, cfg)
+            self._sessions[graph_id] = TrainingEngine(graph, self._admitted_config(graph_id, cfg))
         return self._sessions[graph_id]
 
     def get(self, graph_id: str) -> TrainingEngine:
@@ -316,8 +618,15 @@ class TrainingSessionManager:
         return self._sessions[graph_id]
 
     def reset(self, graph_id: str, graph, config: TrainingConfig) -> TrainingEngine:
-        self._sessions[graph_id] = TrainingEngine(graph, config)
+        self._sessions[graph_id] = TrainingEngine(graph, self._admitted_config(graph_id, config))
         return self._sessions[graph_id]
 
+    def is_running(self, graph_id: str) -> bool:
+        session = self._sessions.get(graph_id)
+        return bool(session and session.is_running)
+
+    def discard(self, graph_id: str) -> None:
+        self._sessions.pop(graph_id, None)
+
 
 training_sessions = TrainingSessionManager()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import threading
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from .checkpoint import TrainingCheckpoint, capture, checkpoint_store, restore
+from .columnar_dataset import ColumnarDataset
+from .training_engine import TrainingConfig, TrainingEngine
+
+_mp = mp.get_context("spawn")
+
+TERMINAL_EVENTS = {"complete", "error"}
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _WorkerLoop:
+    """Runs inside the worker process; owns the graph replica and the training engine."""
+
+    def __init__(
+        self,
+        control,
+        telemetry,
+        graph,
+        config: TrainingConfig,
+        train,
+        test,
+        graph_id: str | None = None,
+        dataset_id: str | None = None,
+        resume: TrainingCheckpoint | None = None,
+    ) -> None:
+        self.control = control
+        self.telemetry = telemetry
+        self.engine = TrainingEngine(graph, config)
+        if resume is not None:
+            restore(self.engine, resume)
+        self.graph_id = graph_id
+        self.dataset_id = dataset_id
+        self.train = train
+        self.test = test
+        self.paused = False
+        self.stopping = False
+        self.pending_steps = 0
+        self.sent_step = -1.0
+
+    def _emit(self, kind: str, payload: Dict | None = None) -> None:
+        self.telemetry.send((kind, payload or {}))
+
+    def _handle(self, action: str, payload: Dict) -> None:
+        if action == "pause":
+            self.paused = True
+            self.engine.is_paused = True
+            self._emit("status", {"status": "paused"})
+        elif action == "resume":
+            self.paused = False
+            self.engine.is_paused = False
+            self._emit("status", {"status": "training"})
+        elif action == "step":
+            self.pending_steps += 1
+        elif action == "stop":
+            self.stopping = True
+        elif action == "update_config":
+            for key, value in payload.items():
+                if hasattr(self.engine.config, key):
+                    setattr(self.engine.config, key, value)
+            if "optimizer" in payload:
+                self.engine.optimizer_state = None
+
+    def _gate(self) -> None:
+        # Block on the control pipe while paused; a "step" lets exactly one batch through.
+        while True:
+            while self.control.poll() or (self.paused and not self.pending_steps and not self.stopping):
+                try:
+                    action, payload = self.control.recv()
+                except EOFError:
+                    self.stopping = True
+                    break
+                self._handle(action, payload)
+            if self.stopping:
+                raise _Stopped()
+            if not self.paused:
+                return
+            if self.pending_steps:
+                self.pending_steps -= 1
+                return
+
+    def _params(self) -> Dict:
+        return {
+            "weights": [w.copy() for w in self.engine.graph.weights],
+            "biases": [b.copy() for b in self.engine.graph.biases],
+        }
+
+    def _emit_evaluations(self, wait: bool = False) -> None:
+        for result in self.engine.collect_evaluations(wait):
+            self._emit("evaluation", dict(result.__dict__))
+
+    def _on_batch(self, epoch: int):
+        def callback(batch_index, total_batches, loss, acc, grad_norm):
+            self._emit_evaluations()
+            self._emit(
+                "batch",
+                {
+                    "epoch": epoch,
+                    "batch": batch_index + 1,
+                    "total_batches": total_batches,
+                    "loss": loss,
+                    "accuracy": acc,
+                    "gradient_norm": grad_norm,
+                },
+            )
+
+        return callback
+
+    def run(self) -> None:
+        self.engine.is_running = True
+        try:
+            for epoch in range(self.engine.epoch, self.engine.config.epochs):
+                self.engine.epoch = epoch
+                metrics = self.engine.train_epoch(
+                    self.train, self.test, None, batch_callback=self._on_batch(epoch), batch_gate=self._gate
+                )
+                weight_points = self.engine.telemetry.since("weights", self.sent_step)
+                if weight_points is not None and len(weight_points["t_start"]):
+                    self.sent_step = float(weight_points["t_start"][-1])
+                self._emit(
+                    "epoch",
+                    {
+                        "metrics": dict(metrics.__dict__),
+                        "weight_points": weight_points,
+                        "last_gradients": self.engine.last_gradients,
+                        **self._params(),
+                    },
+                )
+                self._emit_evaluations()
+                self._checkpoint(epoch)
+                if self.engine.stop_reason:
+                    break
+            self.engine.finish()
+            self._emit_evaluations()
+            self._emit("complete", {"stopped": False, "stop_reason": self.engine.stop_reason, **self._params()})
+        except _Stopped:
+            self._emit_evaluations(wait=True)
+            self._emit("complete", {"stopped": True, "stop_reason": "stopped", **self._params()})
+        except Exception as exc:
+            self._emit("error", {"message": str(exc)})
+        finally:
+            self.engine.is_running = False
+            self.engine.close()
+            checkpoint_store.flush()
+
+    def _checkpoint(self, epoch: int) -> None:
+        interval = self.engine.config.checkpoint_interval
+        if self.graph_id is None or not interval or (epoch + 1) % interval:
+            return
+        if self.engine._monitoring:
+            # A pending evaluation feeds the plateau/early-stopping monitors; a checkpoint taken
+            # before it lands would resume without that observation.
+            self._emit_evaluations(wait=True)
+        checkpoint_store.save_async(capture(self.engine, self.graph_id, self.dataset_id))
+
+
+def _worker_main(control, telemetry, graph, config, train, test, graph_id, dataset_id, resume) -> None:
+    try:
+        _WorkerLoop(control, telemetry, graph, config, train, test, graph_id, dataset_id, resume).run()
+    finally:
+        telemetry.close()
+
+
+class TrainingWorker:
+    """Supervises one training run in a separate process and relays its telemetry."""
+
+    def __init__(
+        self,
+        graph,
+        config: TrainingConfig,
+        train: ColumnarDataset,
+        test: ColumnarDataset,
+        graph_id: str | None = None,
+        dataset_id: str | None = None,
+        resume: TrainingCheckpoint | None = None,
+    ) -> None:
+        control_recv, self._control = _mp.Pipe(duplex=False)
+        self._telemetry, telemetry_send = _mp.Pipe(duplex=False)
+        self.process = _mp.Process(
+            target=_worker_main,
+            args=(control_recv, telemetry_send, graph, config, train, test, graph_id, dataset_id, resume),
+        )
+        self._child_ends = (control_recv, telemetry_send)
+        self._events: asyncio.Queue | None = None
+        self._reader: threading.Thread | None = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        self.process.start()
+        for conn in self._child_ends:
+            conn.close()
+        self._reader = threading.Thread(target=self._read, args=(loop,), daemon=True)
+        self._reader.start()
+
+    def _read(self, loop: asyncio.AbstractEventLoop) -> None:
+        finished = False
+        while True:
+            try:
+                event = self._telemetry.recv()
+            except (EOFError, OSError):
+                break
+            finished = finished or event[0] in TERMINAL_EVENTS
+            loop.call_soon_threadsafe(self._events.put_nowait, event)
+        self.process.join()
+        if not finished:
+            message = f"Training worker exited unexpectedly (exit code {self.process.exitcode})."
+            loop.call_soon_threadsafe(self._events.put_nowait, ("error", {"message": message}))
+        loop.call_soon_threadsafe(self._events.put_nowait, None)
+
+    async def events(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def send(self, action: str, payload: Dict | None = None) -> None:
+        try:
+            self._control.send((action, payload or {}))
+        except (BrokenPipeError, OSError):
+            pass
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        self.send("stop")
+        await asyncio.to_thread(self.process.join, timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            await asyncio.to_thread(self.process.join, timeout)
+        self._control.close()
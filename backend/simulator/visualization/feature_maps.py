@@ -10,21 +10,22 @@ from .rendering import render_gray
 
 def compute_feature_maps(graph: NetworkGraph, input_image: List[float], input_shape: List[int]) -> Dict:
     x = np.asarray(input_image, dtype=np.float32).reshape(input_shape)
-    graph.forward(x)
+    ctx = graph.new_context()
+    graph.forward(x, ctx)
     per_layer = []
     for idx in range(1, len(graph.layer_instances)):
         layer = graph.layer_instances[idx]
         layer_type = graph.layers[idx].layer_type
         if layer_type not in {"conv2d", "maxpool2d", "avgpool2d"}:
             continue
-        out = graph.activations[idx]
+        out = ctx.activations[idx]
         maps = []
         for f in range(out.shape[0]):
             fmap = out[f]
             maps.append(
                 {
                     "filter_index": int(f),
-                    "map": fmap.tolist(),
+                    "map": fmap,
                     "map_base64": render_gray(fmap),
                     "max_activation": float(np.max(fmap)),
                     "mean_activation": float(np.mean(fmap)),
@@ -37,7 +38,7 @@ def compute_feature_maps(graph: NetworkGraph, input_image: List[float], input_sh
                 kernels.append(
                     {
                         "filter_index": int(f),
-                        "kernel": layer.K[f, 0].tolist() if layer.K.shape[1] > 0 else layer.K[f].tolist(),
+                        "kernel": layer.K[f, 0] if layer.K.shape[1] > 0 else layer.K[f],
                         "kernel_base64": render_gray(layer.K[f, 0] if layer.K.shape[1] > 0 else layer.K[f]),
                         "description": "kernel",
                     }
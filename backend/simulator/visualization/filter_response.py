@@ -22,11 +22,12 @@ def compute_filter_response(
         return {"filter_index": filter_index, "top_activating_samples": []}
     n = min(int(n_samples), len(samples))
     scores = []
+    ctx = graph.new_context()
     for i in range(n):
         x = np.asarray(samples[i], dtype=np.float32)
-        graph.forward(x)
+        graph.forward(x, ctx)
         layer_slot = layer_index + 1
-        fmap = graph.activations[layer_slot][filter_index]
+        fmap = ctx.activations[layer_slot][filter_index]
         scores.append((float(np.max(fmap)), i, fmap))
     scores.sort(key=lambda s: s[0], reverse=True)
     top = []
@@ -45,7 +46,7 @@ def compute_filter_response(
         )
     return {
         "filter_index": filter_index,
-        "kernel": graph.layer_instances[layer_index + 1].K[filter_index, 0].tolist() if hasattr(graph.layer_instances[layer_index + 1], "K") else [],
+        "kernel": graph.layer_instances[layer_index + 1].K[filter_index, 0] if hasattr(graph.layer_instances[layer_index + 1], "K") else [],
         "kernel_description": "kernel",
         "top_activating_samples": top,
     }
@@ -10,8 +10,8 @@ from .rendering import render_heatmap_overlay, resize_nearest
 
 def compute_grad_cam(graph: NetworkGraph, input_vec: List[float], input_shape: List[int], target_class: int) -> Dict:
     x = np.asarray(input_vec, dtype=np.float32).reshape(input_shape)
-    graph.forward(x)
-    output = graph.activations[-1].reshape(-1)
+    ctx = graph.new_context()
+    output = graph.forward(x, ctx).reshape(-1)
     if target_class < 0 or target_class >= len(output):
         target_class = int(np.argmax(output))
     d_out = np.zeros_like(output)
@@ -24,14 +24,9 @@ def compute_grad_cam(graph: NetworkGraph, input_vec: List[float], input_shape: L
     if last_conv_idx < 0:
         raise ValueError("No conv2d layer found for Grad-CAM")
 
-    grad = d_out
-    for idx in reversed(range(1, len(graph.layer_instances))):
-        layer = graph.layer_instances[idx]
-        grad = layer.backward(grad)
-        if idx == last_conv_idx:
-            break
+    grad = graph.backward(d_out, ctx, stop_at=last_conv_idx)
 
-    conv_out = graph.activations[last_conv_idx]
+    conv_out = ctx.activations[last_conv_idx]
     if grad.ndim == 1:
         grad = grad.reshape(conv_out.shape)
     weights = np.mean(grad, axis=(1, 2))
@@ -45,7 +40,7 @@ def compute_grad_cam(graph: NetworkGraph, input_vec: List[float], input_shape: L
     base64_input, overlay = render_heatmap_overlay(base, cam_up)
     return {
         "method": "grad_cam",
-        "saliency_map": cam_up.tolist(),
+        "saliency_map": cam_up,
         "saliency_base64": base64_input,
         "overlay_base64": overlay,
         "top_pixels": [],
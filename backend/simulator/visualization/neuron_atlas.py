@@ -15,11 +15,12 @@ def compute_neuron_atlas(graph: NetworkGraph, dataset_id: str, layer_index: int,
         return {"layer_index": layer_index, "neurons": []}
     n = min(int(n_samples), len(samples))
     activations = []
+    ctx = graph.new_context()
     for i in range(n):
         x = np.asarray(samples[i], dtype=np.float32)
-        graph.forward(x)
+        graph.forward(x, ctx)
         layer_slot = layer_index + 1
-        act = graph.activations[layer_slot].reshape(-1)
+        act = ctx.activations[layer_slot].reshape(-1)
         activations.append(act)
     acts = np.stack(activations)
     mean = np.mean(acts, axis=0)
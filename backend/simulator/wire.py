@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Tuple
+import json
+import struct
+
+import numpy as np
+
+ENCODINGS = ("json", "binary")
+FLOAT_DTYPES = {"float32": np.dtype("<f4"), "float16": np.dtype("<f2")}
+# Exact dtypes that are never converted to the negotiated float type.
+EXACT_DTYPES = {"uint8": np.dtype(np.uint8), "int32": np.dtype("<i4")}
+_ALIGN = 8
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _fits_int32(array: np.ndarray) -> bool:
+    info = np.iinfo(np.int32)
+    return int(array.min()) >= info.min and int(array.max()) <= info.max
+
+
+def to_builtin(value: Any) -> Any:
+    """Nested copy of `value` with ndarrays and NumPy scalars turned into lists and Python numbers."""
+    if isinstance(value, dict):
+        return {k: to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(v) for v in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def encode_binary(message: Dict, float_dtype: str = "float32") -> bytes | None:
+    """Pack `message` as `[u32 header length][JSON header][pad][buffers...]`, or None if it holds no arrays.
+
+    Each ndarray in the message is replaced by `{"$tensor": i}` and described in the header's
+    `$tensors` list by dtype, shape and absolute byte offset. Offsets are 8-byte aligned, so
+    clients can view the buffers as typed arrays without copying. uint8/bool arrays stay uint8,
+    other integer arrays (e.g. sparse indices) go as int32 (or stay JSON lists in the header
+    when a value is outside the int32 range), and floats use the negotiated float type; all
+    little-endian.
+    """
+    target = FLOAT_DTYPES[float_dtype]
+    tensors: List[np.ndarray] = []
+
+    def strip(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            if value.dtype in (np.uint8, np.bool_):
+                array = np.ascontiguousarray(value, dtype=np.uint8)
+            elif value.dtype.kind in "iu":
+                if value.size and not _fits_int32(value):
+                    # Narrowing would wrap; keep such arrays exact as JSON in the header.
+                    return value.tolist()
+                array = np.ascontiguousarray(value, dtype=EXACT_DTYPES["int32"])
+            else:
+                array = np.ascontiguousarray(value, dtype=target)
+            tensors.append(array)
+            return {"$tensor": len(tensors) - 1}
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [strip(v) for v in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    header = strip(message)
+    if not tensors:
+        return None
+
+    def layout(start: int) -> Tuple[List[Dict], int]:
+        specs, offset = [], start
+        for array in tensors:
+            offset += _pad(offset)
+            dtype = next((name for name, exact in EXACT_DTYPES.items() if array.dtype == exact), float_dtype)
+            specs.append({"dtype": dtype, "shape": list(array.shape), "offset": offset, "nbytes": array.nbytes})
+            offset += array.nbytes
+        return specs, offset
+
+    # Offsets depend on the header length, which depends on the offsets; settle on a fixed point.
+    start = 0
+    while True:
+        header["$tensors"], _ = layout(start)
+        encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        body_start = 4 + len(encoded) + _pad(4 + len(encoded))
+        if body_start == start:
+            break
+        start = body_start
+    parts = [struct.pack("<I", len(encoded)), encoded]
+    position = 4 + len(encoded)
+    for spec, array in zip(header["$tensors"], tensors):
+        parts.append(b"\0" * (spec["offset"] - position))
+        parts.append(array.tobytes())
+        position = spec["offset"] + array.nbytes
+    return b"".join(parts)
+
+
+def decode_binary(frame: bytes) -> Dict:
+    """Inverse of `encode_binary` (used for binary request bodies and tests)."""
+    (length,) = struct.unpack_from("<I", frame, 0)
+    header = json.loads(frame[4 : 4 + length].decode("utf-8"))
+    specs = header.pop("$tensors", [])
+    arrays = []
+    for spec in specs:
+        dtype = EXACT_DTYPES.get(spec["dtype"]) or FLOAT_DTYPES[spec["dtype"]]
+        count = spec["nbytes"] // dtype.itemsize
+        arrays.append(np.frombuffer(frame, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"]))
+
+    def fill(value: Any) -> Any:
+        if isinstance(value, dict):
+            if set(value) == {"$tensor"}:
+                return arrays[value["$tensor"]]
+            return {k: fill(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [fill(v) for v in value]
+        return value
+
+    return fill(header)
+
+
+class FrameEncoder:
+    """Per-connection wire format, JSON text by default or opt-in binary frames.
+
+    In binary mode messages carrying ndarrays go out as binary frames (see `encode_binary`);
+    everything else stays a JSON text frame, so control messages look the same either way.
+    """
+
+    def __init__(self, encoding: str = "json", dtype: str = "float32") -> None:
+        self.encoding = "json"
+        self.dtype = "float32"
+        self.configure(encoding, dtype)
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, str]) -> "FrameEncoder":
+        try:
+            return cls(params.get("encoding", "json"), params.get("dtype", "float32"))
+        except ValueError:
+            return cls()
+
+    def configure(self, encoding: str | None = None, dtype: str | None = None) -> Dict:
+        encoding = encoding or self.encoding
+        dtype = dtype or self.dtype
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        if dtype not in FLOAT_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        self.encoding, self.dtype = encoding, dtype
+        return {"type": "negotiated", "encoding": encoding, "dtype": dtype}
+
+    @property
+    def binary(self) -> bool:
+        return self.encoding == "binary"
+
+    def encode(self, message: Dict) -> str | bytes:
+        if self.binary:
+            frame = encode_binary(message, self.dtype)
+            if frame is not None:
+                return frame
+        return json.dumps(message, default=_jsonable)
+
+    def sender(self, ws) -> Callable[[Dict], Awaitable[None]]:
+        async def send(message: Dict) -> None:
+            await send_frame(ws, self.encode(message))
+
+        return send
+
+
+async def send_frame(ws, frame: str | bytes) -> None:
+    if isinstance(frame, bytes):
+        await ws.send_bytes(frame)
+    else:
+        await ws.send_text(frame)
@@ -0,0 +1,68 @@
+// Decoder for the backend's opt-in binary WebSocket frames (connect with ?encoding=binary)
+// and binary REST responses (Accept: application/x-tensor, see postTensor).
+// Layout: [u32 LE header length][JSON header][padding][8-byte aligned LE buffers].
+// Arrays come back as typed arrays with a `shape` property; messages without arrays stay JSON text.
+
+import { apiClient } from "./client";
+
+type TensorSpec = { dtype: "float32" | "float16" | "uint8" | "int32"; shape: number[]; offset: number; nbytes: number };
+
+export type Tensor = (Float32Array | Uint8Array | Int32Array) & { shape: number[] };
+
+function halfToFloat(bits: number): number {
+  const sign = bits & 0x8000 ? -1 : 1;
+  const exponent = (bits >> 10) & 0x1f;
+  const fraction = bits & 0x3ff;
+  if (exponent === 0) return sign * 2 ** -14 * (fraction / 1024);
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+  return sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+}
+
+function readTensor(buffer: ArrayBuffer, spec: TensorSpec): Tensor {
+  let data: Float32Array | Uint8Array | Int32Array;
+  if (spec.dtype === "uint8") {
+    data = new Uint8Array(buffer, spec.offset, spec.nbytes);
+  } else if (spec.dtype === "int32") {
+    data = new Int32Array(buffer, spec.offset, spec.nbytes / 4);
+  } else if (spec.dtype === "float32") {
+    data = new Float32Array(buffer, spec.offset, spec.nbytes / 4);
+  } else {
+    const halves = new Uint16Array(buffer, spec.offset, spec.nbytes / 2);
+    data = Float32Array.from(halves, halfToFloat);
+  }
+  return Object.assign(data, { shape: spec.shape });
+}
+
+export function decodeBinaryFrame(buffer: ArrayBuffer): any {
+  const headerLength = new DataView(buffer).getUint32(0, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+  const tensors: Tensor[] = (header.$tensors ?? []).map((spec: TensorSpec) => readTensor(buffer, spec));
+  delete header.$tensors;
+  const fill = (value: any): any => {
+    if (Array.isArray(value)) return value.map(fill);
+    if (value && typeof value === "object") {
+      if (Object.keys(value).length === 1 && "$tensor" in value) return tensors[value.$tensor];
+      return Object.fromEntries(Object.entries(value).map(([k, v]) => [k, fill(v)]));
+    }
+    return value;
+  };
+  return fill(header);
+}
+
+export async function parseSocketMessage(data: string | ArrayBuffer | Blob): Promise<any> {
+  if (typeof data === "string") return JSON.parse(data);
+  return decodeBinaryFrame(data instanceof Blob ? await data.arrayBuffer() : data);
+}
+
+export const TENSOR_MEDIA_TYPE = "application/x-tensor";
+
+// POSTs to a simulator route asking for typed arrays instead of nested JSON lists.
+// Responses without arrays come back as JSON, so the content type decides how to read them.
+export async function postTensor<T = any>(path: string, body: unknown, dtype: "float32" | "float16" = "float32"): Promise<T> {
+  const res = await apiClient.post<ArrayBuffer>(path, body, {
+    responseType: "arraybuffer",
+    headers: { Accept: `${TENSOR_MEDIA_TYPE}; dtype=${dtype}, application/json;q=0.5` },
+  });
+  if (String(res.headers["content-type"] ?? "").startsWith(TENSOR_MEDIA_TYPE)) return decodeBinaryFrame(res.data);
+  return JSON.parse(new TextDecoder().decode(res.data));
+}